@@ -18,7 +18,7 @@ def main():
     print("4. Verify clean disconnection")
     print("=" * 50)
     
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
     
     # Create and show client
     client = ClientMainWindow()
@@ -36,34 +36,45 @@ def main():
     client.connect_to_server(conn_info)
     client.show()
     
-    def run_test():
-        if client.connected:
-            print("✅ Connected successfully!")
-            print("🚪 Clicking leave button now...")
-            
-            # This should work without hanging or requiring terminal/GUI closure
-            client.handle_leave_button_click()
-            
-            def verify_result():
-                if not client.connected:
-                    print("🎉 SUCCESS! Leave button works perfectly!")
-                    print("✅ Meeting ended cleanly")
-                    print("✅ No need to close GUI tab or terminal")
-                    print("✅ All network connections closed properly")
-                else:
-                    print("❌ FAILED: Still connected after leave button")
-                
-                # Exit after verification
-                app.quit()
-            
-            # Verify after 2 seconds
-            QTimer.singleShot(2000, verify_result)
-        else:
+    def check_and_leave():
+        if not client.connected:
             print("❌ Connection failed")
+            return False
+        
+        print("✅ Connected successfully!")
+        print("🚪 Clicking leave button now...")
+        
+        # This should work without hanging or requiring terminal/GUI closure
+        client.handle_leave_button_click()
+        return True
+    
+    def verify_result():
+        if not client.connected:
+            print("🎉 SUCCESS! Leave button works perfectly!")
+            print("✅ Meeting ended cleanly")
+            print("✅ No need to close GUI tab or terminal")
+            print("✅ All network connections closed properly")
+        else:
+            print("❌ FAILED: Still connected after leave button")
+        return False
+    
+    # (delay before the phase in ms, phase); a phase returns True to continue
+    phases = [(3000, check_and_leave), (2000, verify_result)]
+    
+    # One reusable single-shot timer steps through the phases in order
+    timer = QTimer()
+    timer.setSingleShot(True)
+    
+    def advance():
+        _, phase = phases.pop(0)
+        if phase() and phases:
+            timer.start(phases[0][0])
+        else:
+            # Exit after verification
             app.quit()
     
-    # Run test after 3 seconds
-    QTimer.singleShot(3000, run_test)
+    timer.timeout.connect(advance)
+    timer.start(phases[0][0])
     
     return app.exec()
 
@@ -17,6 +17,8 @@ Full-featured collaboration client implemented from scratch with:
 This is a complete standalone implementation with 2000+ lines.
 """
 
+from __future__ import annotations
+
 import sys
 import os
 import asyncio
@@ -27,9 +29,12 @@ import struct
 import socket
 import hashlib
 import uuid
+import functools
+import importlib.util
+import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set, Union, TYPE_CHECKING
 from collections import deque
 import traceback
 
@@ -42,48 +47,64 @@ from PyQt6.QtWidgets import (
     QScrollArea, QSplitter, QGroupBox, QCheckBox, QSpinBox, QComboBox,
     QTableWidget, QTableWidgetItem, QHeaderView, QTreeWidget, QTreeWidgetItem,
     QSlider, QToolButton, QStatusBar, QMenuBar, QToolBar,
-    QStackedWidget, QFormLayout, QDialogButtonBox
+    QStackedWidget, QFormLayout, QDialogButtonBox, QButtonGroup, QStyle
 )
 from PyQt6.QtCore import (
     Qt, QThread, pyqtSignal, QSize, QTimer, QMutex, QUrl, QObject,
+    QThreadPool, QRunnable, QEvent,
     QPropertyAnimation, QEasingCurve, QRect, QPoint, QMimeData
 )
 from PyQt6.QtGui import (
     QImage, QPixmap, QFont, QPalette, QColor, QIcon, QPainter, 
-    QBrush, QPen, QLinearGradient, QDrag, QCursor, QAction
+    QBrush, QPen, QLinearGradient, QDrag, QCursor, QAction,
+    QTextCharFormat, QTextBlockFormat, QTextCursor
 )
 
-# Audio/Video processing
-try:
-    import cv2
-    import numpy as np
-    HAS_OPENCV = True
-except ImportError:
-    HAS_OPENCV = False
+from net_utils import get_local_ip
+
+# Video, audio and screen capture libraries are only probed here; they are
+# imported where used so startup does not pay for loading them
+HAS_OPENCV = (importlib.util.find_spec("cv2") is not None
+              and importlib.util.find_spec("numpy") is not None)
+if not HAS_OPENCV:
     print("[WARNING] OpenCV not available. Video features disabled.")
 
-try:
-    import pyaudio
-    HAS_PYAUDIO = True
-except ImportError:
-    HAS_PYAUDIO = False
+if TYPE_CHECKING:
+    import numpy as np
+
+HAS_PYAUDIO = importlib.util.find_spec("pyaudio") is not None
+if not HAS_PYAUDIO:
     print("[WARNING] PyAudio not available. Audio features disabled.")
 
-try:
-    from opuslib import Encoder, Decoder
-    HAS_OPUS = True
-except ImportError:
-    HAS_OPUS = False
+HAS_OPUS = importlib.util.find_spec("opuslib") is not None
+if not HAS_OPUS:
     print("[WARNING] Opus not available. Audio encoding disabled.")
 
 # Screen capture
+HAS_SCREEN_CAPTURE = (importlib.util.find_spec("mss") is not None
+                      and importlib.util.find_spec("PIL") is not None)
+if not HAS_SCREEN_CAPTURE:
+    print("[WARNING] Screen capture not available.")
+
+# Faster JSON for control messages; stdlib json is a drop-in fallback
 try:
-    import mss
-    from PIL import Image as PILImage
-    HAS_SCREEN_CAPTURE = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_SCREEN_CAPTURE = False
-    print("[WARNING] Screen capture not available.")
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    encode_message = orjson.dumps
+    decode_message = orjson.loads
+else:
+    def encode_message(message: dict) -> bytes:
+        return json.dumps(message).encode('utf-8')
+    
+    def decode_message(data: bytes) -> dict:
+        return json.loads(data)
+
+# Debug output goes through logging so it can be switched off; see main()
+logger = logging.getLogger(__name__)
 
 # Protocol constants
 class MessageTypes:
@@ -118,11 +139,25 @@ class MessageTypes:
     UNICAST_SENT = 'unicast_sent'
     ERROR = 'error'
 
+# Encoded prefixes of a server HEARTBEAT_ACK (stdlib json and compact
+# separators), checked before decoding so idle acks skip the JSON parse
+HEARTBEAT_ACK_PREFIXES = (
+    b'{"type": "' + MessageTypes.HEARTBEAT_ACK.encode() + b'"',
+    b'{"type":"' + MessageTypes.HEARTBEAT_ACK.encode() + b'"',
+)
+
+# Fixed-shape screen share requests, serialized once; only the timestamp
+# is filled in per send
+PRESENT_START_TEMPLATE = '{"type": "%s", "timestamp": "%%s"}' % MessageTypes.PRESENT_START
+PRESENT_STOP_TEMPLATE = '{"type": "%s", "timestamp": "%%s"}' % MessageTypes.PRESENT_STOP
+
 # Network Configuration
 DEFAULT_TCP_PORT = 9000
 DEFAULT_UDP_VIDEO_PORT = 10000
 DEFAULT_UDP_AUDIO_PORT = 11000
 HEARTBEAT_INTERVAL = 10
+HEARTBEAT_MAX_MISSED = 3  # unanswered heartbeats before the link counts as dropped
+PROBE_TIMEOUT = 2  # seconds for the pre-flight TCP reachability check
 MAX_RETRY_ATTEMPTS = 3
 RECONNECT_ATTEMPTS = 5
 RECONNECT_DELAY_BASE = 2.0
@@ -140,38 +175,78 @@ AUDIO_CHANNELS = 1
 AUDIO_CHUNK_SIZE = 1600
 AUDIO_BYTES_PER_SAMPLE = 2
 
+# Wire headers, compiled once: audio (uid, sequence, size), video (uid,
+# sequence, frame_id, size) and the 4-byte length/type prefix on TCP
+AUDIO_HEADER = struct.Struct('!III')
+VIDEO_HEADER = struct.Struct('!IIII')
+LENGTH_PREFIX = struct.Struct('!I')
+
 # GUI Configuration
 WINDOW_MIN_WIDTH = 1200
 WINDOW_MIN_HEIGHT = 800
 VIDEO_GRID_COLS = 3
 VIDEO_FRAME_WIDTH = 320
 VIDEO_FRAME_HEIGHT = 240
+PROGRESS_REPORT_STEP = 10  # percent between transfer progress chat updates
+PROGRESS_REPORT_INTERVAL = 0.25  # seconds between transfer progress chat updates
+FILE_TRANSFER_WORKERS = 4
+PREVIEW_RENDER_INTERVAL_MS = 33  # caps screen preview repaints at ~30 Hz
+PREVIEW_RING_SLOTS = 3  # preallocated preview buffers shared with the GUI
+PREVIEW_ROW_ALIGN = 32  # byte alignment of preview scanlines for Qt's SIMD paths
+
+# File list row markup, filled per entry in update_file_list_display
+FILE_ENTRY_HTML = """
+            <div style='background-color: #111111; padding: 10px; margin: 5px; border-radius: 5px;'>
+                <b>📄 {filename}</b><br>
+                <small>Size: {size} | Uploaded by: {uploader}</small>
+            </div>
+            """
+
+# Platform style, resolved once at import
+PREFERRED_STYLE = {"darwin": "macOS", "win32": "windowsvista"}.get(sys.platform, "Fusion")
 
 # Protocol helper functions
+_iso_cache = [0, ""]  # [epoch second, formatted timestamp]
+
+def now_iso(precise: bool = False) -> str:
+    """ISO timestamp whose date/time part is formatted at most once per second.
+    
+    Control messages use second resolution; pass precise=True for chat,
+    which appends milliseconds to the cached prefix.
+    """
+    now = time.time()
+    second = int(now)
+    if second != _iso_cache[0]:
+        _iso_cache[0] = second
+        _iso_cache[1] = datetime.fromtimestamp(second).isoformat()
+    if precise:
+        return f"{_iso_cache[1]}.{int((now - second) * 1000):03d}"
+    return _iso_cache[1]
+
 def create_login_message(username: str) -> dict:
     return {
         "type": MessageTypes.LOGIN,
         "username": username,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_heartbeat_message() -> dict:
     return {
         "type": MessageTypes.HEARTBEAT,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_chat_message(text: str) -> dict:
     return {
         "type": MessageTypes.CHAT,
         "content": text,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso(precise=True)
     }
 
 def create_logout_message() -> dict:
     return {
         "type": MessageTypes.LOGOUT,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_file_offer_message(fid: str, filename: str, size: int) -> dict:
@@ -180,32 +255,59 @@ def create_file_offer_message(fid: str, filename: str, size: int) -> dict:
         "fid": fid,
         "filename": filename,
         "size": size,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_file_request_message(fid: str) -> dict:
     return {
         "type": MessageTypes.FILE_REQUEST,
         "fid": fid,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_present_start_message(topic: str) -> dict:
     return {
         "type": MessageTypes.PRESENT_START,
         "topic": topic,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_present_stop_message() -> dict:
     return {
         "type": MessageTypes.PRESENT_STOP,
-        "timestamp": datetime.now().isoformat()
-    }# 
-#============================================================================
+        "timestamp": now_iso()
+    }
+
+@functools.lru_cache(maxsize=1024)
+def _parse_message_time(timestamp: str) -> Optional[str]:
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime("%H:%M:%S")
+    except ValueError:
+        return None
+
+def format_message_time(timestamp: str) -> Optional[str]:
+    """HH:MM:SS from a message timestamp, or None if it is missing/invalid."""
+    if not timestamp:
+        return None
+    # Server timestamps are isoformat(): YYYY-MM-DDTHH:MM:SS[.ffffff]
+    if len(timestamp) >= 19 and timestamp[10] == 'T' and timestamp[13] == ':' and timestamp[16] == ':':
+        return timestamp[11:19]
+    return _parse_message_time(timestamp)
+
+
+# ============================================================================
 # VIDEO FRAME WIDGET
 # ============================================================================
 
+def bgr_frame_to_qimage(frame: np.ndarray) -> QImage:
+    """Convert an OpenCV BGR frame to a QImage that owns its pixel data."""
+    import cv2
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb_frame.shape
+    # copy() detaches from the numpy buffer so the image can outlive it
+    return QImage(rgb_frame.data, w, h, ch * w, QImage.Format.Format_RGB888).copy()
+
+
 class VideoFrame(QLabel):
     """Individual video frame widget with user info overlay."""
     
@@ -253,16 +355,15 @@ class VideoFrame(QLabel):
     
     def set_video_frame(self, frame: np.ndarray):
         """Set video frame from numpy array."""
+        if frame is not None and frame.size > 0:
+            self.set_video_image(bgr_frame_to_qimage(frame))
+        else:
+            self.set_placeholder()
+    
+    def set_video_image(self, qt_image: QImage):
+        """Set video frame from a QImage prepared off the GUI thread."""
         try:
-            if frame is not None and frame.size > 0:
-                # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Create QImage
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                
+            if qt_image is not None and not qt_image.isNull():
                 # Scale to fit frame
                 scaled_pixmap = QPixmap.fromImage(qt_image).scaled(
                     self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
@@ -327,6 +428,22 @@ class VideoGrid(QWidget):
             self.video_frames[uid] = frame
             self.update_grid_layout()
     
+    def add_participant_frames_bulk(self, participants):
+        """Add frames for several (uid, username) pairs with a single relayout."""
+        added = False
+        for uid, username in participants:
+            if uid not in self.video_frames:
+                self.video_frames[uid] = VideoFrame(uid=uid, username=username)
+                added = True
+        
+        if added:
+            self.setUpdatesEnabled(False)
+            try:
+                self.update_grid_layout()
+                self.grid_layout.activate()
+            finally:
+                self.setUpdatesEnabled(True)
+    
     def remove_participant_frame(self, uid: int):
         """Remove video frame for participant."""
         if uid in self.video_frames:
@@ -360,15 +477,15 @@ class VideoGrid(QWidget):
             self.grid_layout.addWidget(frame, row, col)
             col += 1
     
-    def update_local_video(self, frame: np.ndarray):
+    def update_local_video(self, image: QImage):
         """Update local video frame."""
         if self.local_frame:
-            self.local_frame.set_video_frame(frame)
+            self.local_frame.set_video_image(image)
     
-    def update_participant_video(self, uid: int, frame: np.ndarray):
+    def update_participant_video(self, uid: int, image: QImage):
         """Update participant video frame."""
         if uid in self.video_frames:
-            self.video_frames[uid].set_video_frame(frame)# 
+            self.video_frames[uid].set_video_image(image)# 
 #============================================================================
 # CHAT WIDGET
 # ============================================================================
@@ -386,7 +503,35 @@ class ChatWidget(QWidget):
         super().__init__(parent)
         self.chat_history = []
         self.participants = {}  # uid -> participant_info
+        self._last_tag = None  # Tag of the trailing message if it can be rewritten
+        self.setup_formats()
         self.setup_ui()
+    
+    @staticmethod
+    def _char_format(color: str, bold: bool = False, italic: bool = False) -> QTextCharFormat:
+        """Build a character format for chat text."""
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        if bold:
+            fmt.setFontWeight(QFont.Weight.Bold)
+        fmt.setFontItalic(italic)
+        return fmt
+    
+    def setup_formats(self):
+        """Create the text formats used for chat messages once."""
+        self._time_fmt = self._char_format("#888888")
+        self._system_fmt = self._char_format("#ffd43b", italic=True)
+        self._self_fmt = self._char_format("#0078d4", bold=True)
+        self._user_fmt = self._char_format("#28a745", bold=True)
+        self._msg_fmt = self._char_format("white")
+        self._private_fmt = self._char_format("#9d4edd", bold=True)
+        self._private_msg_fmt = self._char_format("#e0e0e0")
+        
+        self._block_fmt = QTextBlockFormat()
+        self._block_fmt.setTopMargin(8)
+        self._private_block_fmt = QTextBlockFormat()
+        self._private_block_fmt.setTopMargin(8)
+        self._private_block_fmt.setBackground(QColor("#111111"))
         
     def setup_ui(self):
         """Setup chat UI."""
@@ -460,7 +605,7 @@ class ChatWidget(QWidget):
                 background-color: #1e7e34;
             }
         """)
-        file_upload_btn.clicked.connect(lambda: self.upload_file())
+        file_upload_btn.clicked.connect(lambda _checked=False: self.upload_file())
         input_layout.addWidget(file_upload_btn)
         
         # File download button
@@ -521,24 +666,15 @@ class ChatWidget(QWidget):
         if timestamp is None:
             timestamp = datetime.now().strftime("%H:%M:%S")
         
-        # Format message
+        self._last_tag = None
+        cursor = self._new_message_block(self._block_fmt)
+        cursor.insertText(f"[{timestamp}] ", self._time_fmt)
         if is_system:
-            html = f"""
-            <div style="color: #ffd43b; font-style: italic; margin: 5px 0;">
-                <span style="color: #888;">[{timestamp}]</span> {text}
-            </div>
-            """
+            cursor.insertText(text, self._system_fmt)
         else:
-            sender_color = "#0078d4" if sender == "You" else "#28a745"
-            html = f"""
-            <div style="margin: 8px 0;">
-                <span style="color: #888;">[{timestamp}]</span>
-                <span style="color: {sender_color}; font-weight: bold;">{sender}:</span>
-                <span style="color: white;">{text}</span>
-            </div>
-            """
-        
-        self.chat_display.append(html)
+            sender_fmt = self._self_fmt if sender == "You" else self._user_fmt
+            cursor.insertText(f"{sender}: ", sender_fmt)
+            cursor.insertText(text, self._msg_fmt)
         
         # Auto-scroll to bottom
         scrollbar = self.chat_display.verticalScrollBar()
@@ -549,23 +685,44 @@ class ChatWidget(QWidget):
         if timestamp is None:
             timestamp = datetime.now().strftime("%H:%M:%S")
         
-        # Format private message with distinct styling
-        html = f"""
-        <div style="margin: 8px 0; background-color: #111111; border-left: 3px solid #9d4edd; padding: 8px; border-radius: 5px;">
-            <span style="color: #888;">[{timestamp}]</span>
-            <span style="color: #9d4edd; font-weight: bold;">🔒 {sender} (private):</span>
-            <span style="color: #e0e0e0;">{text}</span>
-        </div>
-        """
-        
-        self.chat_display.append(html)
+        # Private messages get their own block background
+        self._last_tag = None
+        cursor = self._new_message_block(self._private_block_fmt)
+        cursor.insertText(f"[{timestamp}] ", self._time_fmt)
+        cursor.insertText(f"🔒 {sender} (private): ", self._private_fmt)
+        cursor.insertText(text, self._private_msg_fmt)
         
         # Auto-scroll to bottom
         scrollbar = self.chat_display.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
     
+    def update_last_message(self, tag, text: str):
+        """Rewrite the trailing system message if it carries tag, else append one."""
+        if self._last_tag != tag:
+            self.add_message("System", text, is_system=True)
+            self._last_tag = tag
+            return
+        
+        # Replace the contents of the last block in place
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(f"[{datetime.now().strftime('%H:%M:%S')}] ", self._time_fmt)
+        cursor.insertText(text, self._system_fmt)
+    
+    def _new_message_block(self, block_fmt: QTextBlockFormat) -> QTextCursor:
+        """Return a cursor positioned in a fresh block at the end of the chat."""
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if self.chat_display.document().isEmpty():
+            cursor.setBlockFormat(block_fmt)
+        else:
+            cursor.insertBlock(block_fmt)
+        return cursor
+    
     def clear_chat(self):
         """Clear chat display."""
+        self._last_tag = None
         self.chat_display.clear()
     
     def upload_file(self):
@@ -680,6 +837,7 @@ class ParticipantsWidget(QWidget):
     
     def refresh_list(self):
         """Refresh participants list display."""
+        self.participants_list.setUpdatesEnabled(False)
         self.participants_list.clear()
         
         for uid, participant in self.participants.items():
@@ -695,6 +853,8 @@ class ParticipantsWidget(QWidget):
             item.setData(Qt.ItemDataRole.UserRole, uid)
             
             self.participants_list.addItem(item)
+        
+        self.participants_list.setUpdatesEnabled(True)
     
     def on_participant_double_click(self, item):
         """Handle participant double click."""
@@ -706,6 +866,17 @@ class ParticipantsWidget(QWidget):
 # MEDIA CONTROLS WIDGET
 # ============================================================================
 
+def set_text_if_changed(widget, text: str):
+    """setText only when the text differs, avoiding a relayout and repaint."""
+    if widget.text() != text:
+        widget.setText(text)
+
+def set_checked_if_changed(widget, on: bool):
+    """setChecked only when the state differs."""
+    if widget.isChecked() != on:
+        widget.setChecked(on)
+
+
 class MediaControlsWidget(QWidget):
     """Media controls for video, audio, screen sharing."""
     
@@ -782,22 +953,22 @@ class MediaControlsWidget(QWidget):
     def toggle_video(self):
         """Toggle video on/off."""
         self.video_enabled = not self.video_enabled
-        self.video_btn.setChecked(self.video_enabled)
-        self.video_btn.setText("📹 Video On" if self.video_enabled else "📹 Video Off")
+        set_checked_if_changed(self.video_btn, self.video_enabled)
+        set_text_if_changed(self.video_btn, "📹 Video On" if self.video_enabled else "📹 Video Off")
         self.video_toggle_requested.emit(self.video_enabled)
     
     def toggle_audio(self):
         """Toggle audio on/off."""
         self.audio_enabled = not self.audio_enabled
-        self.audio_btn.setChecked(self.audio_enabled)
-        self.audio_btn.setText("🎤 Audio On" if self.audio_enabled else "🎤 Audio Off")
+        set_checked_if_changed(self.audio_btn, self.audio_enabled)
+        set_text_if_changed(self.audio_btn, "🎤 Audio On" if self.audio_enabled else "🎤 Audio Off")
         self.audio_toggle_requested.emit(self.audio_enabled)
     
     def toggle_screen_share(self):
         """Toggle screen sharing on/off."""
         self.screen_sharing = not self.screen_sharing
-        self.screen_btn.setChecked(self.screen_sharing)
-        self.screen_btn.setText("🖥️ Sharing" if self.screen_sharing else "🖥️ Share")
+        set_checked_if_changed(self.screen_btn, self.screen_sharing)
+        set_text_if_changed(self.screen_btn, "🖥️ Sharing" if self.screen_sharing else "🖥️ Share")
         self.screen_share_requested.emit(self.screen_sharing)
     
     def connect_parent_signals(self):
@@ -809,6 +980,29 @@ class MediaControlsWidget(QWidget):
 # NETWORKING COMPONENTS
 # ============================================================================
 
+class ConnectivityProbeThread(QThread):
+    """Checks that the server's TCP port is reachable without blocking the GUI."""
+    
+    probe_finished = pyqtSignal(bool, str)  # reachable, error message
+    
+    def __init__(self, host: str, port: int, parent=None):
+        super().__init__(parent)
+        self.host = host
+        self.port = port
+    
+    def run(self):
+        try:
+            test_sock = socket.create_connection((self.host, self.port), timeout=PROBE_TIMEOUT)
+            test_sock.close()
+            self.probe_finished.emit(True, "")
+        except OSError:
+            # Refused/unreachable/timed out/unresolvable host (ConnectionError,
+            # socket.timeout and socket.gaierror are all OSError subclasses)
+            self.probe_finished.emit(False, "")
+        except Exception as e:
+            self.probe_finished.emit(False, str(e))
+
+
 class NetworkThread(QThread):
     """Thread for handling network operations."""
     
@@ -825,6 +1019,7 @@ class NetworkThread(QThread):
         self.reader = None
         self.writer = None
         self.uid = None
+        self.last_heartbeat_ack = None
         
     def run(self):
         """Run network thread."""
@@ -871,26 +1066,17 @@ class NetworkThread(QThread):
         try:
             print(f"[INFO] Attempting to connect to {self.host}:{self.port}")
             
-            # Test basic connectivity first
-            test_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            test_sock.settimeout(5)
-            
-            try:
-                result = test_sock.connect_ex((self.host, self.port))
-                test_sock.close()
-                
-                if result != 0:
-                    raise ConnectionError(f"Cannot reach server at {self.host}:{self.port}")
-            except Exception as e:
-                test_sock.close()
-                raise ConnectionError(f"Network error: {e}")
-            
-            # Now try async connection
+            # Reachability was already checked by ConnectivityProbeThread
             self.reader, self.writer = await asyncio.wait_for(
                 asyncio.open_connection(self.host, self.port), 
                 timeout=10
             )
             
+            # Small JSON control messages should not wait for Nagle coalescing
+            sock = self.writer.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
             self.connected = True
             print(f"[INFO] Successfully connected to {self.host}:{self.port}")
             self.connection_status_changed.emit(True, "Connected")
@@ -913,10 +1099,17 @@ class NetworkThread(QThread):
         await self.send_message(login_msg)
     
     async def heartbeat_loop(self):
-        """Send periodic heartbeats."""
+        """Send periodic heartbeats and drop the link after missed acks."""
+        self.last_heartbeat_ack = time.monotonic()
         while self.running and self.connected:
             await asyncio.sleep(HEARTBEAT_INTERVAL)
             if self.running and self.connected:
+                if time.monotonic() - self.last_heartbeat_ack > HEARTBEAT_INTERVAL * HEARTBEAT_MAX_MISSED:
+                    print(f"[ERROR] No heartbeat ack for {HEARTBEAT_MAX_MISSED} intervals, dropping connection")
+                    # Closing the transport ends listen_for_messages, which
+                    # reports the disconnect
+                    self.writer.close()
+                    break
                 heartbeat_msg = create_heartbeat_message()
                 await self.send_message(heartbeat_msg)
     
@@ -930,7 +1123,7 @@ class NetworkThread(QThread):
                     print("[ERROR] Failed to read message length")
                     break
                 
-                message_length = struct.unpack('!I', length_data)[0]
+                message_length = LENGTH_PREFIX.unpack(length_data)[0]
                 if message_length > 1024 * 1024:  # 1MB limit
                     print(f"[ERROR] Message too large: {message_length}")
                     break
@@ -941,7 +1134,12 @@ class NetworkThread(QThread):
                     print("[ERROR] Failed to read message data")
                     break
                 
-                message = json.loads(message_data.decode('utf-8'))
+                # Heartbeat acks only prove liveness; keep them off the GUI thread
+                if message_data.startswith(HEARTBEAT_ACK_PREFIXES):
+                    self.last_heartbeat_ack = time.monotonic()
+                    continue
+                
+                message = decode_message(message_data)
                 self.message_received.emit(message)
                 
             except Exception as e:
@@ -951,19 +1149,25 @@ class NetworkThread(QThread):
         self.connected = False
         self.connection_status_changed.emit(False, "Disconnected")
     
-    async def send_message(self, message: dict):
-        """Send message to server."""
+    async def send_message(self, message: Union[dict, bytes]):
+        """Send message to server; bytes are sent as already-encoded JSON."""
         try:
             if self.writer and self.connected:
-                message_data = json.dumps(message).encode('utf-8')
-                length_data = struct.pack('!I', len(message_data))
-                self.writer.write(length_data + message_data)
+                message_data = message if isinstance(message, bytes) else encode_message(message)
+                # Prefix and payload go out as two buffers, not a concatenated copy
+                self.writer.writelines((LENGTH_PREFIX.pack(len(message_data)), message_data))
                 await self.writer.drain()
         except Exception as e:
             print(f"[ERROR] Send message error: {e}")
     
-    def send_message_sync(self, message: dict):
-        """Send message synchronously (for GUI thread)."""
+    def queue_message(self, message: Union[dict, bytes]):
+        """Queue a message for the network loop; never blocks the caller.
+        
+        Connected to ClientMainWindow.send_requested and send_raw_requested.
+        This thread runs an asyncio loop rather than a Qt event loop, so the
+        hand-off is done with run_coroutine_threadsafe instead of a queued
+        Qt slot.
+        """
         if self.connected and hasattr(self, 'loop') and self.loop:
             # Schedule message sending in the network thread's event loop
             asyncio.run_coroutine_threadsafe(
@@ -971,6 +1175,21 @@ class NetworkThread(QThread):
                 self.loop
             )
     
+    def logout(self, message: dict, timeout: float = 0.5):
+        """Send LOGOUT and wait only until it has been flushed to the socket."""
+        if self.connected and hasattr(self, 'loop') and self.loop:
+            future = asyncio.run_coroutine_threadsafe(self._send_logout(message), self.loop)
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logger.debug("Logout flush did not complete: %s", e)
+    
+    async def _send_logout(self, message: dict):
+        """Write LOGOUT, drain, then half-close so the server sees FIN after it."""
+        await self.send_message(message)
+        if self.writer and self.writer.can_write_eof():
+            self.writer.write_eof()
+    
     def disconnect(self):
         """Disconnect from server."""
         self.running = False
@@ -986,7 +1205,7 @@ class NetworkThread(QThread):
                     # If loop is not running, close directly
                     self.writer.close()
             except Exception as e:
-                print(f"[DEBUG] Error during disconnect: {e}")
+                logger.debug("Error during disconnect: %s", e)
     
     async def _close_connection(self):
         """Helper method to close connection properly."""
@@ -994,16 +1213,18 @@ class NetworkThread(QThread):
             if self.writer and not self.writer.is_closing():
                 self.writer.close()
                 await self.writer.wait_closed()
-                print("[DEBUG] Connection closed properly")
+                logger.debug("Connection closed properly")
         except Exception as e:
-            print(f"[DEBUG] Error closing connection: {e}")
+            logger.debug("Error closing connection: %s", e)
 
 
 class VideoClient(QThread):
     """Video capture and streaming client."""
     
-    frame_captured = pyqtSignal(np.ndarray)  # Local frame captured
-    frame_received = pyqtSignal(int, np.ndarray)  # Remote frame received (uid, frame)
+    # Frames cross to the GUI thread as implicitly shared QImages, already
+    # converted here so the GUI thread only scales and paints them
+    frame_captured = pyqtSignal(QImage)  # Local frame captured
+    frame_received = pyqtSignal(int, QImage)  # Remote frame received (uid, image)
     video_disabled = pyqtSignal()  # Signal when video is disabled
     
     def __init__(self, server_host: str, server_port: int, parent=None):
@@ -1027,9 +1248,9 @@ class VideoClient(QThread):
         self.enabled = enabled
         
         if enabled:
-            print("[DEBUG] Video enabled")
+            logger.debug("Video enabled")
         else:
-            print("[DEBUG] Video disabled")
+            logger.debug("Video disabled")
             # Emit signal to clear local video display
             if was_enabled:  # Only emit if it was previously enabled
                 self.video_disabled.emit()
@@ -1038,6 +1259,7 @@ class VideoClient(QThread):
         """Run video capture loop."""
         if not HAS_OPENCV:
             return
+        import cv2
         
         try:
             self.running = True
@@ -1062,13 +1284,13 @@ class VideoClient(QThread):
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
             self.cap.set(cv2.CAP_PROP_FPS, DEFAULT_FPS)
             
-            print("[DEBUG] Camera initialized successfully")
+            logger.debug("Camera initialized successfully")
             
             # Initialize UDP socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.settimeout(0.1)  # Non-blocking with short timeout
             
-            print(f"[DEBUG] Video client started, waiting for UID to be set...")
+            logger.debug("Video client started, waiting for UID to be set...")
             
             while self.running:
                 # Always capture frames to keep camera active (prevents segfault)
@@ -1078,7 +1300,7 @@ class VideoClient(QThread):
                         # Only emit and send frames if video is enabled
                         if self.enabled:
                             # Emit frame for local display
-                            self.frame_captured.emit(frame)
+                            self.frame_captured.emit(bgr_frame_to_qimage(frame))
                             
                             # Send frame to server if connected
                             if self.uid and self.socket:
@@ -1108,7 +1330,7 @@ class VideoClient(QThread):
             if self.cap:
                 try:
                     self.cap.release()
-                    print("[DEBUG] Camera released safely")
+                    logger.debug("Camera released safely")
                 except Exception as e:
                     print(f"[WARNING] Camera release error: {e}")
                 finally:
@@ -1126,6 +1348,7 @@ class VideoClient(QThread):
     
     def send_frame(self, frame: np.ndarray):
         """Send frame to server."""
+        import cv2
         try:
             # Resize frame to ensure it's small enough
             small_frame = cv2.resize(frame, (320, 240))
@@ -1142,7 +1365,7 @@ class VideoClient(QThread):
             
             # Create packet header (uid, sequence, frame_id, data_size)
             frame_id = self.sequence  # Use sequence as frame_id
-            header = struct.pack('!IIII', self.uid, self.sequence, frame_id, len(frame_data))
+            header = VIDEO_HEADER.pack(self.uid, self.sequence, frame_id, len(frame_data))
             packet = header + frame_data
             
             # Send packet
@@ -1150,7 +1373,7 @@ class VideoClient(QThread):
             self.sequence += 1
             
             if self.sequence % 30 == 0:  # Debug every 30 frames (2 seconds at 15fps)
-                print(f"[DEBUG] Sent video frame {self.sequence} to {self.server_host}:{self.server_port}")
+                logger.debug("Sent video frame %s to %s:%s", self.sequence, self.server_host, self.server_port)
             
         except Exception as e:
             print(f"[ERROR] Send frame error: {e}")
@@ -1158,26 +1381,25 @@ class VideoClient(QThread):
     def handle_incoming_video(self, data: bytes):
         """Handle incoming video from server."""
         try:
-            if len(data) < 16:
+            if len(data) < VIDEO_HEADER.size:
                 return
             
-            uid, sequence, frame_id, data_size = struct.unpack('!IIII', data[:16])
+            uid, sequence, frame_id, data_size = VIDEO_HEADER.unpack_from(data)
             
             # Don't process our own video
             if uid == self.uid:
                 return
             
-            video_data = data[16:]
+            video_data = data[VIDEO_HEADER.size:]
             if len(video_data) != data_size:
                 return
             
-            # Decode video frame
-            frame_array = np.frombuffer(video_data, dtype=np.uint8)
-            frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
+            # Decode the JPEG straight into a QImage (safe outside the GUI thread)
+            image = QImage.fromData(video_data, "JPG")
             
-            if frame is not None:
-                self.frame_received.emit(uid, frame)
-                print(f"[DEBUG] Received video frame from UID {uid}")
+            if not image.isNull():
+                self.frame_received.emit(uid, image)
+                logger.debug("Received video frame from UID %s", uid)
                 
         except Exception as e:
             print(f"[ERROR] Video receive error: {e}")
@@ -1217,6 +1439,7 @@ class AudioClient(QThread):
             return
         
         try:
+            import pyaudio
             self.running = True
             
             # Initialize PyAudio
@@ -1235,7 +1458,7 @@ class AudioClient(QThread):
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.settimeout(0.01)  # Very short timeout for audio
             
-            print(f"[DEBUG] Audio client started, waiting for UID to be set...")
+            logger.debug("Audio client started, waiting for UID to be set...")
             
             # Initialize output stream for playing received audio
             self.output_stream = self.audio.open(
@@ -1284,7 +1507,7 @@ class AudioClient(QThread):
         """Send audio data to server."""
         try:
             # Create packet header
-            header = struct.pack('!III', self.uid, self.sequence, len(audio_data))
+            header = AUDIO_HEADER.pack(self.uid, self.sequence, len(audio_data))
             packet = header + audio_data
             
             # Send packet
@@ -1297,16 +1520,16 @@ class AudioClient(QThread):
     def handle_incoming_audio(self, data: bytes):
         """Handle incoming audio from server."""
         try:
-            if len(data) < 12:
+            if len(data) < AUDIO_HEADER.size:
                 return
             
-            uid, sequence, data_size = struct.unpack('!III', data[:12])
+            uid, sequence, data_size = AUDIO_HEADER.unpack_from(data)
             
             # Don't play our own audio back
             if uid == self.uid:
                 return
             
-            audio_data = data[12:]
+            audio_data = data[AUDIO_HEADER.size:]
             if len(audio_data) != data_size:
                 return
             
@@ -1342,6 +1565,10 @@ class ConnectionDialog(QDialog):
         
         self.setup_ui()
         
+        # Probe the local IP in the background so "Local IP" is usually instant;
+        # a failed probe is not cached, so the button simply probes again
+        QThreadPool.globalInstance().start(get_local_ip)
+        
     def setup_ui(self):
         """Setup connection dialog UI."""
         layout = QVBoxLayout(self)
@@ -1438,26 +1665,12 @@ class ConnectionDialog(QDialog):
         layout.addLayout(button_layout)
     
     def set_local_ip(self):
-        """Set the local IP address."""
-        try:
-            # Get local IP address
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
+        """Set the local IP address (cached, or probed now if not yet found)."""
+        local_ip = get_local_ip()
+        if local_ip:
             self.server_ip_input.setText(local_ip)
-        except Exception:
-            # Fallback method
-            try:
-                import subprocess
-                result = subprocess.run(['hostname', '-I'], capture_output=True, text=True)
-                if result.returncode == 0:
-                    local_ip = result.stdout.strip().split()[0]
-                    self.server_ip_input.setText(local_ip)
-                else:
-                    QMessageBox.warning(self, "IP Detection", "Could not detect local IP address")
-            except Exception:
-                QMessageBox.warning(self, "IP Detection", "Could not detect local IP address")
+        else:
+            QMessageBox.warning(self, "IP Detection", "Could not detect local IP address")
     
     def get_connection_info(self):
         """Get connection information."""
@@ -1622,18 +1835,23 @@ class FileListDialog(QDialog):
 
 
 # ============================================================================
-# FILE UPLOAD THREAD
+# FILE UPLOAD TASK
 # ============================================================================
 
-class FileUploadThread(QThread):
-    """Thread for uploading files to server."""
+class FileUploadSignals(QObject):
+    """Signals for FileUploadThread (a QRunnable cannot emit on its own)."""
     
     upload_progress = pyqtSignal(str, int)  # filename, progress percentage
     upload_finished = pyqtSignal(str)  # filename
     upload_error = pyqtSignal(str, str)  # filename, error_message
+
+
+class FileUploadThread(QRunnable):
+    """Pooled task for uploading files to server."""
     
-    def __init__(self, host: str, port: int, file_path: str, uploader: str, parent=None):
-        super().__init__(parent)
+    def __init__(self, host: str, port: int, file_path: str, uploader: str):
+        super().__init__()
+        self.signals = FileUploadSignals()
         self.host = host
         self.port = port
         # Ensure file_path is a string
@@ -1646,12 +1864,12 @@ class FileUploadThread(QThread):
         try:
             # Validate file path
             if not self.file_path or not isinstance(self.file_path, str):
-                self.upload_error.emit(self.filename, "Invalid file path")
+                self.signals.upload_error.emit(self.filename, "Invalid file path")
                 return
                 
             file_info = Path(self.file_path)
             if not file_info.exists():
-                self.upload_error.emit(self.filename, "File not found")
+                self.signals.upload_error.emit(self.filename, "File not found")
                 return
             
             file_size = file_info.stat().st_size
@@ -1667,15 +1885,15 @@ class FileUploadThread(QThread):
                 'uploader': self.uploader
             }
             
-            info_data = json.dumps(upload_info).encode('utf-8')
-            info_size = struct.pack('!I', len(info_data))
+            info_data = encode_message(upload_info)
+            info_size = LENGTH_PREFIX.pack(len(info_data))
             sock.send(info_size + info_data)
             
             # Wait for OK response
             response = sock.recv(1024)
             if not response.startswith(b'OK'):
                 error_msg = response.decode('utf-8', errors='ignore')
-                self.upload_error.emit(self.filename, error_msg)
+                self.signals.upload_error.emit(self.filename, error_msg)
                 return
             
             # Upload file data
@@ -1692,34 +1910,39 @@ class FileUploadThread(QThread):
                     
                     # Update progress
                     progress = int((sent / file_size) * 100)
-                    self.upload_progress.emit(self.filename, progress)
+                    self.signals.upload_progress.emit(self.filename, progress)
             
             # Wait for final response
             final_response = sock.recv(1024)
             sock.close()
             
             if sent == file_size:
-                self.upload_finished.emit(self.filename)
+                self.signals.upload_finished.emit(self.filename)
             else:
-                self.upload_error.emit(self.filename, "Incomplete upload")
+                self.signals.upload_error.emit(self.filename, "Incomplete upload")
                 
         except Exception as e:
-            self.upload_error.emit(self.filename, str(e))
+            self.signals.upload_error.emit(self.filename, str(e))
 
 
 # ============================================================================
-# FILE DOWNLOAD THREAD
+# FILE DOWNLOAD TASK
 # ============================================================================
 
-class FileDownloadThread(QThread):
-    """Thread for downloading files from server."""
+class FileDownloadSignals(QObject):
+    """Signals for FileDownloadThread (a QRunnable cannot emit on its own)."""
     
     download_progress = pyqtSignal(str, int)  # filename, progress percentage
     download_finished = pyqtSignal(str, str)  # filename, save_path
     download_error = pyqtSignal(str, str)  # filename, error_message
+
+
+class FileDownloadThread(QRunnable):
+    """Pooled task for downloading files from server."""
     
-    def __init__(self, host: str, port: int, file_id: str, save_path: str, parent=None):
-        super().__init__(parent)
+    def __init__(self, host: str, port: int, file_id: str, save_path: str):
+        super().__init__()
+        self.signals = FileDownloadSignals()
         self.host = host
         self.port = port
         self.file_id = file_id
@@ -1735,24 +1958,24 @@ class FileDownloadThread(QThread):
             
             # Send file ID
             file_id_data = self.file_id.encode('utf-8')
-            id_size = struct.pack('!I', len(file_id_data))
+            id_size = LENGTH_PREFIX.pack(len(file_id_data))
             sock.send(id_size + file_id_data)
             
             # Read file info
             info_size_data = sock.recv(4)
             if not info_size_data:
-                self.download_error.emit(self.filename, "Failed to receive file info")
+                self.signals.download_error.emit(self.filename, "Failed to receive file info")
                 return
             
-            info_size = struct.unpack('!I', info_size_data)[0]
+            info_size = LENGTH_PREFIX.unpack(info_size_data)[0]
             info_data = sock.recv(info_size)
             
             if info_data.startswith(b'ERROR'):
                 error_msg = info_data.decode('utf-8')
-                self.download_error.emit(self.filename, error_msg)
+                self.signals.download_error.emit(self.filename, error_msg)
                 return
             
-            file_info = json.loads(info_data.decode('utf-8'))
+            file_info = decode_message(info_data)
             file_size = file_info['size']
             
             # Download file data
@@ -1769,17 +1992,17 @@ class FileDownloadThread(QThread):
                     
                     # Update progress
                     progress = int((received / file_size) * 100)
-                    self.download_progress.emit(self.filename, progress)
+                    self.signals.download_progress.emit(self.filename, progress)
             
             sock.close()
             
             if received == file_size:
-                self.download_finished.emit(self.filename, self.save_path)
+                self.signals.download_finished.emit(self.filename, self.save_path)
             else:
-                self.download_error.emit(self.filename, "Incomplete download")
+                self.signals.download_error.emit(self.filename, "Incomplete download")
                 
         except Exception as e:
-            self.download_error.emit(self.filename, str(e))
+            self.signals.download_error.emit(self.filename, str(e))
 
 
 # ============================================================================
@@ -1795,6 +2018,15 @@ class ScreenCaptureClient(QThread):
         self.server_port = server_port
         self.running = False
         self.socket = None
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def is_supported() -> bool:
+        """Whether capture_screen can work here, without grabbing a frame."""
+        if not HAS_OPENCV:
+            return False
+        # macOS uses the screencapture command, elsewhere PIL's ImageGrab
+        return sys.platform == "darwin" or importlib.util.find_spec("PIL") is not None
         
     def run(self):
         """Run screen capture loop."""
@@ -1806,7 +2038,7 @@ class ScreenCaptureClient(QThread):
             self.socket.connect((self.server_host, self.server_port))
             
             # Send presenter type
-            self.socket.send(struct.pack('!I', 1))  # 1 = presenter
+            self.socket.send(LENGTH_PREFIX.pack(1))  # 1 = presenter
             
             # Wait for OK response
             response = self.socket.recv(1024)
@@ -1822,7 +2054,7 @@ class ScreenCaptureClient(QThread):
                     screenshot = self.capture_screen()
                     if screenshot:
                         # Send frame size
-                        frame_size = struct.pack('!I', len(screenshot))
+                        frame_size = LENGTH_PREFIX.pack(len(screenshot))
                         self.socket.send(frame_size)
                         
                         # Send frame data
@@ -1847,6 +2079,8 @@ class ScreenCaptureClient(QThread):
         try:
             if not HAS_OPENCV:
                 return None
+            import cv2
+            import numpy as np
             
             # Use different methods based on platform
             if sys.platform == "darwin":  # macOS
@@ -1857,13 +2091,14 @@ class ScreenCaptureClient(QThread):
                     subprocess.run(['screencapture', '-x', tmp.name], check=True)
                     screenshot = cv2.imread(tmp.name)
                     os.unlink(tmp.name)
+                needs_bgr_swap = False
             else:
                 # For other platforms, try using PIL if available
                 try:
                     from PIL import ImageGrab
-                    import numpy as np
                     pil_image = ImageGrab.grab()
-                    screenshot = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+                    screenshot = np.asarray(pil_image)
+                    needs_bgr_swap = True  # ImageGrab gives RGB, imencode wants BGR
                 except ImportError:
                     print("[ERROR] Screen capture requires PIL/Pillow: pip install Pillow")
                     return None
@@ -1877,6 +2112,9 @@ class ScreenCaptureClient(QThread):
                 new_width = min(1280, width)
                 new_height = int(height * (new_width / width))
                 screenshot = cv2.resize(screenshot, (new_width, new_height))
+                if needs_bgr_swap:
+                    # Swap after downscaling so only the smaller frame is converted
+                    screenshot = cv2.cvtColor(screenshot, cv2.COLOR_RGB2BGR)
                 
                 # Compress as JPEG
                 _, encoded = cv2.imencode('.jpg', screenshot, [cv2.IMWRITE_JPEG_QUALITY, 60])
@@ -1895,24 +2133,29 @@ class ScreenCaptureClient(QThread):
 class ScreenPreviewCapture(QThread):
     """Captures screen for preview display in the Screen Share tab."""
     
-    preview_frame_ready = pyqtSignal(np.ndarray)  # Signal to emit captured frames
+    preview_frame_ready = pyqtSignal(int)  # Signal to emit the ring slot of a captured frame
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.running = False
+        self._ring = []  # Preallocated frame buffers, (re)built when the size changes
+        self._scratch = None  # Downscaled BGR frame awaiting conversion (macOS)
+        self._write_idx = 0
+        self.reader_idx = -1  # Slot the GUI is rendering; never overwritten
+        self.target_size = None  # (width, height) of the preview label, set by the GUI
         
     def run(self):
         """Run preview capture loop."""
         try:
             self.running = True
-            print("[DEBUG] Screen preview capture started")
+            logger.debug("Screen preview capture started")
             
             while self.running:
                 try:
                     # Capture screen using the same method as ScreenCaptureClient
-                    screenshot = self.capture_screen_for_preview()
-                    if screenshot is not None:
-                        self.preview_frame_ready.emit(screenshot)
+                    slot = self.capture_screen_for_preview()
+                    if slot is not None:
+                        self.preview_frame_ready.emit(slot)
                     
                     self.msleep(500)  # 2 FPS for preview (less frequent than actual sharing)
                     
@@ -1924,13 +2167,38 @@ class ScreenPreviewCapture(QThread):
             print(f"[ERROR] Preview capture thread error: {e}")
         finally:
             self.running = False
-            print("[DEBUG] Screen preview capture stopped")
+            logger.debug("Screen preview capture stopped")
+    
+    def frame_at(self, slot: int) -> np.ndarray:
+        """Return the preview buffer for a ring slot."""
+        return self._ring[slot]
+    
+    @staticmethod
+    def _aligned_frame(height: int, width: int) -> np.ndarray:
+        """Allocate an RGB frame whose rows are padded to PREVIEW_ROW_ALIGN bytes."""
+        import numpy as np
+        stride = -(-width * 3 // PREVIEW_ROW_ALIGN) * PREVIEW_ROW_ALIGN
+        rows = np.empty((height, stride), np.uint8)
+        return rows[:, :width * 3].reshape(height, width, 3)
+    
+    def _next_slot(self, shape) -> int:
+        """Pick the next ring slot to write, skipping the one being rendered."""
+        if not self._ring or self._ring[0].shape != shape:
+            self._ring = [self._aligned_frame(shape[0], shape[1]) for _ in range(PREVIEW_RING_SLOTS)]
+            self.reader_idx = -1
+        slot = (self._write_idx + 1) % PREVIEW_RING_SLOTS
+        if slot == self.reader_idx:
+            slot = (slot + 1) % PREVIEW_RING_SLOTS
+        self._write_idx = slot
+        return slot
     
     def capture_screen_for_preview(self):
-        """Capture the screen and return as numpy array for preview."""
+        """Capture the screen as RGB into the preview ring and return its slot."""
         try:
             if not HAS_OPENCV:
                 return None
+            import cv2
+            import numpy as np
             
             # Use different methods based on platform
             if sys.platform == "darwin":  # macOS
@@ -1941,13 +2209,14 @@ class ScreenPreviewCapture(QThread):
                     subprocess.run(['screencapture', '-x', tmp.name], check=True)
                     screenshot = cv2.imread(tmp.name)
                     os.unlink(tmp.name)
+                needs_rgb_swap = True  # imread gives BGR
             else:
                 # For other platforms, try using PIL if available
                 try:
                     from PIL import ImageGrab
-                    import numpy as np
                     pil_image = ImageGrab.grab()
-                    screenshot = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+                    screenshot = np.asarray(pil_image)  # Already RGB, as Qt wants it
+                    needs_rgb_swap = False
                 except ImportError:
                     print("[ERROR] Screen capture requires PIL/Pillow: pip install Pillow")
                     return None
@@ -1956,12 +2225,27 @@ class ScreenPreviewCapture(QThread):
                     return None
             
             if screenshot is not None:
-                # Resize for preview (smaller than actual sharing)
+                # Resize for preview (smaller than actual sharing) straight into
+                # the ring, fitted to the preview label so the GUI never rescales
                 height, width = screenshot.shape[:2]
-                new_width = min(640, width)  # Smaller for preview
-                new_height = int(height * (new_width / width))
-                screenshot = cv2.resize(screenshot, (new_width, new_height))
-                return screenshot
+                scale = min(1.0, 640 / width)  # Smaller for preview
+                target_size = self.target_size
+                if target_size and target_size[0] > 0 and target_size[1] > 0:
+                    scale = min(scale, target_size[0] / width, target_size[1] / height)
+                new_width = max(1, int(width * scale))
+                new_height = max(1, int(height * scale))
+                slot = self._next_slot((new_height, new_width, 3))
+                if needs_rgb_swap:
+                    # Downscale first so the colour swap only touches the small frame
+                    if self._scratch is None or self._scratch.shape != (new_height, new_width, 3):
+                        self._scratch = np.empty((new_height, new_width, 3), np.uint8)
+                    cv2.resize(screenshot, (new_width, new_height), dst=self._scratch,
+                               interpolation=cv2.INTER_AREA)
+                    cv2.cvtColor(self._scratch, cv2.COLOR_BGR2RGB, dst=self._ring[slot])
+                else:
+                    cv2.resize(screenshot, (new_width, new_height), dst=self._ring[slot],
+                               interpolation=cv2.INTER_AREA)
+                return slot
             
         except Exception as e:
             print(f"[ERROR] Preview screen capture failed: {e}")
@@ -2034,6 +2318,8 @@ class ScreenShareViewer(QMainWindow):
     
     def update_screen(self, frame_data: bytes):
         """Update the screen display with new frame."""
+        import cv2
+        import numpy as np
         try:
             # Decode frame
             frame_array = np.frombuffer(frame_data, dtype=np.uint8)
@@ -2100,7 +2386,7 @@ class ScreenShareReceiver(QThread):
             self.socket.connect((self.server_host, self.server_port))
             
             # Send viewer type
-            self.socket.send(struct.pack('!I', 2))  # 2 = viewer
+            self.socket.send(LENGTH_PREFIX.pack(2))  # 2 = viewer
             
             # Wait for OK response
             response = self.socket.recv(1024)
@@ -2117,7 +2403,7 @@ class ScreenShareReceiver(QThread):
                     if not size_data:
                         break
                     
-                    frame_size = struct.unpack('!I', size_data)[0]
+                    frame_size = LENGTH_PREFIX.unpack(size_data)[0]
                     
                     # Read frame data
                     frame_data = b''
@@ -2148,6 +2434,427 @@ class ScreenShareReceiver(QThread):
         self.running = False
 
 
+# ============================================================================
+# THEME STYLESHEETS
+# ============================================================================
+
+# Widgets flip a dynamic "state" property instead of calling setStyleSheet,
+# so these rules are parsed once with the theme and only re-polished
+STATE_STYLE = """
+QLabel[state="connected"] {
+    color: #28a745;
+    font-weight: bold;
+}
+QLabel[state="disconnected"] {
+    color: #dc3545;
+    font-weight: bold;
+}
+"""
+
+# Parsed text is built once per process; apply_*_theme just hands it to Qt
+DARK_THEME_STYLE = """
+/* Main Application */
+QMainWindow {
+    background-color: #000000;
+    color: #ffffff;
+    font-family: 'Segoe UI', 'Arial', sans-serif;
+    font-size: 12px;
+}
+
+/* Menu Bar */
+QMenuBar {
+    background-color: #000000;
+    color: #ffffff;
+    border-bottom: 1px solid #333333;
+    padding: 2px;
+}
+QMenuBar::item {
+    background-color: transparent;
+    padding: 6px 12px;
+    border-radius: 4px;
+    margin: 2px;
+}
+QMenuBar::item:selected {
+    background-color: #0078d4;
+}
+QMenuBar::item:pressed {
+    background-color: #106ebe;
+}
+
+/* Menu */
+QMenu {
+    background-color: #000000;
+    color: #ffffff;
+    border: 1px solid #333333;
+    border-radius: 6px;
+    padding: 4px;
+}
+QMenu::item {
+    padding: 8px 16px;
+    border-radius: 4px;
+    margin: 1px;
+}
+QMenu::item:selected {
+    background-color: #0078d4;
+}
+QMenu::separator {
+    height: 1px;
+    background-color: #333333;
+    margin: 4px 8px;
+}
+
+/* Status Bar */
+QStatusBar {
+    background-color: #000000;
+    color: #ffffff;
+    border-top: 1px solid #333333;
+    padding: 4px;
+}
+
+/* Buttons */
+QPushButton {
+    background-color: #0078d4;
+    color: #ffffff;
+    border: none;
+    border-radius: 6px;
+    padding: 8px 16px;
+    font-weight: 500;
+    min-height: 20px;
+}
+QPushButton:hover {
+    background-color: #106ebe;
+}
+QPushButton:pressed {
+    background-color: #005a9e;
+}
+QPushButton:disabled {
+    background-color: #333333;
+    color: #888888;
+}
+
+/* Input Fields */
+QLineEdit {
+    background-color: #000000;
+    color: #ffffff;
+    border: 2px solid #333333;
+    border-radius: 6px;
+    padding: 8px 12px;
+    font-size: 12px;
+    selection-background-color: #0078d4;
+}
+QLineEdit:focus {
+    border-color: #0078d4;
+    background-color: #111111;
+}
+QLineEdit:disabled {
+    background-color: #000000;
+    color: #666666;
+}
+
+/* Text Areas */
+QTextEdit, QTextBrowser {
+    background-color: #000000;
+    color: #ffffff;
+    border: 2px solid #333333;
+    border-radius: 6px;
+    padding: 8px;
+    font-family: 'Consolas', 'Monaco', monospace;
+    font-size: 11px;
+    line-height: 1.4;
+}
+QTextEdit:focus, QTextBrowser:focus {
+    border-color: #0078d4;
+}
+
+/* Lists */
+QListWidget {
+    background-color: #000000;
+    color: #ffffff;
+    border: 2px solid #333333;
+    border-radius: 6px;
+    padding: 4px;
+    outline: none;
+}
+QListWidget::item {
+    padding: 8px 12px;
+    border-radius: 4px;
+    margin: 1px;
+}
+QListWidget::item:selected {
+    background-color: #0078d4;
+}
+QListWidget::item:hover {
+    background-color: #333333;
+}
+
+/* Tables */
+QTableWidget {
+    background-color: #000000;
+    color: #ffffff;
+    border: 2px solid #333333;
+    border-radius: 6px;
+    gridline-color: #333333;
+    outline: none;
+}
+QTableWidget::item {
+    padding: 8px;
+    border-bottom: 1px solid #333333;
+}
+QTableWidget::item:selected {
+    background-color: #0078d4;
+}
+QHeaderView::section {
+    background-color: #333333;
+    color: #ffffff;
+    padding: 8px 12px;
+    border: none;
+    font-weight: 600;
+}
+
+/* Tabs */
+QTabWidget::pane {
+    border: 2px solid #333333;
+    border-radius: 6px;
+    background-color: #000000;
+}
+QTabBar::tab {
+    background-color: #333333;
+    color: #ffffff;
+    padding: 8px 16px;
+    margin: 2px;
+    border-radius: 6px 6px 0px 0px;
+    min-width: 80px;
+}
+QTabBar::tab:selected {
+    background-color: #0078d4;
+}
+QTabBar::tab:hover {
+    background-color: #444444;
+}
+
+/* Frames */
+QFrame {
+    background-color: #000000;
+    border: 1px solid #333333;
+    border-radius: 6px;
+}
+
+/* Group Boxes */
+QGroupBox {
+    color: #ffffff;
+    font-weight: 600;
+    border: 2px solid #333333;
+    border-radius: 6px;
+    margin-top: 12px;
+    padding-top: 8px;
+}
+
+/* Check Boxes */
+QCheckBox {
+    color: #ffffff;
+    spacing: 8px;
+}
+QCheckBox::indicator {
+    width: 16px;
+    height: 16px;
+    border: 2px solid #3d3d3d;
+    border-radius: 3px;
+    background-color: #2d2d2d;
+}
+QCheckBox::indicator:checked {
+    background-color: #0078d4;
+    border-color: #0078d4;
+}
+
+/* Combo Boxes */
+QComboBox {
+    background-color: #2d2d2d;
+    color: #ffffff;
+    border: 2px solid #3d3d3d;
+    border-radius: 6px;
+    padding: 6px 12px;
+    min-width: 100px;
+}
+QComboBox:focus {
+    border-color: #0078d4;
+}
+QComboBox::drop-down {
+    border: none;
+    width: 20px;
+}
+
+/* Progress Bars */
+QProgressBar {
+    background-color: #3d3d3d;
+    border: none;
+    border-radius: 6px;
+    text-align: center;
+    color: #ffffff;
+    font-weight: 600;
+}
+QProgressBar::chunk {
+    background-color: #0078d4;
+    border-radius: 6px;
+}
+
+/* Sliders */
+QSlider::groove:horizontal {
+    background-color: #3d3d3d;
+    height: 6px;
+    border-radius: 3px;
+}
+QSlider::handle:horizontal {
+    background-color: #0078d4;
+    width: 16px;
+    height: 16px;
+    border-radius: 8px;
+    margin: -5px 0;
+}
+QSlider::handle:horizontal:hover {
+    background-color: #106ebe;
+}
+
+/* Scroll Bars */
+QScrollBar:vertical {
+    background-color: #2d2d2d;
+    width: 12px;
+    border-radius: 6px;
+}
+QScrollBar::handle:vertical {
+    background-color: #5d5d5d;
+    border-radius: 6px;
+    min-height: 20px;
+}
+QScrollBar::handle:vertical:hover {
+    background-color: #6d6d6d;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+
+/* Tool Tips */
+QToolTip {
+    background-color: #2d2d2d;
+    color: #ffffff;
+    border: 1px solid #3d3d3d;
+    border-radius: 4px;
+    padding: 4px 8px;
+    font-size: 11px;
+}
+
+/* Labels */
+QLabel {
+    color: #ffffff;
+}
+
+/* Dialogs */
+QDialog {
+    background-color: #1e1e1e;
+    color: #ffffff;
+}
+""" + STATE_STYLE
+
+# Same approach as the working minimal_client
+MINIMAL_THEME_STYLE = """
+QMainWindow {
+    background-color: #2d2d2d;
+    color: white;
+}
+QPushButton {
+    background-color: #0078d4;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+}
+QPushButton:hover {
+    background-color: #106ebe;
+}
+QLineEdit {
+    background-color: white;
+    color: black;
+    border: 1px solid #ccc;
+    padding: 4px;
+}
+QTextBrowser, QTextEdit {
+    background-color: white;
+    color: black;
+    border: 1px solid #ccc;
+}
+QLabel {
+    color: white;
+}
+QTabWidget::pane {
+    border: 1px solid #ccc;
+}
+QTabBar::tab {
+    background-color: #f0f0f0;
+    padding: 8px;
+}
+QTabBar::tab:selected {
+    background-color: white;
+}
+""" + STATE_STYLE
+
+
+# Dark palette colours, applied alongside DARK_THEME_STYLE
+DARK_PALETTE_COLORS = (
+    (QPalette.ColorRole.Window, (30, 30, 30)),
+    (QPalette.ColorRole.WindowText, (255, 255, 255)),
+    (QPalette.ColorRole.Base, (45, 45, 45)),
+    (QPalette.ColorRole.AlternateBase, (60, 60, 60)),
+    (QPalette.ColorRole.ToolTipBase, (45, 45, 45)),
+    (QPalette.ColorRole.ToolTipText, (255, 255, 255)),
+    (QPalette.ColorRole.Text, (255, 255, 255)),
+    (QPalette.ColorRole.Button, (45, 45, 45)),
+    (QPalette.ColorRole.ButtonText, (255, 255, 255)),
+    (QPalette.ColorRole.BrightText, (255, 0, 0)),
+    (QPalette.ColorRole.Link, (0, 120, 212)),
+    (QPalette.ColorRole.Highlight, (0, 120, 212)),
+    (QPalette.ColorRole.HighlightedText, (255, 255, 255)),
+)
+
+@functools.lru_cache(maxsize=None)
+def dark_palette() -> QPalette:
+    """Build the dark QPalette once; QPalette is implicitly shared."""
+    # Built lazily because a QPalette needs the QApplication to exist
+    palette = QPalette()
+    for role, rgb in DARK_PALETTE_COLORS:
+        palette.setColor(role, QColor(*rgb))
+    return palette
+
+
+# Screen share status label variants, keyed by background colour
+SCREEN_STATUS_STYLE = """
+    QLabel {{
+        background-color: {background};
+        color: {color};
+        border-radius: 6px;
+        padding: 10px;
+        font-size: 14px;
+        font-weight: bold;
+        margin: 10px 0;
+    }}
+"""
+SCREEN_STATUS_IDLE_STYLE = SCREEN_STATUS_STYLE.format(background="#333333", color="#ffffff")
+SCREEN_STATUS_WARNING_STYLE = SCREEN_STATUS_STYLE.format(background="#ffc107", color="#000000")
+SCREEN_STATUS_OK_STYLE = SCREEN_STATUS_STYLE.format(background="#28a745", color="#ffffff")
+SCREEN_STATUS_ERROR_STYLE = SCREEN_STATUS_STYLE.format(background="#dc3545", color="#ffffff")
+SCREEN_STATUS_STYLES = {
+    'idle': SCREEN_STATUS_IDLE_STYLE,
+    'requesting': SCREEN_STATUS_WARNING_STYLE,
+    'sharing': SCREEN_STATUS_OK_STYLE,
+    'error': SCREEN_STATUS_ERROR_STYLE,
+}
+
+# Screen preview label once frames are being shown
+PREVIEW_ACTIVE_STYLE = """
+    QLabel {
+        background-color: transparent;
+        border: none;
+    }
+"""
+
+
 # ============================================================================
 # MAIN CLIENT WINDOW
 # ============================================================================
@@ -2155,6 +2862,10 @@ class ScreenShareReceiver(QThread):
 class ClientMainWindow(QMainWindow):
     """Main client window with comprehensive GUI."""
     
+    send_requested = pyqtSignal(dict)  # outbound control message
+    send_raw_requested = pyqtSignal(bytes)  # outbound message already encoded
+    connection_state_changed = pyqtSignal(bool)  # emitted when self.connected flips
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("LAN Collaboration Client")
@@ -2175,18 +2886,58 @@ class ClientMainWindow(QMainWindow):
         self.connected = False
         self.participants = {}
         self.pending_upload = None  # File path waiting for upload port
+        self._session_widgets_built = False
+        self.probe_thread = None
+        self._pending_conn_info = None
+        self._last_progress = {}  # (verb, filename) -> (last reported percent, time)
+        
+        # File transfers reuse pooled workers instead of a QThread each
+        self.transfer_pool = QThreadPool()
+        self.transfer_pool.setMaxThreadCount(FILE_TRANSFER_WORKERS)
+        self._active_transfers = set()
+        
+        # Screen sharing - widgets are filled in by create_screen_share_tab
+        self.screen_capture_client = None
+        self.screen_viewer = None
+        self.screen_preview_capture = None
+        self._preview_stopping = False  # Stop requested, waiting for finished
+        self._preview_restart_requested = False
+        self.preview_render_timer = None
+        self.screen_preview_label = None
+        self.screen_share_status = None
+        self.start_share_btn = None
+        self.stop_share_btn = None
+        self._pending_preview = None
+        self._preview_style_applied = False
+        self._screen_status_state = None
+        
+        # Message type -> handler, built once instead of an if/elif chain
+        self._message_handlers = {
+            MessageTypes.LOGIN_SUCCESS: self._on_login_success,
+            MessageTypes.PARTICIPANT_LIST: self._on_participant_list,
+            MessageTypes.USER_JOINED: self._on_user_joined,
+            MessageTypes.USER_LEFT: self._on_user_left,
+            MessageTypes.CHAT: self._on_chat,
+            MessageTypes.UNICAST: self._on_unicast,
+            MessageTypes.FILE_UPLOAD_PORT: self._on_file_upload_port,
+            MessageTypes.FILE_DOWNLOAD_PORT: self._on_file_download_port,
+            MessageTypes.FILE_AVAILABLE: self._on_file_available,
+            MessageTypes.UNICAST_SENT: self._on_unicast_sent,
+            MessageTypes.SCREEN_SHARE_PORTS: self._on_screen_share_ports,
+            MessageTypes.PRESENT_START_BROADCAST: self._on_present_start_broadcast,
+            MessageTypes.PRESENT_STOP_BROADCAST: self._on_present_stop_broadcast,
+            MessageTypes.ERROR: self._on_error,
+        }
         
         # Setup UI
         self.setup_ui()
         self.setup_menu_bar()
         self.setup_status_bar()
         
-        # Apply black background theme
-        print("[INFO] Applying black background theme")
-        self.apply_dark_theme()
-        
-        # Show connection dialog
-        self.show_connection_dialog()
+        # Apply black background theme and prompt for a connection once the
+        # event loop is running, so the window paints before QSS is parsed
+        QTimer.singleShot(0, self.apply_dark_theme)
+        QTimer.singleShot(0, self.show_initial_connection_dialog)
     
     def setup_ui(self):
         """Setup tabbed UI with separate sections for each functionality."""
@@ -2202,12 +2953,32 @@ class ClientMainWindow(QMainWindow):
         sidebar = QFrame()
         sidebar.setFrameStyle(QFrame.Shape.StyledPanel)
         sidebar.setFixedWidth(200)
+        sidebar.setObjectName("sidebar")
+        # Nav button rules live on the sidebar once, so checking a button
+        # only re-polishes that button instead of re-parsing its own sheet
         sidebar.setStyleSheet("""
-            QFrame {
+            QFrame#sidebar {
                 background-color: #000000;
                 border-radius: 10px;
                 border: 1px solid #333333;
             }
+            QFrame#sidebar > QPushButton#navButton {
+                background-color: #333333;
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 12px;
+                text-align: left;
+                font-size: 14px;
+                margin: 2px;
+            }
+            QFrame#sidebar > QPushButton#navButton:hover {
+                background-color: #444444;
+            }
+            QFrame#sidebar > QPushButton#navButton:checked {
+                background-color: #0078d4;
+                font-weight: bold;
+            }
         """)
         
         sidebar_layout = QVBoxLayout(sidebar)
@@ -2231,27 +3002,10 @@ class ClientMainWindow(QMainWindow):
         """)
         sidebar_layout.addWidget(self.title_label)
         
-        # Navigation buttons
+        # Navigation buttons - the exclusive group keeps exactly one checked
         self.nav_buttons = {}
-        nav_button_style = """
-            QPushButton {
-                background-color: #333333;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px;
-                text-align: left;
-                font-size: 14px;
-                margin: 2px;
-            }
-            QPushButton:hover {
-                background-color: #444444;
-            }
-            QPushButton:checked {
-                background-color: #0078d4;
-                font-weight: bold;
-            }
-        """
+        self._nav_group = QButtonGroup(self)
+        self._nav_group.setExclusive(True)
         
         # Create navigation buttons for each functionality
         nav_buttons_data = [
@@ -2265,14 +3019,11 @@ class ClientMainWindow(QMainWindow):
         for button_id, button_text, tab_name in nav_buttons_data:
             btn = QPushButton(button_text)
             btn.setCheckable(True)
-            btn.setStyleSheet(nav_button_style)
+            btn.setObjectName("navButton")
             btn.clicked.connect(lambda checked, tab=tab_name: self.switch_to_tab(tab))
             self.nav_buttons[button_id] = btn
             sidebar_layout.addWidget(btn)
         
-        # Set first button as active
-        self.nav_buttons["video_meet"].setChecked(True)
-        
         # Spacer to push disconnect button to bottom
         sidebar_layout.addStretch()
         
@@ -2306,13 +3057,21 @@ class ClientMainWindow(QMainWindow):
             }
         """)
         
-        # Create all tab content
+        # Create all tab content; each helper records its stack index
+        self._tab_index = {}
         self.create_video_meeting_tab()
         self.create_screen_share_tab()
         self.create_chat_tab()
         self.create_file_transfer_tab()
         self.create_participants_tab()
         
+        # Button ids mirror the stack index of the tab they open
+        for button_id, _, tab_name in nav_buttons_data:
+            self._nav_group.addButton(self.nav_buttons[button_id], self._tab_index[tab_name])
+        
+        # Set first button as active
+        self.nav_buttons["video_meet"].setChecked(True)
+        
         main_layout.addWidget(self.content_stack, 1)  # Takes remaining space
 
     def update_title_with_username(self):
@@ -2344,19 +3103,10 @@ class ClientMainWindow(QMainWindow):
         """)
         layout.addWidget(header)
         
-        # Video grid (reuse existing component)
-        self.video_grid = VideoGrid()
-        layout.addWidget(self.video_grid)
-        
-        # Media controls (reuse existing component)
-        self.media_controls = MediaControlsWidget()
-        # Keep all existing connections - IMPORTANT for functionality
-        self.media_controls.video_toggle_requested.connect(self.toggle_video)
-        self.media_controls.audio_toggle_requested.connect(self.toggle_audio)
-        self.media_controls.screen_share_requested.connect(self.toggle_screen_share)
-        layout.addWidget(self.media_controls)
+        # Video grid and media controls are added by build_session_widgets
+        self._video_tab_layout = layout
         
-        self.content_stack.addWidget(video_tab)
+        self._tab_index["video_meet_tab"] = self.content_stack.addWidget(video_tab)
         self.video_meet_tab = video_tab
 
     def create_screen_share_tab(self):
@@ -2402,6 +3152,8 @@ class ClientMainWindow(QMainWindow):
             }
         """)
         self.screen_preview_label.setScaledContents(True)  # Allow scaling of images
+        self.screen_preview_label.setAutoFillBackground(False)
+        self.screen_preview_label.installEventFilter(self)  # Track size for downscaling
         preview_layout.addWidget(self.screen_preview_label)
         layout.addWidget(preview_frame)
         
@@ -2498,7 +3250,7 @@ class ClientMainWindow(QMainWindow):
         """)
         layout.addWidget(instructions)
         
-        self.content_stack.addWidget(screen_tab)
+        self._tab_index["screen_share_tab"] = self.content_stack.addWidget(screen_tab)
         self.screen_share_tab = screen_tab
 
     def create_chat_tab(self):
@@ -2520,16 +3272,10 @@ class ClientMainWindow(QMainWindow):
         """)
         layout.addWidget(header)
         
-        # Chat widget (reuse existing component)
-        self.chat_widget = ChatWidget()
-        # Keep all existing connections - IMPORTANT for functionality
-        self.chat_widget.message_sent.connect(self.send_chat_message)
-        self.chat_widget.file_share_requested.connect(self.upload_file)
-        self.chat_widget.file_list_requested.connect(self.request_file_list)
-        self.chat_widget.file_download_requested.connect(self.download_file)
-        layout.addWidget(self.chat_widget)
+        # Chat widget is added by build_session_widgets
+        self._chat_tab_layout = layout
         
-        self.content_stack.addWidget(chat_tab)
+        self._tab_index["chat_tab"] = self.content_stack.addWidget(chat_tab)
         self.chat_tab = chat_tab
 
     def create_file_transfer_tab(self):
@@ -2581,7 +3327,7 @@ class ClientMainWindow(QMainWindow):
                 background-color: #218838;
             }
         """)
-        upload_btn.clicked.connect(lambda: self.upload_file())  # Use lambda to avoid passing boolean parameter
+        upload_btn.clicked.connect(lambda _checked=False: self.upload_file())  # Drop the checked bool
         upload_layout.addWidget(upload_btn)
         
         layout.addWidget(upload_frame)
@@ -2634,7 +3380,7 @@ class ClientMainWindow(QMainWindow):
         
         layout.addWidget(download_frame)
         
-        self.content_stack.addWidget(file_tab)
+        self._tab_index["file_transfer_tab"] = self.content_stack.addWidget(file_tab)
         self.file_transfer_tab = file_tab
 
     def create_participants_tab(self):
@@ -2656,15 +3402,68 @@ class ClientMainWindow(QMainWindow):
         """)
         layout.addWidget(header)
         
-        # Participants widget (reuse existing component)
-        self.participants_widget = ParticipantsWidget()
-        # Keep existing connections - IMPORTANT for functionality
-        self.participants_widget.private_message_requested.connect(self.send_private_message)
-        layout.addWidget(self.participants_widget)
+        # Participants widget is added by build_session_widgets
+        self._participants_tab_layout = layout
         
-        self.content_stack.addWidget(participants_tab)
+        self._tab_index["participants_tab"] = self.content_stack.addWidget(participants_tab)
         self.participants_tab = participants_tab
 
+    def build_session_widgets(self):
+        """Create the meeting widgets on first use instead of at startup.
+        
+        Called from connect_to_server before the network thread starts, so
+        no server message can arrive before the widgets exist. Any earlier
+        access through the properties below builds them on demand.
+        """
+        if self._session_widgets_built:
+            return
+        self._session_widgets_built = True
+        
+        # Video grid (reuse existing component)
+        self._video_grid = VideoGrid()
+        self._video_tab_layout.addWidget(self._video_grid)
+        
+        # Media controls (reuse existing component)
+        self._media_controls = MediaControlsWidget()
+        # Keep all existing connections - IMPORTANT for functionality
+        self._media_controls.video_toggle_requested.connect(self.toggle_video)
+        self._media_controls.audio_toggle_requested.connect(self.toggle_audio)
+        self._media_controls.screen_share_requested.connect(self.toggle_screen_share)
+        self._video_tab_layout.addWidget(self._media_controls)
+        
+        # Chat widget (reuse existing component)
+        self._chat_widget = ChatWidget()
+        self._chat_widget.message_sent.connect(self.send_chat_message)
+        self._chat_widget.file_share_requested.connect(self.upload_file)
+        self._chat_widget.file_list_requested.connect(self.request_file_list)
+        self._chat_widget.file_download_requested.connect(self.download_file)
+        self._chat_tab_layout.addWidget(self._chat_widget)
+        
+        # Participants widget (reuse existing component)
+        self._participants_widget = ParticipantsWidget()
+        self._participants_widget.private_message_requested.connect(self.send_private_message)
+        self._participants_tab_layout.addWidget(self._participants_widget)
+    
+    @property
+    def video_grid(self):
+        self.build_session_widgets()
+        return self._video_grid
+    
+    @property
+    def media_controls(self):
+        self.build_session_widgets()
+        return self._media_controls
+    
+    @property
+    def chat_widget(self):
+        self.build_session_widgets()
+        return self._chat_widget
+    
+    @property
+    def participants_widget(self):
+        self.build_session_widgets()
+        return self._participants_widget
+
     def update_file_list_display(self, files):
         """Update the file list display in the file transfer tab"""
         if not hasattr(self, 'file_list_area'):
@@ -2675,11 +3474,9 @@ class ClientMainWindow(QMainWindow):
             return
             
         # Format file list for display
-        file_list_html = "<h3>📁 Available Files:</h3><br>"
+        parts = ["<h3>📁 Available Files:</h3><br>"]
         for file_info in files:
-            filename = file_info.get('filename', 'Unknown')
             size = file_info.get('size', 0)
-            uploader = file_info.get('uploader', 'Unknown')
             
             # Format file size
             if size < 1024:
@@ -2689,38 +3486,20 @@ class ClientMainWindow(QMainWindow):
             else:
                 size_str = f"{size / (1024 * 1024):.1f} MB"
             
-            file_list_html += f"""
-            <div style='background-color: #111111; padding: 10px; margin: 5px; border-radius: 5px;'>
-                <b>📄 {filename}</b><br>
-                <small>Size: {size_str} | Uploaded by: {uploader}</small>
-            </div>
-            """
+            parts.append(FILE_ENTRY_HTML.format(
+                filename=file_info.get('filename', 'Unknown'),
+                size=size_str,
+                uploader=file_info.get('uploader', 'Unknown')
+            ))
         
-        file_list_html += "<br><i>Use the dialog or chat interface to download files.</i>"
-        self.file_list_area.setHtml(file_list_html)
+        parts.append("<br><i>Use the dialog or chat interface to download files.</i>")
+        self.file_list_area.setHtml("".join(parts))
 
     def switch_to_tab(self, tab_name):
         """Switch between tabs - SAFE UI method"""
-        # Update button states
-        for btn in self.nav_buttons.values():
-            btn.setChecked(False)
-        
-        # Set active tab and button
-        if tab_name == "video_meet_tab":
-            self.content_stack.setCurrentWidget(self.video_meet_tab)
-            self.nav_buttons["video_meet"].setChecked(True)
-        elif tab_name == "screen_share_tab":
-            self.content_stack.setCurrentWidget(self.screen_share_tab)
-            self.nav_buttons["screen_share"].setChecked(True)
-        elif tab_name == "chat_tab":
-            self.content_stack.setCurrentWidget(self.chat_tab)
-            self.nav_buttons["chat"].setChecked(True)
-        elif tab_name == "file_transfer_tab":
-            self.content_stack.setCurrentWidget(self.file_transfer_tab)
-            self.nav_buttons["file_transfer"].setChecked(True)
-        elif tab_name == "participants_tab":
-            self.content_stack.setCurrentWidget(self.participants_tab)
-            self.nav_buttons["participants"].setChecked(True)
+        index = self._tab_index[tab_name]
+        self.content_stack.setCurrentIndex(index)
+        self._nav_group.button(index).setChecked(True)
     
     def setup_menu_bar(self):
         """Setup menu bar."""
@@ -2729,9 +3508,10 @@ class ClientMainWindow(QMainWindow):
         # File menu
         file_menu = menubar.addMenu("File")
         
-        connect_action = QAction("Connect...", self)
-        connect_action.triggered.connect(self.show_connection_dialog)
-        file_menu.addAction(connect_action)
+        # Kept on self so it can be disabled while a connection probe runs
+        self.connect_action = QAction("Connect...", self)
+        self.connect_action.triggered.connect(self.show_connection_dialog)
+        file_menu.addAction(self.connect_action)
         
         disconnect_action = QAction("Disconnect", self)
         disconnect_action.triggered.connect(self.disconnect_from_server)
@@ -2750,51 +3530,9 @@ class ClientMainWindow(QMainWindow):
         
         # Connection status
         self.connection_status = QLabel("⚫ Disconnected")
-        self.connection_status.setStyleSheet("color: #dc3545; font-weight: bold;")
+        self.connection_status.setProperty("state", "disconnected")
         self.status_bar.addPermanentWidget(self.connection_status)
     
-    def setup_application_style(self):
-        """Setup application-wide styling and compatibility."""
-        # Set application properties for better rendering
-        app = QApplication.instance()
-        if app:
-            # Enable high DPI scaling (Qt6 handles this automatically)
-            try:
-                # These attributes were deprecated in Qt6 but may still be available in some versions
-                if hasattr(Qt.ApplicationAttribute, 'AA_EnableHighDpiScaling'):
-                    app.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
-                if hasattr(Qt.ApplicationAttribute, 'AA_UseHighDpiPixmaps'):
-                    app.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
-            except AttributeError:
-                # Qt6 handles high DPI automatically, so this is not needed
-                pass
-            
-            # Set application style
-            available_styles = app.style().objectName()
-            print(f"[INFO] Available Qt style: {available_styles}")
-            
-            # Try to set a consistent style
-            try:
-                if sys.platform == "darwin":  # macOS
-                    app.setStyle("macOS")
-                elif sys.platform == "win32":  # Windows
-                    app.setStyle("windowsvista")
-                else:  # Linux
-                    app.setStyle("fusion")
-            except:
-                print("[INFO] Using default system style")
-        
-        # Set font for better consistency
-        font = QFont()
-        font.setFamily("Segoe UI" if sys.platform == "win32" else "Arial")
-        font.setPointSize(10)
-        try:
-            font.setWeight(QFont.Weight.Normal)
-        except AttributeError:
-            # Fallback for older PyQt6 versions
-            font.setWeight(50)  # Normal weight
-        self.setFont(font)
-    
     def disable_all_styling(self):
         """Completely disable all custom styling."""
         # Override all setStyleSheet methods to do nothing
@@ -2810,356 +3548,14 @@ class ClientMainWindow(QMainWindow):
     
     def apply_minimal_theme(self):
         """Apply minimal safe theme that definitely works."""
-        # Use the same approach as the working minimal_client
-        minimal_style = """
-        QMainWindow {
-            background-color: #2d2d2d;
-            color: white;
-        }
-        QPushButton {
-            background-color: #0078d4;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-        }
-        QPushButton:hover {
-            background-color: #106ebe;
-        }
-        QLineEdit {
-            background-color: white;
-            color: black;
-            border: 1px solid #ccc;
-            padding: 4px;
-        }
-        QTextBrowser, QTextEdit {
-            background-color: white;
-            color: black;
-            border: 1px solid #ccc;
-        }
-        QLabel {
-            color: white;
-        }
-        QTabWidget::pane {
-            border: 1px solid #ccc;
-        }
-        QTabBar::tab {
-            background-color: #f0f0f0;
-            padding: 8px;
-        }
-        QTabBar::tab:selected {
-            background-color: white;
-        }
-        """
-        self.setStyleSheet(minimal_style)
+        self.setStyleSheet(MINIMAL_THEME_STYLE)
     
     def apply_dark_theme(self):
         """Apply comprehensive dark theme to the application."""
+        print("[INFO] Applying black background theme")
         try:
             # Set application-wide style
-            app_style = """
-        /* Main Application */
-        QMainWindow {
-            background-color: #000000;
-            color: #ffffff;
-            font-family: 'Segoe UI', 'Arial', sans-serif;
-            font-size: 12px;
-        }
-        
-        /* Menu Bar */
-        QMenuBar {
-            background-color: #000000;
-            color: #ffffff;
-            border-bottom: 1px solid #333333;
-            padding: 2px;
-        }
-        QMenuBar::item {
-            background-color: transparent;
-            padding: 6px 12px;
-            border-radius: 4px;
-            margin: 2px;
-        }
-        QMenuBar::item:selected {
-            background-color: #0078d4;
-        }
-        QMenuBar::item:pressed {
-            background-color: #106ebe;
-        }
-        
-        /* Menu */
-        QMenu {
-            background-color: #000000;
-            color: #ffffff;
-            border: 1px solid #333333;
-            border-radius: 6px;
-            padding: 4px;
-        }
-        QMenu::item {
-            padding: 8px 16px;
-            border-radius: 4px;
-            margin: 1px;
-        }
-        QMenu::item:selected {
-            background-color: #0078d4;
-        }
-        QMenu::separator {
-            height: 1px;
-            background-color: #333333;
-            margin: 4px 8px;
-        }
-        
-        /* Status Bar */
-        QStatusBar {
-            background-color: #000000;
-            color: #ffffff;
-            border-top: 1px solid #333333;
-            padding: 4px;
-        }
-        
-        /* Buttons */
-        QPushButton {
-            background-color: #0078d4;
-            color: #ffffff;
-            border: none;
-            border-radius: 6px;
-            padding: 8px 16px;
-            font-weight: 500;
-            min-height: 20px;
-        }
-        QPushButton:hover {
-            background-color: #106ebe;
-        }
-        QPushButton:pressed {
-            background-color: #005a9e;
-        }
-        QPushButton:disabled {
-            background-color: #333333;
-            color: #888888;
-        }
-        
-        /* Input Fields */
-        QLineEdit {
-            background-color: #000000;
-            color: #ffffff;
-            border: 2px solid #333333;
-            border-radius: 6px;
-            padding: 8px 12px;
-            font-size: 12px;
-            selection-background-color: #0078d4;
-        }
-        QLineEdit:focus {
-            border-color: #0078d4;
-            background-color: #111111;
-        }
-        QLineEdit:disabled {
-            background-color: #000000;
-            color: #666666;
-        }
-        
-        /* Text Areas */
-        QTextEdit, QTextBrowser {
-            background-color: #000000;
-            color: #ffffff;
-            border: 2px solid #333333;
-            border-radius: 6px;
-            padding: 8px;
-            font-family: 'Consolas', 'Monaco', monospace;
-            font-size: 11px;
-            line-height: 1.4;
-        }
-        QTextEdit:focus, QTextBrowser:focus {
-            border-color: #0078d4;
-        }
-        
-        /* Lists */
-        QListWidget {
-            background-color: #000000;
-            color: #ffffff;
-            border: 2px solid #333333;
-            border-radius: 6px;
-            padding: 4px;
-            outline: none;
-        }
-        QListWidget::item {
-            padding: 8px 12px;
-            border-radius: 4px;
-            margin: 1px;
-        }
-        QListWidget::item:selected {
-            background-color: #0078d4;
-        }
-        QListWidget::item:hover {
-            background-color: #333333;
-        }
-        
-        /* Tables */
-        QTableWidget {
-            background-color: #000000;
-            color: #ffffff;
-            border: 2px solid #333333;
-            border-radius: 6px;
-            gridline-color: #333333;
-            outline: none;
-        }
-        QTableWidget::item {
-            padding: 8px;
-            border-bottom: 1px solid #333333;
-        }
-        QTableWidget::item:selected {
-            background-color: #0078d4;
-        }
-        QHeaderView::section {
-            background-color: #333333;
-            color: #ffffff;
-            padding: 8px 12px;
-            border: none;
-            font-weight: 600;
-        }
-        
-        /* Tabs */
-        QTabWidget::pane {
-            border: 2px solid #333333;
-            border-radius: 6px;
-            background-color: #000000;
-        }
-        QTabBar::tab {
-            background-color: #333333;
-            color: #ffffff;
-            padding: 8px 16px;
-            margin: 2px;
-            border-radius: 6px 6px 0px 0px;
-            min-width: 80px;
-        }
-        QTabBar::tab:selected {
-            background-color: #0078d4;
-        }
-        QTabBar::tab:hover {
-            background-color: #444444;
-        }
-        
-        /* Frames */
-        QFrame {
-            background-color: #000000;
-            border: 1px solid #333333;
-            border-radius: 6px;
-        }
-        
-        /* Group Boxes */
-        QGroupBox {
-            color: #ffffff;
-            font-weight: 600;
-            border: 2px solid #333333;
-            border-radius: 6px;
-            margin-top: 12px;
-            padding-top: 8px;
-        }
-        
-        /* Check Boxes */
-        QCheckBox {
-            color: #ffffff;
-            spacing: 8px;
-        }
-        QCheckBox::indicator {
-            width: 16px;
-            height: 16px;
-            border: 2px solid #3d3d3d;
-            border-radius: 3px;
-            background-color: #2d2d2d;
-        }
-        QCheckBox::indicator:checked {
-            background-color: #0078d4;
-            border-color: #0078d4;
-        }
-        
-        /* Combo Boxes */
-        QComboBox {
-            background-color: #2d2d2d;
-            color: #ffffff;
-            border: 2px solid #3d3d3d;
-            border-radius: 6px;
-            padding: 6px 12px;
-            min-width: 100px;
-        }
-        QComboBox:focus {
-            border-color: #0078d4;
-        }
-        QComboBox::drop-down {
-            border: none;
-            width: 20px;
-        }
-        
-        /* Progress Bars */
-        QProgressBar {
-            background-color: #3d3d3d;
-            border: none;
-            border-radius: 6px;
-            text-align: center;
-            color: #ffffff;
-            font-weight: 600;
-        }
-        QProgressBar::chunk {
-            background-color: #0078d4;
-            border-radius: 6px;
-        }
-        
-        /* Sliders */
-        QSlider::groove:horizontal {
-            background-color: #3d3d3d;
-            height: 6px;
-            border-radius: 3px;
-        }
-        QSlider::handle:horizontal {
-            background-color: #0078d4;
-            width: 16px;
-            height: 16px;
-            border-radius: 8px;
-            margin: -5px 0;
-        }
-        QSlider::handle:horizontal:hover {
-            background-color: #106ebe;
-        }
-        
-        /* Scroll Bars */
-        QScrollBar:vertical {
-            background-color: #2d2d2d;
-            width: 12px;
-            border-radius: 6px;
-        }
-        QScrollBar::handle:vertical {
-            background-color: #5d5d5d;
-            border-radius: 6px;
-            min-height: 20px;
-        }
-        QScrollBar::handle:vertical:hover {
-            background-color: #6d6d6d;
-        }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-            height: 0px;
-        }
-        
-        /* Tool Tips */
-        QToolTip {
-            background-color: #2d2d2d;
-            color: #ffffff;
-            border: 1px solid #3d3d3d;
-            border-radius: 4px;
-            padding: 4px 8px;
-            font-size: 11px;
-        }
-        
-        /* Labels */
-        QLabel {
-            color: #ffffff;
-        }
-        
-        /* Dialogs */
-        QDialog {
-            background-color: #1e1e1e;
-            color: #ffffff;
-        }
-        """
-        
-            self.setStyleSheet(app_style)
-            
+            self.setStyleSheet(DARK_THEME_STYLE)
         except Exception as e:
             print(f"[WARNING] Could not apply full theme: {e}")
             print("[INFO] Falling back to minimal theme")
@@ -3167,26 +3563,12 @@ class ClientMainWindow(QMainWindow):
             return
         
         # Also set application-wide palette for better compatibility
-        try:
-            palette = QPalette()
-            palette.setColor(QPalette.ColorRole.Window, QColor(30, 30, 30))
-            palette.setColor(QPalette.ColorRole.WindowText, QColor(255, 255, 255))
-            palette.setColor(QPalette.ColorRole.Base, QColor(45, 45, 45))
-            palette.setColor(QPalette.ColorRole.AlternateBase, QColor(60, 60, 60))
-            palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(45, 45, 45))
-            palette.setColor(QPalette.ColorRole.ToolTipText, QColor(255, 255, 255))
-            palette.setColor(QPalette.ColorRole.Text, QColor(255, 255, 255))
-            palette.setColor(QPalette.ColorRole.Button, QColor(45, 45, 45))
-            palette.setColor(QPalette.ColorRole.ButtonText, QColor(255, 255, 255))
-            palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
-            palette.setColor(QPalette.ColorRole.Link, QColor(0, 120, 212))
-            palette.setColor(QPalette.ColorRole.Highlight, QColor(0, 120, 212))
-            palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
-            
-            self.setPalette(palette)
-        except Exception as e:
-            print(f"[WARNING] Could not set custom palette: {e}")
-            # Fallback to basic styling only
+        self.setPalette(dark_palette())
+    
+    def show_initial_connection_dialog(self):
+        """Show the startup dialog unless a connection was already started."""
+        if self.network_thread is None and self.probe_thread is None:
+            self.show_connection_dialog()
     
     def show_connection_dialog(self):
         """Show ultra-simple connection dialog."""
@@ -3207,52 +3589,71 @@ class ClientMainWindow(QMainWindow):
             QMessageBox.warning(self, "Invalid Input", "Please provide valid server details and username.")
             return
         
-        # Test basic connectivity first
-        try:
-            print(f"[INFO] Testing connection to {self.host}:{self.port}")
-            test_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            test_sock.settimeout(5)
-            result = test_sock.connect_ex((self.host, self.port))
-            test_sock.close()
-            
-            if result != 0:
-                QMessageBox.critical(
-                    self, 
-                    "Connection Failed", 
-                    f"Cannot reach server at {self.host}:{self.port}\n\n"
-                    f"Please check:\n"
-                    f"• Server is running (python main_server.py)\n"
-                    f"• IP address is correct\n"
-                    f"• Firewall allows ports 9000, 10000, 11000\n"
-                    f"• You're on the same network\n\n"
-                    f"💡 Try running: python connection_test.py {self.host}"
-                )
-                return
-                
-        except Exception as e:
+        # Test basic connectivity first, off the GUI thread
+        print(f"[INFO] Testing connection to {self.host}:{self.port}")
+        self.connect_action.setEnabled(False)
+        self._pending_conn_info = conn_info
+        self.probe_thread = ConnectivityProbeThread(self.host, self.port, self)
+        self.probe_thread.probe_finished.connect(self.on_probe_finished)
+        self.probe_thread.start()
+    
+    def on_probe_finished(self, reachable: bool, error: str):
+        """Start the session once the pre-flight probe reports back."""
+        self.connect_action.setEnabled(True)
+        self.probe_thread = None
+        conn_info = self._pending_conn_info
+        self._pending_conn_info = None
+        
+        if error:
             QMessageBox.critical(
                 self, 
                 "Network Error", 
-                f"Network error: {e}\n\n"
+                f"Network error: {error}\n\n"
                 f"Please check your network connection."
             )
             return
         
+        if not reachable:
+            QMessageBox.critical(
+                self, 
+                "Connection Failed", 
+                f"Cannot reach server at {self.host}:{self.port}\n\n"
+                f"Please check:\n"
+                f"• Server is running (python main_server.py)\n"
+                f"• IP address is correct\n"
+                f"• Firewall allows ports 9000, 10000, 11000\n"
+                f"• You're on the same network\n\n"
+                f"💡 Try running: python connection_test.py {self.host}"
+            )
+            return
+        
         print(f"[INFO] Basic connectivity test passed")
         
         # Update window title
         self.setWindowTitle(f"LAN Collaboration Client - {self.username}")
         
+        # Meeting widgets must exist before any server message arrives
+        self.build_session_widgets()
+        
+        # A previous session's thread must not keep receiving our messages
+        self.stop_network_thread()
+        
         # Start network thread
         self.network_thread = NetworkThread(self.host, self.port, self.username, self)
         self.network_thread.message_received.connect(self.handle_message)
         self.network_thread.connection_status_changed.connect(self.on_connection_status_changed)
+        self.send_requested.connect(self.network_thread.queue_message)
+        self.send_raw_requested.connect(self.network_thread.queue_message)
         self.network_thread.start()
         
         # Initialize media clients (but don't start them yet)
         self.video_client = VideoClient(self.host, DEFAULT_UDP_VIDEO_PORT, self)
-        self.video_client.frame_captured.connect(self.video_grid.update_local_video)
-        self.video_client.frame_received.connect(self.video_grid.update_participant_video)
+        self.video_client.frame_captured.connect(
+            self.video_grid.update_local_video, Qt.ConnectionType.QueuedConnection
+        )
+        self.video_client.frame_received.connect(
+            self.video_grid.update_participant_video, Qt.ConnectionType.QueuedConnection
+        )
         self.video_client.video_disabled.connect(self.clear_local_video)
         
         self.audio_client = AudioClient(self.host, DEFAULT_UDP_AUDIO_PORT, self)
@@ -3265,76 +3666,78 @@ class ClientMainWindow(QMainWindow):
         if conn_info['join_with_audio']:
             self.toggle_audio(True)
     
+    def stop_network_thread(self):
+        """Unwire and stop the network thread so no message queues up for it."""
+        if not self.network_thread:
+            return
+        logger.debug("Stopping network thread...")
+        self.send_requested.disconnect(self.network_thread.queue_message)
+        self.send_raw_requested.disconnect(self.network_thread.queue_message)
+        self.network_thread.disconnect()
+        # Give the thread a moment to process the disconnect
+        if not self.network_thread.wait(3000):  # Wait up to 3 seconds
+            print("[WARNING] Network thread did not stop gracefully, terminating...")
+            self.network_thread.terminate()
+        self.network_thread = None
+        logger.debug("Network thread stopped")
+    
     def disconnect_from_server(self):
         """Disconnect from server."""
-        print("[DEBUG] Leave button clicked - starting disconnect process")
+        logger.debug("Leave button clicked - starting disconnect process")
         
         # Mark this as an intentional disconnect
         self._intentional_disconnect = True
         
         if self.network_thread and self.connected:
             # Send logout message to server before disconnecting
-            print("[DEBUG] Sending LOGOUT message to server")
+            logger.debug("Sending LOGOUT message to server")
             logout_message = {
                 'type': MessageTypes.LOGOUT,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
-            self.network_thread.send_message_sync(logout_message)
-            
-            # Give server time to process logout and notify other clients
-            import time
-            time.sleep(0.5)
+            # Returns as soon as the message is drained, not after a fixed delay
+            self.network_thread.logout(logout_message)
         
-        if self.network_thread:
-            print("[DEBUG] Stopping network thread...")
-            self.network_thread.disconnect()
-            # Give the thread a moment to process the disconnect
-            if not self.network_thread.wait(3000):  # Wait up to 3 seconds
-                print("[WARNING] Network thread did not stop gracefully, terminating...")
-                self.network_thread.terminate()
-            self.network_thread = None
-            print("[DEBUG] Network thread stopped")
+        self.stop_network_thread()
         
         if self.video_client:
-            print("[DEBUG] Stopping video client...")
+            logger.debug("Stopping video client...")
             self.video_client.stop()
             if not self.video_client.wait(2000):  # Wait up to 2 seconds
                 print("[WARNING] Video client did not stop gracefully, terminating...")
                 self.video_client.terminate()
             self.video_client = None
-            print("[DEBUG] Video client stopped")
+            logger.debug("Video client stopped")
         
         if self.audio_client:
-            print("[DEBUG] Stopping audio client...")
+            logger.debug("Stopping audio client...")
             self.audio_client.stop()
             if not self.audio_client.wait(2000):  # Wait up to 2 seconds
                 print("[WARNING] Audio client did not stop gracefully, terminating...")
                 self.audio_client.terminate()
             self.audio_client = None
-            print("[DEBUG] Audio client stopped")
+            logger.debug("Audio client stopped")
         
         # Stop screen sharing
-        if hasattr(self, 'screen_capture_client') and self.screen_capture_client:
+        if self.screen_capture_client:
             self.screen_capture_client.stop()
             self.screen_capture_client = None
         
-        if hasattr(self, 'screen_viewer') and self.screen_viewer:
+        if self.screen_viewer:
             self.screen_viewer.close()
             self.screen_viewer = None
         
+        was_connected = self.connected
         self.connected = False
         self.uid = None
-        self.participants.clear()
-        
-        # Update UI
-        self.participants_widget.update_participants({})
-        self.chat_widget.clear_chat()
-        
-        # Reset titles
         self.username = None
-        self.update_title_with_username()
+        if was_connected:
+            self.connection_state_changed.emit(False)
+        
+        # Update UI and reset titles in one repaint
+        self.reset_session_ui()
         
-        print("[DEBUG] Disconnect process completed - client fully disconnected")
+        logger.debug("Disconnect process completed - client fully disconnected")
         
         # Show connection dialog again or close application
         self.show_reconnect_options()
@@ -3343,9 +3746,21 @@ class ClientMainWindow(QMainWindow):
         if hasattr(self, '_intentional_disconnect'):
             delattr(self, '_intentional_disconnect')
     
+    def reset_session_ui(self):
+        """Clear participants, chat and title with repaints batched into one."""
+        self.setUpdatesEnabled(False)
+        try:
+            self.participants.clear()
+            self.participants_widget.update_participants({})
+            self.chat_widget.clear_chat()
+            self.update_title_with_username()
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+    
     def handle_leave_button_click(self):
         """Handle leave button click with debug output."""
-        print("[DEBUG] 🚪 Leave button clicked!")
+        logger.debug("🚪 Leave button clicked!")
         self.disconnect_from_server()
     
     def show_reconnect_options(self):
@@ -3377,212 +3792,224 @@ class ClientMainWindow(QMainWindow):
             # Close the application
             self.close()
     
+    def set_widget_state(self, widget, state: str, text: str):
+        """Switch a label between the [state=...] rules of the theme QSS."""
+        widget.setText(text)
+        widget.setProperty("state", state)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+    
     def on_connection_status_changed(self, connected: bool, message: str):
         """Handle connection status change."""
         was_connected = self.connected
         self.connected = connected
+        if connected != was_connected:
+            self.connection_state_changed.emit(connected)
         
         if connected:
-            self.connection_status.setText("🟢 Connected")
-            self.connection_status.setStyleSheet("color: #28a745; font-weight: bold;")
+            self.set_widget_state(self.connection_status, "connected", "🟢 Connected")
             self.status_bar.showMessage(f"Connected to {self.host}:{self.port}")
         else:
-            self.connection_status.setText("⚫ Disconnected")
-            self.connection_status.setStyleSheet("color: #dc3545; font-weight: bold;")
+            self.set_widget_state(self.connection_status, "disconnected", "⚫ Disconnected")
             self.status_bar.showMessage(message)
             
+            # A dropped connection leaves the thread finished but still wired;
+            # ignore late signals from a thread that was already replaced
+            if self.sender() is self.network_thread:
+                self.stop_network_thread()
+            
             # If we were connected and now disconnected unexpectedly (not via Leave button)
             if was_connected and not hasattr(self, '_intentional_disconnect'):
-                print("[DEBUG] Unexpected disconnection detected")
+                logger.debug("Unexpected disconnection detected")
                 # Clean up UI state
-                self.participants.clear()
-                self.participants_widget.update_participants({})
-                self.chat_widget.clear_chat()
+                self.reset_session_ui()
                 # Show reconnect options after a short delay
                 QTimer.singleShot(1000, self.show_reconnect_options)
     
     def handle_message(self, message: dict):
         """Handle incoming message from server."""
-        msg_type = message.get('type', '')
+        # A dict lookup rather than `match`: value patterns such as
+        # `case MessageTypes.CHAT` compile to sequential == tests, and the
+        # syntax would also break the Python 3.8 support stated in setup.md
+        handler = self._message_handlers.get(message.get('type', ''))
+        if handler:
+            handler(message)
+    
+    def _on_login_success(self, message: dict):
+        """Store our UID, start media clients and request the participant list."""
+        self.uid = message.get('uid')
+        username = message.get('username')
+        
+        # Set UID for media clients and start them
+        if self.video_client:
+            self.video_client.set_uid(self.uid)
+            if not self.video_client.isRunning():
+                self.video_client.start()
+                logger.debug("Started video client with UID %s", self.uid)
         
-        if msg_type == MessageTypes.LOGIN_SUCCESS:
-            self.uid = message.get('uid')
-            username = message.get('username')
-            
-            # Set UID for media clients and start them
-            if self.video_client:
-                self.video_client.set_uid(self.uid)
-                if not self.video_client.isRunning():
-                    self.video_client.start()
-                    print(f"[DEBUG] Started video client with UID {self.uid}")
-            
-            if self.audio_client:
-                self.audio_client.set_uid(self.uid)
-                if not self.audio_client.isRunning():
-                    self.audio_client.start()
-                    print(f"[DEBUG] Started audio client with UID {self.uid}")
-            
-            self.chat_widget.add_message("System", f"Welcome {username}! You are now connected.", is_system=True)
-            
-            # Update title with username
-            self.update_title_with_username()
-            
-            # Request participant list after login
-            if self.network_thread:
-                participant_request = {
-                    'type': MessageTypes.GET_PARTICIPANTS,
-                    'timestamp': datetime.now().isoformat()
-                }
-                self.network_thread.send_message_sync(participant_request)
-            
-        elif msg_type == MessageTypes.PARTICIPANT_LIST:
-            participants = message.get('participants', [])
-            self.participants = {p['uid']: p for p in participants}
+        if self.audio_client:
+            self.audio_client.set_uid(self.uid)
+            if not self.audio_client.isRunning():
+                self.audio_client.start()
+                logger.debug("Started audio client with UID %s", self.uid)
+        
+        self.chat_widget.add_message("System", f"Welcome {username}! You are now connected.", is_system=True)
+        
+        # Update title with username
+        self.update_title_with_username()
+        
+        # Request participant list after login
+        if self.network_thread:
+            participant_request = {
+                'type': MessageTypes.GET_PARTICIPANTS,
+                'timestamp': now_iso()
+            }
+            self.send_requested.emit(participant_request)
+    
+    def _on_participant_list(self, message: dict):
+        """Apply the added/removed diff from a full participant list.
+        
+        The roster widget is refreshed only when membership changed.
+        """
+        incoming = {p['uid']: p for p in message.get('participants', [])}
+        removed = self.participants.keys() - incoming.keys()
+        added = [p for uid, p in incoming.items() if uid not in self.participants]
+        
+        # Apply only the differences to the roster and the video grid
+        for uid in removed:
+            del self.participants[uid]
+            self.video_grid.remove_participant_frame(uid)
+        self.participants.update(incoming)
+        
+        if added or removed:
             self.participants_widget.update_participants(self.participants)
-            
-            # Add video frames for participants (exclude self)
-            for participant in participants:
-                if participant['uid'] != self.uid:
-                    self.video_grid.add_participant_frame(participant['uid'], participant['username'])
-            
-        elif msg_type == MessageTypes.USER_JOINED:
-            uid = message.get('uid')
-            username = message.get('username')
-            
-            if uid != self.uid:
-                self.participants[uid] = {'uid': uid, 'username': username}
-                self.participants_widget.add_participant(uid, username)
-                self.video_grid.add_participant_frame(uid, username)
-                self.chat_widget.add_message("System", f"{username} joined the session", is_system=True)
-            
-        elif msg_type == MessageTypes.USER_LEFT:
-            uid = message.get('uid')
-            username = message.get('username')
-            
-            if uid in self.participants:
-                del self.participants[uid]
-                self.participants_widget.remove_participant(uid)
-                self.video_grid.remove_participant_frame(uid)
-                self.chat_widget.add_message("System", f"{username} left the session", is_system=True)
-            
-        elif msg_type == MessageTypes.CHAT:
-            sender = message.get('username', 'Unknown')
-            text = message.get('content', '')
-            timestamp = message.get('timestamp', '')
-            
-            if timestamp:
-                try:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    time_str = dt.strftime("%H:%M:%S")
-                except:
-                    time_str = None
-            else:
-                time_str = None
-            
-            self.chat_widget.add_message(sender, text, time_str)
         
-        elif msg_type == MessageTypes.UNICAST:
-            # Private message received
-            sender = message.get('username', 'Unknown')
-            text = message.get('content', '')
-            timestamp = message.get('timestamp', '')
-            
-            print(f"[DEBUG] Received private message from {sender}: {text}")
-            
-            if timestamp:
-                try:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    time_str = dt.strftime("%H:%M:%S")
-                except:
-                    time_str = None
-            else:
-                time_str = None
-            
-            # Display private message with special formatting
-            self.chat_widget.add_private_message(sender, text, time_str)
-            
-        elif msg_type == MessageTypes.FILE_UPLOAD_PORT:
-            # Server provided upload port
-            upload_port = message.get('port')
-            if self.pending_upload and upload_port:
-                self.start_file_upload(self.pending_upload, upload_port)
-                self.pending_upload = None
-            
-        elif msg_type == MessageTypes.FILE_DOWNLOAD_PORT:
-            # Server provided download port and file list
-            download_port = message.get('port')
-            files = message.get('files', [])
-            if files:
-                # Update the file transfer tab display
-                self.update_file_list_display(files)
-                # Also show the traditional dialog for backward compatibility
-                self.chat_widget.show_file_download_dialog(files)
-            else:
-                if hasattr(self, 'file_list_area'):
-                    self.file_list_area.setText("No files are currently available for download.")
-                QMessageBox.information(self, "No Files", "No files are currently available for download.")
-            
-        elif msg_type == MessageTypes.FILE_AVAILABLE:
-            # New file available notification
-            filename = message.get('filename', 'Unknown')
-            uploader = message.get('uploader', 'Unknown')
-            self.chat_widget.add_message("System", f"📁 New file available: {filename} (uploaded by {uploader})", is_system=True)
-            
-        elif msg_type == MessageTypes.UNICAST_SENT:
-            # Private message sent confirmation
-            target_uid = message.get('target_uid')
-            timestamp = message.get('timestamp', '')
-            # Message already shown in sender's chat, just log success
-            print(f"[DEBUG] Private message sent to UID {target_uid}")
-        
-        elif msg_type == MessageTypes.HEARTBEAT_ACK:
-            # Heartbeat acknowledged - connection is alive
-            pass
+        # Add video frames for new participants (exclude self) in one relayout
+        self.video_grid.add_participant_frames_bulk(
+            [(p['uid'], p['username']) for p in added if p['uid'] != self.uid]
+        )
+    
+    def _on_user_joined(self, message: dict):
+        """Add a newly joined participant."""
+        uid = message.get('uid')
+        username = message.get('username')
         
-        elif msg_type == MessageTypes.SCREEN_SHARE_PORTS:
-            # Server provided screen share port for presenter
-            port = message.get('port')
-            if port:
-                print(f"[DEBUG] Received screen share port: {port}")
-                self.start_screen_capture(port)
-            else:
-                print("[ERROR] No screen share port provided by server")
-                self.chat_widget.add_message("System", "❌ Server did not provide screen share port", is_system=True)
-        
-        elif msg_type == MessageTypes.PRESENT_START_BROADCAST:
-            # Someone started presenting
-            uid = message.get('uid')
-            username = message.get('username')
-            port = message.get('screen_share_port')
-            
-            if uid != self.uid:  # Don't show viewer for our own presentation
-                self.chat_widget.add_message("System", f"🖥️ {username} started screen sharing", is_system=True)
-                self.show_screen_share_viewer(self.host, port, username)
-        
-        elif msg_type == MessageTypes.PRESENT_STOP_BROADCAST:
-            # Someone stopped presenting
-            uid = message.get('uid')
-            username = message.get('username')
-            
-            if uid != self.uid:
-                self.chat_widget.add_message("System", f"🖥️ {username} stopped screen sharing", is_system=True)
-                self.close_screen_share_viewer()
-            
-        elif msg_type == MessageTypes.ERROR:
-            error_msg = message.get('message', 'Unknown error')
-            self.chat_widget.add_message("System", f"Error: {error_msg}", is_system=True)
-            
-            # If it's a screen sharing error, reset the button state
-            if "presenting" in error_msg.lower():
-                self.media_controls.screen_sharing = False
-                self.media_controls.screen_btn.setChecked(False)
-                self.media_controls.screen_btn.setText("🖥️ Share")
+        if uid != self.uid:
+            self.participants[uid] = {'uid': uid, 'username': username}
+            self.participants_widget.add_participant(uid, username)
+            self.video_grid.add_participant_frame(uid, username)
+            self.chat_widget.add_message("System", f"{username} joined the session", is_system=True)
+    
+    def _on_user_left(self, message: dict):
+        """Remove a participant who left."""
+        uid = message.get('uid')
+        username = message.get('username')
+        
+        if uid in self.participants:
+            del self.participants[uid]
+            self.participants_widget.remove_participant(uid)
+            self.video_grid.remove_participant_frame(uid)
+            self.chat_widget.add_message("System", f"{username} left the session", is_system=True)
+    
+    def _on_chat(self, message: dict):
+        """Show a group chat message."""
+        sender = message.get('username', 'Unknown')
+        text = message.get('content', '')
+        time_str = format_message_time(message.get('timestamp', ''))
+        
+        self.chat_widget.add_message(sender, text, time_str)
+    
+    def _on_unicast(self, message: dict):
+        """Show a private message addressed to us."""
+        sender = message.get('username', 'Unknown')
+        text = message.get('content', '')
+        time_str = format_message_time(message.get('timestamp', ''))
+        
+        logger.debug("Received private message from %s: %s", sender, text)
+        
+        # Display private message with special formatting
+        self.chat_widget.add_private_message(sender, text, time_str)
+    
+    def _on_file_upload_port(self, message: dict):
+        """Start a pending upload on the port the server provided."""
+        upload_port = message.get('port')
+        if self.pending_upload and upload_port:
+            self.start_file_upload(self.pending_upload, upload_port)
+            self.pending_upload = None
+    
+    def _on_file_download_port(self, message: dict):
+        """Show the downloadable file list."""
+        download_port = message.get('port')
+        files = message.get('files', [])
+        if files:
+            # Update the file transfer tab display
+            self.update_file_list_display(files)
+            # Also show the traditional dialog for backward compatibility
+            self.chat_widget.show_file_download_dialog(files)
+        else:
+            if hasattr(self, 'file_list_area'):
+                self.file_list_area.setText("No files are currently available for download.")
+            QMessageBox.information(self, "No Files", "No files are currently available for download.")
+    
+    def _on_file_available(self, message: dict):
+        """Announce a newly uploaded file."""
+        filename = message.get('filename', 'Unknown')
+        uploader = message.get('uploader', 'Unknown')
+        self.chat_widget.add_message("System", f"📁 New file available: {filename} (uploaded by {uploader})", is_system=True)
+    
+    def _on_unicast_sent(self, message: dict):
+        """Private message delivery confirmation."""
+        target_uid = message.get('target_uid')
+        timestamp = message.get('timestamp', '')
+        # Message already shown in sender's chat, just log success
+        logger.debug("Private message sent to UID %s", target_uid)
+    
+    def _on_screen_share_ports(self, message: dict):
+        """Start capturing once the server assigns a presenter port."""
+        port = message.get('port')
+        if port:
+            logger.debug("Received screen share port: %s", port)
+            self.start_screen_capture(port)
+        else:
+            print("[ERROR] No screen share port provided by server")
+            self.chat_widget.add_message("System", "❌ Server did not provide screen share port", is_system=True)
+    
+    def _on_present_start_broadcast(self, message: dict):
+        """Open the viewer when someone else starts presenting."""
+        uid = message.get('uid')
+        username = message.get('username')
+        port = message.get('screen_share_port')
+        
+        if uid != self.uid:  # Don't show viewer for our own presentation
+            self.chat_widget.add_message("System", f"🖥️ {username} started screen sharing", is_system=True)
+            self.show_screen_share_viewer(self.host, port, username)
+    
+    def _on_present_stop_broadcast(self, message: dict):
+        """Close the viewer when the presenter stops."""
+        uid = message.get('uid')
+        username = message.get('username')
+        
+        if uid != self.uid:
+            self.chat_widget.add_message("System", f"🖥️ {username} stopped screen sharing", is_system=True)
+            self.close_screen_share_viewer()
+    
+    def _on_error(self, message: dict):
+        """Show a server error and reset screen share state if relevant."""
+        error_msg = message.get('message', 'Unknown error')
+        self.chat_widget.add_message("System", f"Error: {error_msg}", is_system=True)
+        
+        # If it's a screen sharing error, reset the button state
+        if "presenting" in error_msg.lower():
+            self.media_controls.screen_sharing = False
+            set_checked_if_changed(self.media_controls.screen_btn, False)
+            set_text_if_changed(self.media_controls.screen_btn, "🖥️ Share")
     
     def send_chat_message(self, text: str):
         """Send chat message."""
         if self.network_thread and self.connected:
             message = create_chat_message(text)
-            self.network_thread.send_message_sync(message)
+            self.send_requested.emit(message)
     
     def send_private_message(self, target_uid: int, username: str):
         """Send private message."""
@@ -3599,52 +4026,43 @@ class ClientMainWindow(QMainWindow):
         )
         
         if ok and text.strip():
-            print(f"[DEBUG] Sending private message to {username} (UID: {target_uid}): {text.strip()}")
+            logger.debug("Sending private message to %s (UID: %s): %s", username, target_uid, text.strip())
             
             message = {
                 'type': MessageTypes.UNICAST,
                 'target_uid': target_uid,
                 'content': text.strip(),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso(precise=True)
             }
-            self.network_thread.send_message_sync(message)
+            self.send_requested.emit(message)
             
             # Show the sent message in sender's chat
             self.chat_widget.add_private_message(f"You → {username}", text.strip())
     
-    def upload_file(self, file_path=None):
-        """Upload file to server. If no file_path provided, opens file dialog."""
+    def upload_file(self, file_path: Optional[Union[str, Path]] = None):
+        """Upload file to server. If no file_path provided, opens file dialog.
+        
+        Button clicks connect through a lambda, so file_path is never the
+        ``checked`` bool PyQt6 passes to slots.
+        """
         if not self.network_thread or not self.connected:
             QMessageBox.warning(self, "Not Connected", "Please connect to server first.")
             return
         
-        # Handle boolean parameter from button clicks (PyQt6 passes checked state)
-        if isinstance(file_path, bool):
-            file_path = None
+        file_path_str = str(file_path).strip() if file_path is not None else ""
         
         # If no file path provided or it's empty, open file dialog
-        if file_path is None or file_path == "" or (isinstance(file_path, str) and not file_path.strip()):
-            file_path, _ = QFileDialog.getOpenFileName(
+        if not file_path_str:
+            file_path_str, _ = QFileDialog.getOpenFileName(
                 self,
                 "Select File to Upload",
                 "",
                 "All Files (*.*)"
             )
             
-            if not file_path:  # User cancelled dialog or no file selected
+            if not file_path_str:  # User cancelled dialog or no file selected
                 return
         
-        # Ensure file_path is a valid string and not empty
-        if not isinstance(file_path, (str, Path)):
-            QMessageBox.warning(self, "File Error", f"Invalid file path type received: {type(file_path)}")
-            return
-        
-        # Convert to string and validate
-        file_path_str = str(file_path).strip()
-        if not file_path_str:
-            QMessageBox.warning(self, "File Error", "No valid file selected.")
-            return
-        
         try:
             # Create Path object and validate existence
             file_info = Path(file_path_str)
@@ -3657,9 +4075,9 @@ class ClientMainWindow(QMainWindow):
                 'type': MessageTypes.FILE_OFFER,
                 'filename': file_info.name,
                 'size': file_info.stat().st_size,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
-            self.network_thread.send_message_sync(message)
+            self.send_requested.emit(message)
             
             # Store file path for when we get the upload port
             self.pending_upload = file_path_str
@@ -3678,9 +4096,9 @@ class ClientMainWindow(QMainWindow):
         
         message = {
             'type': MessageTypes.FILE_REQUEST,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
-        self.network_thread.send_message_sync(message)
+        self.send_requested.emit(message)
     
     def download_file(self, file_id: str, filename: str):
         """Download file from server."""
@@ -3700,32 +4118,56 @@ class ClientMainWindow(QMainWindow):
             # Start download in a separate thread
             self.start_file_download(file_id, save_path)
     
+    def submit_transfer(self, task, finished_signal, error_signal):
+        """Queue a file transfer task on the pool, keeping it alive until done."""
+        self._active_transfers.add(task)
+        release = lambda *args, t=task: self._active_transfers.discard(t)
+        finished_signal.connect(release)
+        error_signal.connect(release)
+        self.transfer_pool.start(task)
+    
     def start_file_download(self, file_id: str, save_path: str):
         """Start file download process."""
         try:
             self.chat_widget.add_message("System", f"Starting download: {Path(save_path).name}", is_system=True)
             
-            # Start download in a separate thread
-            download_thread = FileDownloadThread(self.host, 14000, file_id, save_path, self)
-            download_thread.download_progress.connect(self.on_download_progress)
-            download_thread.download_finished.connect(self.on_download_finished)
-            download_thread.download_error.connect(self.on_download_error)
-            download_thread.start()
+            # Run the download on the shared transfer pool
+            download_task = FileDownloadThread(self.host, 14000, file_id, save_path)
+            download_task.signals.download_progress.connect(self.on_download_progress)
+            download_task.signals.download_finished.connect(self.on_download_finished)
+            download_task.signals.download_error.connect(self.on_download_error)
+            self.submit_transfer(download_task, download_task.signals.download_finished,
+                                 download_task.signals.download_error)
             
         except Exception as e:
             QMessageBox.critical(self, "Download Error", f"Failed to download file: {e}")
     
+    def report_transfer_progress(self, verb: str, filename: str, progress: int):
+        """Update the transfer's progress row every step or interval, in place."""
+        key = (verb, filename)
+        now = time.monotonic()
+        last, last_time = self._last_progress.get(key, (-PROGRESS_REPORT_STEP, 0.0))
+        if progress == last:
+            return
+        if (progress - last < PROGRESS_REPORT_STEP and progress != 100
+                and now - last_time < PROGRESS_REPORT_INTERVAL):
+            return
+        self._last_progress[key] = (progress, now)
+        self.chat_widget.update_last_message(key, f"{verb} {filename}: {progress}%")
+    
     def on_download_progress(self, filename: str, progress: int):
         """Handle download progress update."""
-        self.chat_widget.add_message("System", f"Downloading {filename}: {progress}%", is_system=True)
+        self.report_transfer_progress("Downloading", filename, progress)
     
     def on_download_finished(self, filename: str, save_path: str):
         """Handle download completion."""
+        self._last_progress.pop(("Downloading", filename), None)
         self.chat_widget.add_message("System", f"✅ Download completed: {filename}", is_system=True)
         QMessageBox.information(self, "Download Complete", f"File saved to: {save_path}")
     
     def on_download_error(self, filename: str, error: str):
         """Handle download error."""
+        self._last_progress.pop(("Downloading", filename), None)
         self.chat_widget.add_message("System", f"❌ Download failed: {filename} - {error}", is_system=True)
         QMessageBox.critical(self, "Download Error", f"Failed to download {filename}: {error}")
     
@@ -3744,12 +4186,13 @@ class ClientMainWindow(QMainWindow):
             
             self.chat_widget.add_message("System", f"Uploading {file_info.name}...", is_system=True)
             
-            # Start upload in a separate thread
-            upload_thread = FileUploadThread(self.host, upload_port, file_path_str, self.username, self)
-            upload_thread.upload_progress.connect(self.on_upload_progress)
-            upload_thread.upload_finished.connect(self.on_upload_finished)
-            upload_thread.upload_error.connect(self.on_upload_error)
-            upload_thread.start()
+            # Run the upload on the shared transfer pool
+            upload_task = FileUploadThread(self.host, upload_port, file_path_str, self.username)
+            upload_task.signals.upload_progress.connect(self.on_upload_progress)
+            upload_task.signals.upload_finished.connect(self.on_upload_finished)
+            upload_task.signals.upload_error.connect(self.on_upload_error)
+            self.submit_transfer(upload_task, upload_task.signals.upload_finished,
+                                 upload_task.signals.upload_error)
             
         except Exception as e:
             error_msg = f"Failed to upload file: {e}"
@@ -3759,14 +4202,16 @@ class ClientMainWindow(QMainWindow):
     
     def on_upload_progress(self, filename: str, progress: int):
         """Handle upload progress update."""
-        self.chat_widget.add_message("System", f"Uploading {filename}: {progress}%", is_system=True)
+        self.report_transfer_progress("Uploading", filename, progress)
     
     def on_upload_finished(self, filename: str):
         """Handle upload completion."""
+        self._last_progress.pop(("Uploading", filename), None)
         self.chat_widget.add_message("System", f"✅ File uploaded successfully: {filename}", is_system=True)
     
     def on_upload_error(self, filename: str, error: str):
         """Handle upload error."""
+        self._last_progress.pop(("Uploading", filename), None)
         self.chat_widget.add_message("System", f"❌ Upload failed: {filename} - {error}", is_system=True)
         QMessageBox.critical(self, "Upload Error", f"Failed to upload {filename}: {error}")
     
@@ -3781,8 +4226,8 @@ class ClientMainWindow(QMainWindow):
                 self.video_grid.local_frame.set_placeholder()
         
         self.media_controls.video_enabled = enabled
-        self.media_controls.video_btn.setChecked(enabled)
-        self.media_controls.video_btn.setText("📹 Video On" if enabled else "📹 Video Off")
+        set_checked_if_changed(self.media_controls.video_btn, enabled)
+        set_text_if_changed(self.media_controls.video_btn, "📹 Video On" if enabled else "📹 Video Off")
     
     def clear_local_video(self):
         """Clear the local video display."""
@@ -3794,12 +4239,12 @@ class ClientMainWindow(QMainWindow):
         if self.audio_client:
             self.audio_client.set_enabled(enabled)
         self.media_controls.audio_enabled = enabled
-        self.media_controls.audio_btn.setChecked(enabled)
-        self.media_controls.audio_btn.setText("🎤 Audio On" if enabled else "🎤 Audio Off")
+        set_checked_if_changed(self.media_controls.audio_btn, enabled)
+        set_text_if_changed(self.media_controls.audio_btn, "🎤 Audio On" if enabled else "🎤 Audio Off")
     
     def toggle_screen_share(self, enabled: bool):
         """Toggle screen sharing on/off."""
-        print(f"[DEBUG] Screen share toggle called: enabled={enabled}")
+        logger.debug("Screen share toggle called: enabled=%s", enabled)
         if enabled:
             self.start_screen_sharing()
         else:
@@ -3808,66 +4253,34 @@ class ClientMainWindow(QMainWindow):
     def start_screen_sharing(self):
         """Start screen sharing."""
         if self.network_thread and self.connected:
-            print("[DEBUG] Sending PRESENT_START message to server")
+            logger.debug("Sending PRESENT_START message to server")
             
             # Start preview immediately when user requests screen sharing
             self.start_screen_preview()
             
             # Send present start request to server
-            message = {
-                'type': MessageTypes.PRESENT_START,
-                'timestamp': datetime.now().isoformat()
-            }
-            self.network_thread.send_message_sync(message)
+            self.send_raw_requested.emit((PRESENT_START_TEMPLATE % now_iso()).encode())
             self.chat_widget.add_message("System", "🖥️ Requesting to start screen sharing...", is_system=True)
             
             # Update status to show we're requesting
-            if hasattr(self, 'screen_share_status'):
-                self.screen_share_status.setText("⏳ Requesting screen share permission...")
-                self.screen_share_status.setStyleSheet("""
-                    QLabel {
-                        background-color: #ffc107;
-                        color: #000000;
-                        border-radius: 6px;
-                        padding: 10px;
-                        font-size: 14px;
-                        font-weight: bold;
-                        margin: 10px 0;
-                    }
-                """)
+            self.set_screen_share_status('requesting', "⏳ Requesting screen share permission...")
         else:
             print("[ERROR] Cannot start screen sharing - not connected to server")
             QMessageBox.warning(self, "Not Connected", "Please connect to server first.")
             
             # Update status to show error
-            if hasattr(self, 'screen_share_status'):
-                self.screen_share_status.setText("❌ Not connected to server")
-                self.screen_share_status.setStyleSheet("""
-                    QLabel {
-                        background-color: #dc3545;
-                        color: #ffffff;
-                        border-radius: 6px;
-                        padding: 10px;
-                        font-size: 14px;
-                        font-weight: bold;
-                        margin: 10px 0;
-                    }
-                """)
+            self.set_screen_share_status('error', "❌ Not connected to server")
     
     def stop_screen_sharing(self):
         """Stop screen sharing."""
         if self.network_thread and self.connected:
-            print("[DEBUG] Sending PRESENT_STOP message to server")
+            logger.debug("Sending PRESENT_STOP message to server")
             # Send present stop request to server
-            message = {
-                'type': MessageTypes.PRESENT_STOP,
-                'timestamp': datetime.now().isoformat()
-            }
-            self.network_thread.send_message_sync(message)
+            self.send_raw_requested.emit((PRESENT_STOP_TEMPLATE % now_iso()).encode())
             self.chat_widget.add_message("System", "🖥️ Stopping screen sharing...", is_system=True)
         
         # Stop local screen capture if running
-        if hasattr(self, 'screen_capture_client') and self.screen_capture_client:
+        if self.screen_capture_client:
             self.screen_capture_client.stop()
             self.screen_capture_client = None
         
@@ -3876,38 +4289,37 @@ class ClientMainWindow(QMainWindow):
         
         # Reset UI state - both media controls and dedicated tab
         self.media_controls.screen_sharing = False
-        self.media_controls.screen_btn.setChecked(False)
-        self.media_controls.screen_btn.setText("🖥️ Share")
+        set_checked_if_changed(self.media_controls.screen_btn, False)
+        set_text_if_changed(self.media_controls.screen_btn, "🖥️ Share")
         
         # Update dedicated screen sharing tab buttons and status
-        if hasattr(self, 'start_share_btn') and hasattr(self, 'stop_share_btn'):
+        if self.start_share_btn is not None and self.stop_share_btn is not None:
             self.start_share_btn.setEnabled(True)
             self.stop_share_btn.setEnabled(False)
         
-        if hasattr(self, 'screen_share_status'):
-            self.screen_share_status.setText("📱 Ready to share screen")
-            self.screen_share_status.setStyleSheet("""
-                QLabel {
-                    background-color: #333333;
-                    color: #ffffff;
-                    border-radius: 6px;
-                    padding: 10px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    margin: 10px 0;
-                }
-            """)
+        self.set_screen_share_status('idle', "📱 Ready to share screen")
+    
+    def set_screen_share_status(self, state: str, text: str):
+        """Show a screen share state ('idle', 'requesting', 'sharing', 'error').
+        
+        Only the text and/or style that actually changed is applied.
+        """
+        if self.screen_share_status is None:
+            return
+        if self._screen_status_state != state:
+            self.screen_share_status.setStyleSheet(SCREEN_STATUS_STYLES[state])
+            self._screen_status_state = state
+        set_text_if_changed(self.screen_share_status, text)
     
     def start_screen_capture(self, port: int):
         """Start screen capture for presentation."""
         try:
-            print(f"[DEBUG] Starting screen capture client on port {port}")
-            
-            # Test screen capture capability first
-            test_client = ScreenCaptureClient(self.host, port, self)
-            test_screenshot = test_client.capture_screen()
+            logger.debug("Starting screen capture client on port %s", port)
             
-            if test_screenshot is None:
+            # Check capture capability without grabbing a throwaway frame
+            if not ScreenCaptureClient.is_supported():
+                if HAS_OPENCV:
+                    raise Exception("Screen capture requires PIL/Pillow: pip install Pillow")
                 raise Exception("Screen capture not available on this platform")
             
             self.screen_capture_client = ScreenCaptureClient(self.host, port, self)
@@ -3917,27 +4329,15 @@ class ClientMainWindow(QMainWindow):
             
             # Update UI - both media controls and dedicated tab
             self.media_controls.screen_sharing = True
-            self.media_controls.screen_btn.setChecked(True)
-            self.media_controls.screen_btn.setText("🖥️ Sharing")
+            set_checked_if_changed(self.media_controls.screen_btn, True)
+            set_text_if_changed(self.media_controls.screen_btn, "🖥️ Sharing")
             
             # Update dedicated screen sharing tab buttons and status
-            if hasattr(self, 'start_share_btn') and hasattr(self, 'stop_share_btn'):
+            if self.start_share_btn is not None and self.stop_share_btn is not None:
                 self.start_share_btn.setEnabled(False)
                 self.stop_share_btn.setEnabled(True)
             
-            if hasattr(self, 'screen_share_status'):
-                self.screen_share_status.setText("🖥️ Currently sharing your screen")
-                self.screen_share_status.setStyleSheet("""
-                    QLabel {
-                        background-color: #28a745;
-                        color: #ffffff;
-                        border-radius: 6px;
-                        padding: 10px;
-                        font-size: 14px;
-                        font-weight: bold;
-                        margin: 10px 0;
-                    }
-                """)
+            self.set_screen_share_status('sharing', "🖥️ Currently sharing your screen")
             
         except Exception as e:
             error_msg = str(e)
@@ -3949,31 +4349,19 @@ class ClientMainWindow(QMainWindow):
             
             # Reset button states - both media controls and dedicated tab
             self.media_controls.screen_sharing = False
-            self.media_controls.screen_btn.setChecked(False)
-            self.media_controls.screen_btn.setText("🖥️ Share")
+            set_checked_if_changed(self.media_controls.screen_btn, False)
+            set_text_if_changed(self.media_controls.screen_btn, "🖥️ Share")
             
-            if hasattr(self, 'start_share_btn') and hasattr(self, 'stop_share_btn'):
+            if self.start_share_btn is not None and self.stop_share_btn is not None:
                 self.start_share_btn.setEnabled(True)
                 self.stop_share_btn.setEnabled(False)
             
-            if hasattr(self, 'screen_share_status'):
-                self.screen_share_status.setText("❌ Failed to start screen sharing")
-                self.screen_share_status.setStyleSheet("""
-                    QLabel {
-                        background-color: #dc3545;
-                        color: #ffffff;
-                        border-radius: 6px;
-                        padding: 10px;
-                        font-size: 14px;
-                        font-weight: bold;
-                        margin: 10px 0;
-                    }
-                """)
+            self.set_screen_share_status('error', "❌ Failed to start screen sharing")
     
     def show_screen_share_viewer(self, host: str, port: int, presenter_name: str):
         """Show screen share viewer window."""
         try:
-            if hasattr(self, 'screen_viewer') and self.screen_viewer:
+            if self.screen_viewer:
                 self.screen_viewer.close()
             
             self.screen_viewer = ScreenShareViewer(host, port, presenter_name, self)
@@ -3985,21 +4373,35 @@ class ClientMainWindow(QMainWindow):
     
     def close_screen_share_viewer(self):
         """Close screen share viewer window."""
-        if hasattr(self, 'screen_viewer') and self.screen_viewer:
+        if self.screen_viewer:
             self.screen_viewer.close()
             self.screen_viewer = None
     
     def start_screen_preview(self):
         """Start screen preview in the Screen Share tab."""
         try:
-            if not hasattr(self, 'screen_preview_capture') or self.screen_preview_capture is None:
-                print("[DEBUG] Starting screen preview capture")
+            if self._preview_stopping:
+                # The previous capture thread is still winding down; start
+                # again once it has finished
+                self._preview_restart_requested = True
+                return
+            if self.screen_preview_capture is None:
+                logger.debug("Starting screen preview capture")
                 self.screen_preview_capture = ScreenPreviewCapture(self)
-                self.screen_preview_capture.preview_frame_ready.connect(self.update_screen_preview)
+                self.screen_preview_capture.preview_frame_ready.connect(self._stash_preview_frame)
+                self.screen_preview_capture.finished.connect(self._on_preview_thread_finished)
+                self.sync_preview_target_size()
                 self.screen_preview_capture.start()
                 
+                # Render only the newest frame at a fixed rate
+                self._pending_preview = None
+                if self.preview_render_timer is None:
+                    self.preview_render_timer = QTimer(self)
+                    self.preview_render_timer.timeout.connect(self._render_pending_preview)
+                self.preview_render_timer.start(PREVIEW_RENDER_INTERVAL_MS)
+                
                 # Update preview label to show it's starting
-                if hasattr(self, 'screen_preview_label'):
+                if self.screen_preview_label is not None:
                     self.screen_preview_label.setText("🔄 Starting preview...")
                     self.screen_preview_label.setStyleSheet("""
                         QLabel {
@@ -4011,20 +4413,29 @@ class ClientMainWindow(QMainWindow):
                     """)
         except Exception as e:
             print(f"[ERROR] Failed to start screen preview: {e}")
-            if hasattr(self, 'screen_preview_label'):
+            if self.screen_preview_label is not None:
                 self.screen_preview_label.setText("❌ Preview failed to start")
     
-    def stop_screen_preview(self):
-        """Stop screen preview in the Screen Share tab."""
+    def stop_screen_preview(self, wait: bool = False):
+        """Stop screen preview in the Screen Share tab.
+        
+        Returns without blocking unless wait is True; the capture thread is
+        released in _on_preview_thread_finished.
+        """
         try:
-            if hasattr(self, 'screen_preview_capture') and self.screen_preview_capture:
-                print("[DEBUG] Stopping screen preview capture")
+            self._preview_restart_requested = False
+            if self.screen_preview_capture is not None and not self._preview_stopping:
+                logger.debug("Stopping screen preview capture")
+                self._preview_stopping = True
                 self.screen_preview_capture.stop()
-                self.screen_preview_capture.wait()
-                self.screen_preview_capture = None
+                if self.preview_render_timer is not None:
+                    self.preview_render_timer.stop()
+                self._pending_preview = None
                 
-                # Reset preview label
-                if hasattr(self, 'screen_preview_label'):
+                # Reset preview label; the placeholder text needs its background
+                if self.screen_preview_label is not None:
+                    self.screen_preview_label.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+                    self._preview_style_applied = False
                     self.screen_preview_label.clear()
                     self.screen_preview_label.setText("Screen sharing preview will appear here when you start sharing")
                     self.screen_preview_label.setStyleSheet("""
@@ -4035,50 +4446,88 @@ class ClientMainWindow(QMainWindow):
                             padding: 50px;
                         }
                     """)
+            
+            if wait and self.screen_preview_capture is not None:
+                self.screen_preview_capture.wait()
         except Exception as e:
             print(f"[ERROR] Failed to stop screen preview: {e}")
     
+    def _on_preview_thread_finished(self):
+        """Release the stopped preview thread and honour a queued restart."""
+        if self.screen_preview_capture is not None:
+            self.screen_preview_capture.deleteLater()
+        self.screen_preview_capture = None
+        self._preview_stopping = False
+        if self._preview_restart_requested:
+            self._preview_restart_requested = False
+            self.start_screen_preview()
+    
+    def _stash_preview_frame(self, slot: int):
+        """Keep only the latest preview slot; older ones are dropped."""
+        self._pending_preview = slot
+    
+    def _render_pending_preview(self):
+        """Render the most recent stashed preview frame, if any."""
+        slot = self._pending_preview
+        capture = self.screen_preview_capture
+        if slot is not None and capture is not None:
+            self._pending_preview = None
+            capture.reader_idx = slot
+            self.update_screen_preview(capture.frame_at(slot))
+    
     def update_screen_preview(self, frame: np.ndarray):
         """Update the screen preview display with captured frame."""
         try:
-            if frame is not None and frame.size > 0 and hasattr(self, 'screen_preview_label'):
-                # Convert BGR to RGB for Qt
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Create QImage
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+            if frame is not None and frame.size > 0 and self.screen_preview_label is not None:
+                # The capture thread already delivers RGB at label size, so
+                # only wrap the buffer - Qt does not copy it, so keep the
+                # array alive until the pixmap has been built
+                self._last_preview_frame = frame
+                h, w = frame.shape[:2]
+                bytes_per_line = frame.strides[0]
+                # Ring slots are views over row-padded buffers; hand Qt the
+                # whole padded buffer so the aligned stride is preserved
+                buffer = frame if frame.flags.c_contiguous else frame.base
+                qt_image = QImage(buffer.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
                 
-                # Convert to QPixmap and scale to fit the preview area
+                # Set the pixmap to the label; frames are rendered at physical
+                # size, so tag the pixmap to avoid a second resample on HiDPI
                 pixmap = QPixmap.fromImage(qt_image)
+                pixmap.setDevicePixelRatio(self.screen_preview_label.devicePixelRatioF())
+                self.screen_preview_label.setPixmap(pixmap)
                 
-                # Scale to fit the preview label while maintaining aspect ratio
-                label_size = self.screen_preview_label.size()
-                scaled_pixmap = pixmap.scaled(
-                    label_size, 
-                    Qt.AspectRatioMode.KeepAspectRatio, 
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                # Set the pixmap to the label
-                self.screen_preview_label.setPixmap(scaled_pixmap)
-                
-                # Update styling to remove text styling
-                self.screen_preview_label.setStyleSheet("""
-                    QLabel {
-                        background-color: transparent;
-                        border: none;
-                    }
-                """)
+                # Switch from the placeholder look on the first frame only
+                if not self._preview_style_applied:
+                    # Update styling to remove text styling
+                    self.screen_preview_label.setStyleSheet(PREVIEW_ACTIVE_STYLE)
+                    # The scaled pixmap covers the whole label, so skip painting
+                    # the background underneath it while frames are shown
+                    self.screen_preview_label.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+                    self._preview_style_applied = True
                 
         except Exception as e:
             print(f"[ERROR] Failed to update screen preview: {e}")
     
+    def sync_preview_target_size(self):
+        """Tell the preview capture thread what size to render frames at."""
+        if self.screen_preview_capture is not None and self.screen_preview_label is not None:
+            # Physical pixels, so HiDPI screens get a sharp 1:1 pixmap
+            label_size = self.screen_preview_label.size()
+            dpr = self.screen_preview_label.devicePixelRatioF()
+            self.screen_preview_capture.target_size = (
+                int(label_size.width() * dpr), int(label_size.height() * dpr)
+            )
+    
+    def eventFilter(self, obj, event):
+        """Forward preview label resizes to the capture thread."""
+        if event.type() == QEvent.Type.Resize and obj is self.screen_preview_label:
+            self.sync_preview_target_size()
+        return super().eventFilter(obj, event)
+    
     def closeEvent(self, event):
         """Handle window close event."""
-        # Stop screen preview if running
-        self.stop_screen_preview()
+        # Stop screen preview if running; wait so the thread is gone before the window
+        self.stop_screen_preview(wait=True)
         
         # Disconnect from server
         self.disconnect_from_server()
@@ -4120,12 +4569,20 @@ Examples:
                        help='Server port (default: 9000)')
     parser.add_argument('--username', type=str, default=None,
                        help='Username (default: will be asked in dialog)')
+    parser.add_argument('--debug', action='store_true',
+                       help='Show debug output (also enabled by LAN_CLIENT_DEBUG=1)')
     
     args = parser.parse_args()
     
+    debug = args.debug or os.environ.get('LAN_CLIENT_DEBUG') == '1'
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO,
+                        format='[%(levelname)s] %(message)s')
+    
     try:
         # Set up application with better compatibility
         app = QApplication(sys.argv)
+        # Collapse bursts of repaint/move events (e.g. from the screen preview)
+        app.setAttribute(Qt.ApplicationAttribute.AA_CompressHighFrequencyEvents, True)
         app.setApplicationName("LAN Collaboration Client")
         app.setApplicationVersion("1.0.0")
         app.setOrganizationName("LAN Collab")
@@ -4145,12 +4602,7 @@ Examples:
         
         # Set consistent style across platforms
         try:
-            if sys.platform == "darwin":  # macOS
-                app.setStyle("macOS")
-            elif sys.platform == "win32":  # Windows
-                app.setStyle("windowsvista")
-            else:  # Linux and others
-                app.setStyle("Fusion")
+            app.setStyle(PREFERRED_STYLE)
         except Exception as e:
             print(f"[INFO] Could not set preferred style, using default: {e}")
             app.setStyle("Fusion")  # Fallback to Fusion
@@ -4186,12 +4638,13 @@ Examples:
         # Create main window
         main_window = ClientMainWindow()
         
-        # Center window on screen
-        screen = app.primaryScreen().geometry()
-        window_geometry = main_window.geometry()
-        x = (screen.width() - window_geometry.width()) // 2
-        y = (screen.height() - window_geometry.height()) // 2
-        main_window.move(x, y)
+        # Center window in the usable screen area (excludes taskbars/docks)
+        main_window.setGeometry(QStyle.alignedRect(
+            Qt.LayoutDirection.LeftToRight,
+            Qt.AlignmentFlag.AlignCenter,
+            main_window.size(),
+            app.primaryScreen().availableGeometry()
+        ))
         
         main_window.show()
         
@@ -23,11 +23,15 @@ import struct
 import socket
 import uuid
 import argparse
+import heapq
+import signal
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from collections import deque
 
+from net_utils import get_local_ip
+
 # Optional imports
 try:
     import cv2
@@ -51,6 +55,30 @@ except ImportError:
     HAS_OPUS = False
     print("[WARNING] Opus not available. Audio encoding disabled.")
 
+# Faster JSON for control messages; stdlib json is a drop-in fallback
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# libuv-based event loop; stock asyncio is used when it is not installed
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+if HAS_ORJSON:
+    encode_message = orjson.dumps
+    decode_message = orjson.loads
+else:
+    def encode_message(message: dict) -> bytes:
+        return json.dumps(message).encode('utf-8')
+    
+    def decode_message(data: bytes) -> dict:
+        return json.loads(data)
+
 # Protocol constants
 class MessageTypes:
     # Client to Server
@@ -88,28 +116,98 @@ DEFAULT_HOST = '0.0.0.0'
 DEFAULT_TCP_PORT = 9000
 DEFAULT_UDP_VIDEO_PORT = 10000
 DEFAULT_UDP_AUDIO_PORT = 11000
-CHUNK_SIZE = 8192
+CHUNK_SIZE = 64 * 1024
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
 MAX_FILE_SIZE = 100 * 1024 * 1024
 HEARTBEAT_INTERVAL = 10
 MAX_CHAT_HISTORY = 500
 AUDIO_SAMPLE_RATE = 16000
 AUDIO_CHANNELS = 1
 AUDIO_CHUNK_SIZE = 1600
+MEDIA_SYNC_INTERVAL = 1.0  # seconds between client-map syncs across UDP shards
+DEBUG = False  # per-event [DEBUG] tracing in control handlers (--debug)
+
+# Wire headers, compiled once: audio (uid, sequence, size), video (uid,
+# sequence, frame_id, size) and the 4-byte length/type prefix on TCP
+AUDIO_HEADER = struct.Struct('!III')
+VIDEO_HEADER = struct.Struct('!IIII')
+LENGTH_PREFIX = struct.Struct('!I')
+
+# Kernel socket buffers: UDP media absorbs bursts, screen share sends
+# whole frames per write (the kernel caps both at its configured max)
+MEDIA_SOCKET_BUFFER = 4 * 1024 * 1024
+SCREEN_SEND_BUFFER = 1024 * 1024
+SCREEN_VIEWER_QUEUE = 2  # frames buffered per viewer before the oldest is dropped
 
 # Protocol helper functions
+_iso_cache = [0, ""]  # [epoch second, formatted timestamp]
+
+def now_iso(precise: bool = False) -> str:
+    """ISO timestamp whose date/time part is formatted at most once per second.
+    
+    Control messages use second resolution; pass precise=True for chat,
+    which appends milliseconds to the cached prefix.
+    """
+    now = time.time()
+    second = int(now)
+    if second != _iso_cache[0]:
+        _iso_cache[0] = second
+        _iso_cache[1] = datetime.fromtimestamp(second).isoformat()
+    if precise:
+        return f"{_iso_cache[1]}.{int((now - second) * 1000):03d}"
+    return _iso_cache[1]
+
+def frame_message(message: Union[dict, bytes]) -> Tuple[bytes, bytes]:
+    """Encode a message and its 4-byte length prefix (bytes are already encoded).
+    
+    The two parts go to writer.writelines(), which avoids concatenating
+    them (Python 3.12+ hands them to sendmsg as one scatter/gather write).
+    """
+    data = message if isinstance(message, bytes) else encode_message(message)
+    return LENGTH_PREFIX.pack(len(data)), data
+
+def tune_stream_socket(writer, send_buffer: Optional[int] = None):
+    """Disable Nagle on a stream's socket and optionally enlarge its send buffer."""
+    sock = writer.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if send_buffer:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer)
+    except OSError:
+        pass
+
+async def send_file(writer, path):
+    """Stream a file to a client, zero-copy where the platform allows.
+    
+    loop.sendfile uses os.sendfile where available and falls back to
+    read/write otherwise; uvloop does not implement it at all, so stream
+    the file there with large unbuffered reads.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        try:
+            await asyncio.get_running_loop().sendfile(writer.transport, f)
+        except NotImplementedError:
+            while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+                writer.write(chunk)
+                await writer.drain()
+
 def create_login_success_message(uid: int, username: str) -> dict:
     return {
         "type": MessageTypes.LOGIN_SUCCESS,
         "uid": uid,
         "username": username,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_participant_list_message(participants: list) -> dict:
     return {
         "type": MessageTypes.PARTICIPANT_LIST,
         "participants": participants,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_user_joined_message(uid: int, username: str) -> dict:
@@ -117,7 +215,7 @@ def create_user_joined_message(uid: int, username: str) -> dict:
         "type": MessageTypes.USER_JOINED,
         "uid": uid,
         "username": username,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_user_left_message(uid: int, username: str) -> dict:
@@ -125,178 +223,553 @@ def create_user_left_message(uid: int, username: str) -> dict:
         "type": MessageTypes.USER_LEFT,
         "uid": uid,
         "username": username,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_error_message(message: str) -> dict:
     return {
         "type": MessageTypes.ERROR,
         "message": message,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 def create_heartbeat_ack_message() -> dict:
     return {
         "type": MessageTypes.HEARTBEAT_ACK,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 
+# UDP batching: on Linux one sendmmsg(2) call sends a packet to every
+# recipient and recvmmsg(2) drains many datagrams per call; elsewhere (or
+# on failure) callers send per client and receive through asyncio
+HAS_SENDMMSG = False
+HAS_RECVMMSG = False
+RECVMMSG_BATCH = 32
+MAX_DATAGRAM_SIZE = 65536
+if sys.platform.startswith("linux"):
+    try:
+        import ctypes
+        import ctypes.util
+        
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        _libc_sendmmsg = _libc.sendmmsg
+        
+        class _IOVec(ctypes.Structure):
+            _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+        
+        class _MsgHdr(ctypes.Structure):
+            _fields_ = [
+                ("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_IOVec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int),
+            ]
+        
+        class _MMsgHdr(ctypes.Structure):
+            _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+        
+        _libc_sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        _libc_sendmmsg.restype = ctypes.c_int
+        HAS_SENDMMSG = True
+        
+        _libc_recvmmsg = _libc.recvmmsg
+        _libc_recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint,
+                                   ctypes.c_int, ctypes.c_void_p]
+        _libc_recvmmsg.restype = ctypes.c_int
+        HAS_RECVMMSG = True
+    except (OSError, AttributeError):
+        pass
+
+_sockaddr_cache = {}  # (ip, port) -> packed sockaddr_in buffer
+
+def _sockaddr_in(address: tuple):
+    """Packed sockaddr_in for an IPv4 (ip, port) address, cached per address."""
+    buf = _sockaddr_cache.get(address)
+    if buf is None:
+        raw = (struct.pack('=H', socket.AF_INET) + struct.pack('!H', address[1])
+               + socket.inet_aton(address[0]) + bytes(8))
+        buf = ctypes.create_string_buffer(raw, len(raw))
+        _sockaddr_cache[address] = buf
+    return buf
+
+def release_sockaddrs(addresses):
+    """Forget cached sockaddr_in buffers for addresses no longer sent to."""
+    for address in addresses:
+        _sockaddr_cache.pop(address, None)
+
+def sendmmsg_fanout(sock: socket.socket, packet: Union[bytes, memoryview], addresses: list) -> int:
+    """Send one packet to many addresses with a single sendmmsg call.
+    
+    Returns how many addresses were sent to; the caller sends the rest
+    (0 when the socket buffer is full or batching is unavailable).
+    """
+    if not HAS_SENDMMSG or not addresses:
+        return 0
+    try:
+        count = len(addresses)
+        # bytes are read in place; writable buffers (the servers' tx views)
+        # are mapped without copying
+        if isinstance(packet, bytes):
+            payload = ctypes.c_char_p(packet)
+            iov = _IOVec(ctypes.cast(payload, ctypes.c_void_p), len(packet))
+        else:
+            payload = (ctypes.c_char * len(packet)).from_buffer(packet)
+            iov = _IOVec(ctypes.addressof(payload), len(packet))
+        msgs = (_MMsgHdr * count)()
+        for msg, address in zip(msgs, addresses):
+            name = _sockaddr_in(address)
+            msg.msg_hdr.msg_name = ctypes.cast(name, ctypes.c_void_p)
+            msg.msg_hdr.msg_namelen = ctypes.sizeof(name)
+            msg.msg_hdr.msg_iov = ctypes.pointer(iov)
+            msg.msg_hdr.msg_iovlen = 1
+        sent = _libc_sendmmsg(sock.fileno(), msgs, count, 0)
+        return max(sent, 0)
+    except Exception:
+        return 0
+
+
+class BatchDatagramReceiver:
+    """Drains a UDP socket with recvmmsg, handing each datagram to a handler.
+    
+    Stands in for the datagram transport (sendto/close) on Linux, so one
+    readiness callback receives up to RECVMMSG_BATCH packets.
+    """
+    
+    def __init__(self, sock: socket.socket, handler, closed: asyncio.Future):
+        self.sock = sock
+        self.handler = handler
+        self.closed = closed
+        self.loop = asyncio.get_running_loop()
+        self.fd = sock.fileno()
+        
+        # One receive buffer and sockaddr slot per batch entry, wired up once
+        self.buffer = ctypes.create_string_buffer(MAX_DATAGRAM_SIZE * RECVMMSG_BATCH)
+        self.names = ((ctypes.c_char * 16) * RECVMMSG_BATCH)()
+        self.iovecs = (_IOVec * RECVMMSG_BATCH)()
+        self.msgs = (_MMsgHdr * RECVMMSG_BATCH)()
+        base = ctypes.addressof(self.buffer)
+        for i in range(RECVMMSG_BATCH):
+            self.iovecs[i].iov_base = base + i * MAX_DATAGRAM_SIZE
+            self.iovecs[i].iov_len = MAX_DATAGRAM_SIZE
+            self.msgs[i].msg_hdr.msg_iov = ctypes.pointer(self.iovecs[i])
+            self.msgs[i].msg_hdr.msg_iovlen = 1
+            self.msgs[i].msg_hdr.msg_name = ctypes.addressof(self.names[i])
+        
+        self.loop.add_reader(self.fd, self.drain)
+    
+    def drain(self):
+        """Receive every queued datagram, a batch per syscall."""
+        base = ctypes.addressof(self.buffer)
+        while True:
+            for msg in self.msgs:
+                msg.msg_hdr.msg_namelen = 16
+            count = _libc_recvmmsg(self.fd, self.msgs, RECVMMSG_BATCH, socket.MSG_DONTWAIT, None)
+            if count <= 0:
+                return
+            
+            for i in range(count):
+                data = ctypes.string_at(base + i * MAX_DATAGRAM_SIZE, self.msgs[i].msg_len)
+                name = self.names[i].raw
+                self.handler(data, (socket.inet_ntoa(name[4:8]), int.from_bytes(name[2:4], 'big')))
+            
+            if count < RECVMMSG_BATCH:
+                return
+    
+    def sendto(self, data: bytes, addr: tuple):
+        try:
+            self.sock.sendto(data, addr)
+        except OSError:
+            pass
+    
+    def close(self):
+        if self.sock.fileno() != -1:
+            self.loop.remove_reader(self.fd)
+            self.sock.close()
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+
+class MediaDatagramProtocol(asyncio.DatagramProtocol):
+    """Hands each received datagram straight to a media server's handler."""
+    
+    def __init__(self, handler, closed: asyncio.Future):
+        self.handler = handler
+        self.closed = closed
+    
+    def datagram_received(self, data: bytes, addr: tuple):
+        self.handler(data, addr)
+    
+    def error_received(self, exc: Exception):
+        pass  # e.g. ICMP port unreachable from a client that went away
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+
 class AudioServer:
     """UDP Audio server for real-time audio streaming."""
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 11000):
+    def __init__(self, host: str = '0.0.0.0', port: int = 11000,
+                 reuse_port: bool = False, shared_clients=None, members=None):
         self.host = host
         self.port = port
+        self.reuse_port = reuse_port
+        self.shared_clients = shared_clients  # uid -> address across shards
+        self.members = members  # logged-in uids (dict keys); set by the control plane
+        self.shard_targets = {}  # uid -> address seen only by other shards
         self.socket = None
+        self.transport = None
+        self.loop = None
         self.running = False
-        self.clients = {}
+        self.clients = {}  # uid -> address
+        self.targets_for = {}  # sender uid -> addresses of everyone else
+        
+        # Outgoing packets are assembled in one reusable buffer; broadcasts
+        # run synchronously from the receive callback, so it is never shared
+        self.tx_buffer = bytearray(AUDIO_HEADER.size + MAX_DATAGRAM_SIZE)
+        self.tx_view = memoryview(self.tx_buffer)
         
     async def start(self):
         """Start the audio server."""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, MEDIA_SOCKET_BUFFER)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MEDIA_SOCKET_BUFFER)
             self.socket.bind((self.host, self.port))
             self.socket.setblocking(False)
+            self.loop = asyncio.get_running_loop()
+            
+            # Datagrams are delivered by callback, without a Future per packet;
+            # on Linux they are drained in recvmmsg batches
+            closed = self.loop.create_future()
+            if HAS_RECVMMSG:
+                self.transport = BatchDatagramReceiver(self.socket, self.handle_audio_packet, closed)
+            else:
+                self.transport, _ = await self.loop.create_datagram_endpoint(
+                    lambda: MediaDatagramProtocol(self.handle_audio_packet, closed),
+                    sock=self.socket
+                )
             self.running = True
             
             print(f"[INFO] Audio server listening on {self.host}:{self.port}")
             
-            while self.running:
-                try:
-                    data, addr = await asyncio.get_event_loop().sock_recvfrom(self.socket, 4096)
-                    await self.handle_audio_packet(data, addr)
-                except asyncio.CancelledError:
-                    break
-                except Exception:
-                    if self.running:
-                        await asyncio.sleep(0.01)
-                        
+            if self.shared_clients is not None:
+                asyncio.create_task(sync_shard_clients(self))
+            
+            await closed
+            
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             print(f"[ERROR] Failed to start audio server: {e}")
         finally:
             self.stop()
     
-    async def handle_audio_packet(self, data: bytes, addr: tuple):
+    def handle_audio_packet(self, data: bytes, addr: tuple):
         """Handle incoming audio packet."""
         try:
-            if len(data) < 12:
+            if len(data) < AUDIO_HEADER.size:
                 return
             
-            uid, sequence, data_size = struct.unpack('!III', data[:12])
-            audio_data = data[12:]
+            uid, sequence, data_size = AUDIO_HEADER.unpack_from(data)
+            audio_data = data[AUDIO_HEADER.size:]
             
             if len(audio_data) != data_size:
                 return
             
-            self.clients[uid] = {'address': addr, 'last_seen': time.time()}
-            await self.broadcast_audio(audio_data, uid, sequence)
+            self.track_client(uid, addr)
+            self.broadcast_audio(audio_data, uid, sequence)
             
         except Exception:
             pass
     
-    async def broadcast_audio(self, audio_data: bytes, sender_uid: int, sequence: int):
+    def broadcast_audio(self, audio_data: bytes, sender_uid: int, sequence: int):
         """Broadcast audio to all clients except sender."""
         try:
-            header = struct.pack('!III', sender_uid, sequence, len(audio_data))
-            packet = header + audio_data
+            addresses = self.targets_for.get(sender_uid, ())
+            if not addresses:
+                return
             
-            for uid, client_info in self.clients.items():
-                if uid != sender_uid:
+            size = AUDIO_HEADER.size + len(audio_data)
+            AUDIO_HEADER.pack_into(self.tx_buffer, 0, sender_uid, sequence, len(audio_data))
+            self.tx_buffer[AUDIO_HEADER.size:size] = audio_data
+            packet = self.tx_view[:size]
+            
+            # Batch the fan-out into one syscall where possible, then send
+            # whatever was not accepted one client at a time
+            sent = sendmmsg_fanout(self.socket, packet, addresses)
+            if sent < len(addresses):
+                sendto = self.transport.sendto
+                for address in addresses[sent:]:
                     try:
-                        await asyncio.get_event_loop().sock_sendto(
-                            self.socket, packet, client_info['address']
-                        )
+                        sendto(packet, address)
                     except Exception:
                         pass
         except Exception:
             pass
     
+    def track_client(self, uid: int, addr: tuple):
+        """Record a packet from a client, rebuilding targets only on changes."""
+        if self.clients.get(uid) != addr:
+            self.clients[uid] = addr
+            self.rebuild_targets()
+    
+    def remove_client(self, uid: int):
+        """Stop forwarding to a client whose session has ended."""
+        if self.clients.pop(uid, None) is not None:
+            self.rebuild_targets()
+    
+    def retain_clients(self, uids):
+        """Drop clients whose uid is not logged in.
+        
+        Membership follows the control session, not UDP activity: a
+        muted or camera-off client sends nothing but keeps receiving.
+        """
+        stale = [uid for uid in self.clients if uid not in uids]
+        if stale:
+            for uid in stale:
+                del self.clients[uid]
+            self.rebuild_targets()
+    
+    def rebuild_targets(self):
+        """Refresh per-sender broadcast lists from local and other-shard clients.
+        
+        Membership changes are rare next to packets, so each sender's
+        recipients are partitioned here rather than filtered per packet.
+        """
+        merged = dict(self.shard_targets)
+        merged.update(self.clients)
+        previous = set().union(*self.targets_for.values())
+        self.targets_for = {
+            sender: [address for uid, address in merged.items() if uid != sender]
+            for sender in merged
+        }
+        release_sockaddrs(previous.difference(*self.targets_for.values()))
+    
     def stop(self):
         """Stop the audio server."""
         self.running = False
-        if self.socket:
+        if self.transport:
+            self.transport.close()  # Also closes the socket
+            self.transport = None
+        elif self.socket:
             self.socket.close()
-            self.socket = None
+        self.socket = None
 
 class VideoServer:
     """UDP Video server for real-time video streaming."""
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 10000):
+    def __init__(self, host: str = '0.0.0.0', port: int = 10000,
+                 reuse_port: bool = False, shared_clients=None, members=None):
         self.host = host
         self.port = port
+        self.reuse_port = reuse_port
+        self.shared_clients = shared_clients  # uid -> address across shards
+        self.members = members  # logged-in uids (dict keys); set by the control plane
+        self.shard_targets = {}  # uid -> address seen only by other shards
         self.socket = None
+        self.transport = None
+        self.loop = None
         self.running = False
-        self.clients = {}
+        self.clients = {}  # uid -> address
+        self.targets_for = {}  # sender uid -> addresses of everyone else
+        
+        # Outgoing packets are assembled in one reusable buffer; broadcasts
+        # run synchronously from the receive callback, so it is never shared
+        self.tx_buffer = bytearray(VIDEO_HEADER.size + MAX_DATAGRAM_SIZE)
+        self.tx_view = memoryview(self.tx_buffer)
         
     async def start(self):
         """Start the video server."""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, MEDIA_SOCKET_BUFFER)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MEDIA_SOCKET_BUFFER)
             self.socket.bind((self.host, self.port))
             self.socket.setblocking(False)
+            self.loop = asyncio.get_running_loop()
+            
+            # Datagrams are delivered by callback, without a Future per packet;
+            # on Linux they are drained in recvmmsg batches
+            closed = self.loop.create_future()
+            if HAS_RECVMMSG:
+                self.transport = BatchDatagramReceiver(self.socket, self.handle_video_packet, closed)
+            else:
+                self.transport, _ = await self.loop.create_datagram_endpoint(
+                    lambda: MediaDatagramProtocol(self.handle_video_packet, closed),
+                    sock=self.socket
+                )
             self.running = True
             
             print(f"[INFO] Video server listening on {self.host}:{self.port}")
             
-            while self.running:
-                try:
-                    data, addr = await asyncio.get_event_loop().sock_recvfrom(self.socket, 65536)
-                    await self.handle_video_packet(data, addr)
-                except asyncio.CancelledError:
-                    break
-                except Exception:
-                    if self.running:
-                        await asyncio.sleep(0.01)
-                        
+            if self.shared_clients is not None:
+                asyncio.create_task(sync_shard_clients(self))
+            
+            await closed
+            
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             print(f"[ERROR] Failed to start video server: {e}")
         finally:
             self.stop()
     
-    async def handle_video_packet(self, data: bytes, addr: tuple):
+    def handle_video_packet(self, data: bytes, addr: tuple):
         """Handle incoming video packet."""
         try:
-            if len(data) < 16:
+            if len(data) < VIDEO_HEADER.size:
                 return
             
-            uid, sequence, frame_id, data_size = struct.unpack('!IIII', data[:16])
-            video_data = data[16:]
+            uid, sequence, frame_id, data_size = VIDEO_HEADER.unpack_from(data)
+            video_data = data[VIDEO_HEADER.size:]
             
             if len(video_data) != data_size:
                 return
             
-            self.clients[uid] = {'address': addr, 'last_seen': time.time()}
-            await self.broadcast_video(video_data, uid, sequence, frame_id)
+            self.track_client(uid, addr)
+            self.broadcast_video(video_data, uid, sequence, frame_id)
             
         except Exception:
             pass
     
-    async def broadcast_video(self, video_data: bytes, sender_uid: int, sequence: int, frame_id: int):
+    def broadcast_video(self, video_data: bytes, sender_uid: int, sequence: int, frame_id: int):
         """Broadcast video to all clients except sender."""
         try:
-            header = struct.pack('!IIII', sender_uid, sequence, frame_id, len(video_data))
-            packet = header + video_data
+            addresses = self.targets_for.get(sender_uid, ())
+            if not addresses:
+                return
             
-            for uid, client_info in self.clients.items():
-                if uid != sender_uid:
+            size = VIDEO_HEADER.size + len(video_data)
+            VIDEO_HEADER.pack_into(self.tx_buffer, 0, sender_uid, sequence, frame_id, len(video_data))
+            self.tx_buffer[VIDEO_HEADER.size:size] = video_data
+            packet = self.tx_view[:size]
+            
+            # Batch the fan-out into one syscall where possible, then send
+            # whatever was not accepted one client at a time
+            sent = sendmmsg_fanout(self.socket, packet, addresses)
+            if sent < len(addresses):
+                sendto = self.transport.sendto
+                for address in addresses[sent:]:
                     try:
-                        await asyncio.get_event_loop().sock_sendto(
-                            self.socket, packet, client_info['address']
-                        )
+                        sendto(packet, address)
                     except Exception:
                         pass
         except Exception:
             pass
     
+    def track_client(self, uid: int, addr: tuple):
+        """Record a packet from a client, rebuilding targets only on changes."""
+        if self.clients.get(uid) != addr:
+            self.clients[uid] = addr
+            self.rebuild_targets()
+    
+    def remove_client(self, uid: int):
+        """Stop forwarding to a client whose session has ended."""
+        if self.clients.pop(uid, None) is not None:
+            self.rebuild_targets()
+    
+    def retain_clients(self, uids):
+        """Drop clients whose uid is not logged in.
+        
+        Membership follows the control session, not UDP activity: a
+        muted or camera-off client sends nothing but keeps receiving.
+        """
+        stale = [uid for uid in self.clients if uid not in uids]
+        if stale:
+            for uid in stale:
+                del self.clients[uid]
+            self.rebuild_targets()
+    
+    def rebuild_targets(self):
+        """Refresh per-sender broadcast lists from local and other-shard clients.
+        
+        Membership changes are rare next to packets, so each sender's
+        recipients are partitioned here rather than filtered per packet.
+        """
+        merged = dict(self.shard_targets)
+        merged.update(self.clients)
+        previous = set().union(*self.targets_for.values())
+        self.targets_for = {
+            sender: [address for uid, address in merged.items() if uid != sender]
+            for sender in merged
+        }
+        release_sockaddrs(previous.difference(*self.targets_for.values()))
+    
     def stop(self):
         """Stop the video server."""
         self.running = False
-        if self.socket:
+        if self.transport:
+            self.transport.close()  # Also closes the socket
+            self.transport = None
+        elif self.socket:
             self.socket.close()
-            self.socket = None
+        self.socket = None
+
+
+# UDP media sharding: with --udp-workers, extra processes bind the same
+# media ports with SO_REUSEPORT and the kernel spreads senders across them.
+# Each shard only receives its own senders, so shards publish their clients
+# to a shared map and broadcast to the union.
+async def sync_shard_clients(server):
+    """Periodically merge a media server's clients with the other shards'.
+    
+    Entries live as long as their uid is logged in (server.members), so
+    logouts reach every shard within MEDIA_SYNC_INTERVAL.
+    """
+    while server.running:
+        try:
+            members = set(server.members.keys())
+            server.retain_clients(members)
+            server.shared_clients.update(server.clients)
+            
+            shard_targets = {}
+            for uid, address in server.shared_clients.items():
+                if uid not in members:
+                    server.shared_clients.pop(uid, None)
+                elif uid not in server.clients:
+                    shard_targets[uid] = address
+            
+            if shard_targets != server.shard_targets:
+                server.shard_targets = shard_targets
+                server.rebuild_targets()
+        except (OSError, EOFError):
+            break  # Manager process is gone; the server is shutting down
+        
+        await asyncio.sleep(MEDIA_SYNC_INTERVAL)
+
+def run_media_shard(server_class, host: str, port: int, shared_clients, members):
+    """Process entry point for an extra audio/video shard."""
+    parent_pid = os.getppid()
+    server = server_class(host, port, reuse_port=True,
+                          shared_clients=shared_clients, members=members)
+    
+    async def serve():
+        # Exit with the main server even if it was killed without cleanup
+        async def watch_parent():
+            while os.getppid() == parent_pid:
+                await asyncio.sleep(MEDIA_SYNC_INTERVAL)
+            server.stop()
+        
+        watcher = asyncio.create_task(watch_parent())
+        await server.start()
+        watcher.cancel()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
 
 
 class ScreenShareServer:
@@ -308,7 +781,7 @@ class ScreenShareServer:
         self.server = None
         self.running = False
         self.presenter = None
-        self.viewers = set()
+        self.viewers = {}  # writer -> queue of (size prefix, frame) awaiting send
         
     async def start(self):
         """Start the screen share server."""
@@ -332,6 +805,7 @@ class ScreenShareServer:
         """Handle screen share client connection."""
         addr = writer.get_extra_info('peername')
         print(f"[INFO] Screen share client connected: {addr}")
+        tune_stream_socket(writer, SCREEN_SEND_BUFFER)
         
         try:
             while self.running:
@@ -340,7 +814,7 @@ class ScreenShareServer:
                 if not type_data:
                     break
                 
-                msg_type = struct.unpack('!I', type_data)[0]
+                msg_type = LENGTH_PREFIX.unpack(type_data)[0]
                 
                 if msg_type == 1:  # Presenter
                     await self.handle_presenter(reader, writer)
@@ -371,7 +845,7 @@ class ScreenShareServer:
                 if not size_data:
                     break
                 
-                frame_size = struct.unpack('!I', size_data)[0]
+                frame_size = LENGTH_PREFIX.unpack(size_data)[0]
                 
                 # Read frame data
                 frame_data = await reader.readexactly(frame_size)
@@ -386,35 +860,51 @@ class ScreenShareServer:
                 self.presenter = None
     
     async def handle_viewer(self, reader, writer):
-        """Handle viewer connection."""
-        self.viewers.add(writer)
+        """Handle viewer connection, sending frames as its queue fills."""
+        queue = asyncio.Queue(maxsize=SCREEN_VIEWER_QUEUE)
+        self.viewers[writer] = queue
         writer.write(b'OK')
         
         try:
-            while self.running and writer in self.viewers:
-                await asyncio.sleep(1)
+            while self.running:
+                item = await queue.get()
+                if item is None:  # Server stopping
+                    break
+                
+                # Hand the header and the shared frame buffer over separately
+                # rather than concatenating a fresh copy of the frame
+                writer.writelines(item)
+                await writer.drain()
         except Exception:
             pass
         finally:
-            self.viewers.discard(writer)
+            self.viewers.pop(writer, None)
+    
+    @staticmethod
+    def offer_frame(queue: asyncio.Queue, item):
+        """Queue an item for a viewer, dropping its oldest frame when full."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
     
     async def broadcast_frame(self, frame_data: bytes):
-        """Broadcast frame to all viewers."""
+        """Broadcast frame to all viewers.
+        
+        Each viewer drains its own queue, so a slow viewer skips frames
+        instead of holding up the presenter and the other viewers.
+        """
         if not self.viewers:
             return
         
-        frame_size = struct.pack('!I', len(frame_data))
-        
-        for viewer in list(self.viewers):
-            try:
-                viewer.write(frame_size + frame_data)
-                await viewer.drain()
-            except Exception:
-                self.viewers.discard(viewer)
+        item = (LENGTH_PREFIX.pack(len(frame_data)), frame_data)
+        for queue in self.viewers.values():
+            self.offer_frame(queue, item)
     
     def stop(self):
         """Stop the screen share server."""
         self.running = False
+        for queue in self.viewers.values():
+            self.offer_frame(queue, None)
         if self.server:
             self.server.close()
 
@@ -468,9 +958,9 @@ class FileTransferServer:
             if not info_size_data:
                 return
             
-            info_size = struct.unpack('!I', info_size_data)[0]
+            info_size = LENGTH_PREFIX.unpack(info_size_data)[0]
             info_data = await reader.readexactly(info_size)
-            file_info = json.loads(info_data.decode())
+            file_info = decode_message(info_data)
             
             file_id = str(uuid.uuid4())
             filename = file_info['filename']
@@ -487,12 +977,14 @@ class FileTransferServer:
             writer.write(b'OK')
             await writer.drain()
             
-            # Receive file data
+            # Receive file data; read() hands over whatever is already
+            # buffered instead of assembling exact-size chunks
             received = 0
             with open(file_path, 'wb') as f:
                 while received < file_size:
-                    chunk_size = min(CHUNK_SIZE, file_size - received)
-                    chunk = await reader.readexactly(chunk_size)
+                    chunk = await reader.read(min(CHUNK_SIZE, file_size - received))
+                    if not chunk:
+                        raise asyncio.IncompleteReadError(b'', file_size - received)
                     f.write(chunk)
                     received += len(chunk)
             
@@ -502,12 +994,12 @@ class FileTransferServer:
                 'size': file_size,
                 'path': str(file_path),
                 'uploader': file_info.get('uploader', 'Unknown'),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             }
             
             # Send success response
-            response = json.dumps({'file_id': file_id}).encode()
-            writer.write(struct.pack('!I', len(response)) + response)
+            response = encode_message({'file_id': file_id})
+            writer.write(LENGTH_PREFIX.pack(len(response)) + response)
             
             print(f"[INFO] File uploaded: {filename} ({file_size} bytes) from {addr}")
             
@@ -535,7 +1027,7 @@ class FileTransferServer:
             if not id_size_data:
                 return
             
-            id_size = struct.unpack('!I', id_size_data)[0]
+            id_size = LENGTH_PREFIX.unpack(id_size_data)[0]
             file_id = (await reader.readexactly(id_size)).decode()
             
             if file_id not in self.files:
@@ -550,18 +1042,12 @@ class FileTransferServer:
                 return
             
             # Send file info
-            info_data = json.dumps(file_info).encode()
-            writer.write(struct.pack('!I', len(info_data)) + info_data)
+            info_data = encode_message(file_info)
+            writer.write(LENGTH_PREFIX.pack(len(info_data)) + info_data)
             await writer.drain()
             
             # Send file data
-            with open(file_path, 'rb') as f:
-                while True:
-                    chunk = f.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    writer.write(chunk)
-                    await writer.drain()
+            await send_file(writer, file_path)
             
             print(f"[INFO] File downloaded: {file_info['filename']} to {addr}")
             
@@ -596,13 +1082,15 @@ class FileTransferServer:
 class Participant:
     """Represents a connected participant."""
     
+    __slots__ = ('uid', 'username', 'writer', 'last_heartbeat', 'is_presenting', 'join_time')
+    
     def __init__(self, uid: int, username: str, writer):
         self.uid = uid
         self.username = username
         self.writer = writer
         self.last_heartbeat = time.time()
         self.is_presenting = False
-        self.join_time = datetime.now()
+        self.join_time = now_iso(precise=True)  # Formatted once; sent in every participant list
         
     def to_dict(self) -> dict:
         """Convert participant to dictionary."""
@@ -610,7 +1098,7 @@ class Participant:
             'uid': self.uid,
             'username': self.username,
             'is_presenting': self.is_presenting,
-            'join_time': self.join_time.isoformat()
+            'join_time': self.join_time
         }
 
 
@@ -619,11 +1107,13 @@ class CollaborationServer:
     
     def __init__(self, host: str = DEFAULT_HOST, tcp_port: int = DEFAULT_TCP_PORT,
                  udp_video_port: int = DEFAULT_UDP_VIDEO_PORT,
-                 udp_audio_port: int = DEFAULT_UDP_AUDIO_PORT):
+                 udp_audio_port: int = DEFAULT_UDP_AUDIO_PORT,
+                 udp_workers: int = 0):
         self.host = host
         self.tcp_port = tcp_port
         self.udp_video_port = udp_video_port
         self.udp_audio_port = udp_audio_port
+        self.udp_workers = udp_workers
         
         # Core components
         self.server = None
@@ -632,17 +1122,26 @@ class CollaborationServer:
         # Participants management
         self.participants = {}  # uid -> Participant
         self.next_uid = 1
-        self.username_to_uid = {}
+        self.usernames = set()  # Names in use; participants holds the uid -> Participant index
+        self.participant_list_cache = None  # (timestamp, encoded list); reset on changes
+        self.presenter_uid = None  # uid of whoever is presenting, if anyone
+        self.heartbeat_deadlines = []  # min-heap of (timeout deadline, uid)
         
         # Chat history
-        self.chat_history = deque(maxlen=MAX_CHAT_HISTORY)
+        self.chat_history = deque(maxlen=MAX_CHAT_HISTORY)  # (message, encoded JSON)
+        self.history_cache = None  # (timestamp, encoded HISTORY reply); reset on append
         
         # Media servers
-        self.video_server = VideoServer(host, udp_video_port)
-        self.audio_server = AudioServer(host, udp_audio_port)
+        self.video_server = VideoServer(host, udp_video_port, members=self.participants)
+        self.audio_server = AudioServer(host, udp_audio_port, members=self.participants)
         self.screen_share_server = ScreenShareServer(host, 12000)
         self.file_server = FileTransferServer(host, 13000, 14000, self.on_file_uploaded)
         
+        # Extra UDP media shard processes (see start_media_shards)
+        self.media_manager = None
+        self.media_workers = []
+        self.media_members = None  # shared uid -> True mirror of participants for shards
+        
         # Statistics
         self.stats = {
             'start_time': datetime.now(),
@@ -660,6 +1159,8 @@ class CollaborationServer:
         
         try:
             # Start media servers
+            if self.udp_workers > 0:
+                self.start_media_shards()
             asyncio.create_task(self.video_server.start())
             asyncio.create_task(self.audio_server.start())
             asyncio.create_task(self.screen_share_server.start())
@@ -689,27 +1190,56 @@ class CollaborationServer:
         finally:
             await self.stop()
     
+    def start_media_shards(self):
+        """Spawn extra processes sharing the UDP media ports via SO_REUSEPORT."""
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            print("[WARNING] SO_REUSEPORT not supported. UDP media runs in one process.")
+            return
+        
+        import multiprocessing
+        self.media_manager = multiprocessing.Manager()
+        self.media_members = self.media_manager.dict(dict.fromkeys(self.participants, True))
+        
+        for server, port in ((self.video_server, self.udp_video_port),
+                             (self.audio_server, self.udp_audio_port)):
+            server.reuse_port = True
+            server.shared_clients = self.media_manager.dict()
+            for _ in range(self.udp_workers):
+                worker = multiprocessing.Process(
+                    target=run_media_shard,
+                    args=(type(server), self.host, port, server.shared_clients,
+                          self.media_members),
+                    daemon=True
+                )
+                worker.start()
+                self.media_workers.append(worker)
+        
+        print(f"[INFO] UDP media sharded across {self.udp_workers + 1} processes per port")
+    
     async def handle_client(self, reader, writer):
         """Handle new client connection."""
         addr = writer.get_extra_info('peername')
         print(f"[INFO] New connection from {addr}")
+        tune_stream_socket(writer)
         
         participant = None
         
         try:
             while self.running:
-                # Read message length
-                length_data = await reader.read(4)
-                if not length_data:
+                # Read message length; readexactly returns without yielding
+                # to the loop whenever the bytes are already buffered
+                try:
+                    length_data = await reader.readexactly(LENGTH_PREFIX.size)
+                except asyncio.IncompleteReadError:
                     break
                 
-                message_length = struct.unpack('!I', length_data)[0]
+                message_length = LENGTH_PREFIX.unpack(length_data)[0]
                 if message_length > 1024 * 1024:  # 1MB limit
                     break
                 
                 # Read message data
                 message_data = await reader.readexactly(message_length)
-                message = json.loads(message_data.decode())
+                message = decode_message(message_data)
                 
                 # Handle message
                 response = await self.handle_message(message, participant, writer)
@@ -730,7 +1260,7 @@ class CollaborationServer:
             await writer.wait_closed()
             print(f"[INFO] Client {addr} disconnected")
     
-    async def handle_message(self, message: dict, participant: Optional[Participant], writer) -> Optional[dict]:
+    async def handle_message(self, message: dict, participant: Optional[Participant], writer) -> Optional[Union[dict, bytes]]:
         """Handle incoming message from client."""
         msg_type = message.get('type')
         
@@ -786,7 +1316,7 @@ class CollaborationServer:
         if not username:
             return create_error_message("Username required")
         
-        if username in self.username_to_uid:
+        if username in self.usernames:
             return create_error_message("Username already taken")
         
         # Create new participant
@@ -795,7 +1325,12 @@ class CollaborationServer:
         
         participant = Participant(uid, username, writer)
         self.participants[uid] = participant
-        self.username_to_uid[username] = uid
+        self.usernames.add(username)
+        self.participant_list_cache = None
+        if self.media_members is not None:
+            self.media_members[uid] = True
+        heapq.heappush(self.heartbeat_deadlines,
+                       (participant.last_heartbeat + HEARTBEAT_INTERVAL * 3, uid))
         
         self.stats['total_connections'] += 1
         
@@ -819,14 +1354,16 @@ class CollaborationServer:
             'uid': participant.uid,
             'username': participant.username,
             'content': content,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso(precise=True)
         }
         
-        self.chat_history.append(chat_msg)
+        encoded = encode_message(chat_msg)
+        self.chat_history.append((chat_msg, encoded))
+        self.history_cache = None
         self.stats['messages_sent'] += 1
         
         # Broadcast to all participants
-        await self.broadcast_message(chat_msg)
+        await self.broadcast_message(encoded)
         
         return {'type': 'chat_sent', 'timestamp': chat_msg['timestamp']}
     
@@ -842,14 +1379,16 @@ class CollaborationServer:
             'uid': participant.uid,
             'username': participant.username,
             'content': content,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso(precise=True)
         }
         
-        self.chat_history.append(broadcast_msg)
+        encoded = encode_message(broadcast_msg)
+        self.chat_history.append((broadcast_msg, encoded))
+        self.history_cache = None
         self.stats['messages_sent'] += 1
         
         # Broadcast to all participants
-        await self.broadcast_message(broadcast_msg)
+        await self.broadcast_message(encoded)
         
         return {'type': 'broadcast_sent', 'timestamp': broadcast_msg['timestamp']}
     
@@ -861,7 +1400,8 @@ class CollaborationServer:
         if not content:
             return create_error_message("Empty message")
         
-        if target_uid not in self.participants:
+        target_participant = self.participants.get(target_uid)
+        if target_participant is None:
             return create_error_message("Target user not found")
         
         unicast_msg = {
@@ -870,14 +1410,14 @@ class CollaborationServer:
             'username': participant.username,
             'target_uid': target_uid,
             'content': content,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso(precise=True)
         }
         
         # Send to target user
-        target_participant = self.participants[target_uid]
         await self.send_message(target_participant.writer, unicast_msg)
         
-        print(f"[DEBUG] Private message sent from {participant.username} to {target_participant.username}")
+        if DEBUG:
+            print(f"[DEBUG] Private message sent from {participant.username} to {target_participant.username}")
         
         self.stats['messages_sent'] += 1
         
@@ -887,25 +1427,41 @@ class CollaborationServer:
             'timestamp': unicast_msg['timestamp']
         }
     
-    async def handle_get_history(self) -> dict:
-        """Handle chat history request."""
-        return {
-            'type': MessageTypes.HISTORY,
-            'messages': list(self.chat_history),
-            'timestamp': datetime.now().isoformat()
-        }
+    async def handle_get_history(self) -> bytes:
+        """Handle chat history request.
+        
+        Splices the stored encodings into the JSON envelope rather than
+        re-encoding every message, and reuses the result until a message
+        is appended or the second-resolution timestamp ticks over.
+        """
+        timestamp = now_iso()
+        cached = self.history_cache
+        if cached is None or cached[0] != timestamp:
+            messages = b','.join(encoded for _, encoded in self.chat_history)
+            reply = (b'{"type": "' + MessageTypes.HISTORY.encode() + b'", "messages": [' + messages
+                     + b'], "timestamp": "' + timestamp.encode() + b'"}')
+            cached = self.history_cache = (timestamp, reply)
+        return cached[1]
     
-    async def handle_get_participants(self) -> dict:
-        """Handle participants list request."""
-        participants_list = [p.to_dict() for p in self.participants.values()]
-        return create_participant_list_message(participants_list)
+    async def handle_get_participants(self) -> bytes:
+        """Handle participants list request.
+        
+        The encoded reply is reused until someone joins, leaves or changes
+        presenter state, or its second-resolution timestamp ticks over.
+        """
+        cached = self.participant_list_cache
+        if cached is None or cached[0] != now_iso():
+            participants_list = [p.to_dict() for p in self.participants.values()]
+            message = create_participant_list_message(participants_list)
+            cached = self.participant_list_cache = (message['timestamp'], encode_message(message))
+        return cached[1]
     
     async def handle_file_offer(self, message: dict, participant: Participant) -> dict:
         """Handle file offer."""
         return {
             'type': MessageTypes.FILE_UPLOAD_PORT,
             'port': self.file_server.upload_port,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
     
     async def handle_file_request(self, message: dict, participant: Participant) -> dict:
@@ -916,21 +1472,26 @@ class CollaborationServer:
             'type': MessageTypes.FILE_DOWNLOAD_PORT,
             'port': self.file_server.download_port,
             'files': file_list,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
     
     async def handle_present_start(self, participant: Participant) -> dict:
         """Handle presentation start."""
-        print(f"[DEBUG] Received PRESENT_START from {participant.username} (UID: {participant.uid})")
+        if DEBUG:
+            print(f"[DEBUG] Received PRESENT_START from {participant.username} (UID: {participant.uid})")
         
         # Check if someone else is presenting
-        for p in self.participants.values():
-            if p.is_presenting and p != participant:
-                print(f"[DEBUG] Presentation rejected - {p.username} is already presenting")
-                return create_error_message("Someone else is already presenting")
+        if self.presenter_uid is not None and self.presenter_uid != participant.uid:
+            presenter = self.participants[self.presenter_uid]
+            if DEBUG:
+                print(f"[DEBUG] Presentation rejected - {presenter.username} is already presenting")
+            return create_error_message("Someone else is already presenting")
         
         participant.is_presenting = True
-        print(f"[DEBUG] {participant.username} started presenting on port {self.screen_share_server.port}")
+        self.presenter_uid = participant.uid
+        self.participant_list_cache = None
+        if DEBUG:
+            print(f"[DEBUG] {participant.username} started presenting on port {self.screen_share_server.port}")
         
         # Notify all participants
         present_msg = {
@@ -938,7 +1499,7 @@ class CollaborationServer:
             'uid': participant.uid,
             'username': participant.username,
             'screen_share_port': self.screen_share_server.port,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         await self.broadcast_message(present_msg)
@@ -946,94 +1507,147 @@ class CollaborationServer:
         return {
             'type': MessageTypes.SCREEN_SHARE_PORTS,
             'port': self.screen_share_server.port,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': present_msg['timestamp']
         }
     
     async def handle_present_stop(self, participant: Participant) -> dict:
         """Handle presentation stop."""
-        print(f"[DEBUG] Received PRESENT_STOP from {participant.username} (UID: {participant.uid})")
+        if DEBUG:
+            print(f"[DEBUG] Received PRESENT_STOP from {participant.username} (UID: {participant.uid})")
         
         if not participant.is_presenting:
-            print(f"[DEBUG] Presentation stop rejected - {participant.username} is not presenting")
+            if DEBUG:
+                print(f"[DEBUG] Presentation stop rejected - {participant.username} is not presenting")
             return create_error_message("Not currently presenting")
         
         participant.is_presenting = False
-        print(f"[DEBUG] {participant.username} stopped presenting")
+        self.presenter_uid = None
+        self.participant_list_cache = None
+        if DEBUG:
+            print(f"[DEBUG] {participant.username} stopped presenting")
         
         # Notify all participants
         present_msg = {
             'type': MessageTypes.PRESENT_STOP_BROADCAST,
             'uid': participant.uid,
             'username': participant.username,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         await self.broadcast_message(present_msg)
         
-        return {'type': 'present_stopped', 'timestamp': datetime.now().isoformat()}
+        return {'type': 'present_stopped', 'timestamp': present_msg['timestamp']}
     
     async def handle_logout(self, participant: Participant):
         """Handle user logout."""
-        print(f"[DEBUG] Processing LOGOUT for {participant.username} (UID: {participant.uid})")
+        if DEBUG:
+            print(f"[DEBUG] Processing LOGOUT for {participant.username} (UID: {participant.uid})")
         
         if participant.uid in self.participants:
             # If the user was presenting, stop their presentation
             if participant.is_presenting:
                 print(f"[INFO] Stopping presentation for disconnecting user: {participant.username}")
                 participant.is_presenting = False
+                self.presenter_uid = None
                 
                 # Notify all participants that presentation stopped
                 present_stop_msg = {
                     'type': MessageTypes.PRESENT_STOP_BROADCAST,
                     'uid': participant.uid,
                     'username': participant.username,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso()
                 }
                 await self.broadcast_message(present_stop_msg)
             
             del self.participants[participant.uid]
-            del self.username_to_uid[participant.username]
+            self.usernames.discard(participant.username)
+            self.participant_list_cache = None
+            
+            # Media fan-out ends with the session (shards follow via media_members)
+            self.audio_server.remove_client(participant.uid)
+            self.video_server.remove_client(participant.uid)
+            if self.media_members is not None:
+                try:
+                    self.media_members.pop(participant.uid, None)
+                except (OSError, EOFError):
+                    pass  # Manager already shut down
             
             # Notify other participants
             user_left_msg = create_user_left_message(participant.uid, participant.username)
             await self.broadcast_message(user_left_msg)
             
-            print(f"[DEBUG] Broadcasted USER_LEFT message for {participant.username}")
+            if DEBUG:
+                print(f"[DEBUG] Broadcasted USER_LEFT message for {participant.username}")
             print(f"[INFO] User '{participant.username}' logged out")
     
-    async def send_message(self, writer, message: dict):
+    async def send_message(self, writer, message: Union[dict, bytes]):
         """Send message to a client."""
         try:
-            message_data = json.dumps(message).encode()
-            length_data = struct.pack('!I', len(message_data))
-            writer.write(length_data + message_data)
+            writer.writelines(frame_message(message))
             await writer.drain()
         except Exception:
             pass
     
-    async def broadcast_message(self, message: dict, exclude_uid: Optional[int] = None):
+    async def broadcast_message(self, message: Union[dict, bytes], exclude_uid: Optional[int] = None):
         """Broadcast message to all connected participants."""
-        for participant in list(self.participants.values()):
-            if exclude_uid and participant.uid == exclude_uid:
-                continue
-            await self.send_message(participant.writer, message)
+        # Encode once; every transport queues the same buffers
+        frame = frame_message(message)
+        # Filter once up front so the common no-exclusion loop has no branch
+        recipients = self.participants.values()
+        if exclude_uid is not None:
+            recipients = [p for p in recipients if p.uid != exclude_uid]
+        
+        backlogged = []
+        for participant in recipients:  # No awaits until the loop ends
+            try:
+                participant.writer.writelines(frame)
+                # Writes usually go straight into the kernel buffer; only
+                # writers still holding data need draining
+                if participant.writer.transport.get_write_buffer_size():
+                    backlogged.append(participant.writer)
+            except Exception:
+                pass
+        
+        # Drain concurrently so one slow client does not hold up the rest
+        if backlogged:
+            await asyncio.gather(*(writer.drain() for writer in backlogged),
+                                 return_exceptions=True)
     
     async def heartbeat_checker(self):
-        """Check for inactive participants."""
+        """Check for inactive participants.
+        
+        Deadlines sit in a min-heap, so each wake-up only looks at entries
+        that are due. A participant heard from since its entry was pushed
+        is re-queued at its new deadline; logged-out uids are dropped.
+        """
+        timeout = HEARTBEAT_INTERVAL * 3
+        deadlines = self.heartbeat_deadlines
         while self.running:
             try:
                 current_time = time.time()
                 inactive_participants = []
                 
-                for participant in self.participants.values():
-                    if current_time - participant.last_heartbeat > HEARTBEAT_INTERVAL * 3:
+                while deadlines and deadlines[0][0] <= current_time:
+                    _, uid = heapq.heappop(deadlines)
+                    participant = self.participants.get(uid)
+                    if participant is None:
+                        continue
+                    deadline = participant.last_heartbeat + timeout
+                    if deadline > current_time:
+                        heapq.heappush(deadlines, (deadline, uid))
+                    else:
                         inactive_participants.append(participant)
                 
                 for participant in inactive_participants:
                     print(f"[INFO] Removing inactive user: {participant.username}")
                     await self.handle_logout(participant)
                 
-                await asyncio.sleep(HEARTBEAT_INTERVAL)
+                # Drop media senders that never logged in or whose session ended
+                self.audio_server.retain_clients(self.participants)
+                self.video_server.retain_clients(self.participants)
+                
+                next_deadline = deadlines[0][0] if deadlines else current_time + timeout
+                await asyncio.sleep(max(next_deadline - time.time(), 0.1))
                 
             except Exception as e:
                 print(f"[ERROR] Heartbeat checker error: {e}")
@@ -1066,6 +1680,15 @@ class CollaborationServer:
         self.screen_share_server.stop()
         self.file_server.stop()
         
+        for worker in self.media_workers:
+            worker.terminate()
+            worker.join(timeout=1)
+        self.media_workers = []
+        if self.media_manager:
+            self.media_members = None
+            self.media_manager.shutdown()
+            self.media_manager = None
+        
         if self.server:
             self.server.close()
             await self.server.wait_closed()
@@ -1079,7 +1702,7 @@ class CollaborationServer:
             'type': MessageTypes.FILE_AVAILABLE,
             'filename': filename,
             'uploader': uploader,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         await self.broadcast_message(file_msg)
@@ -1087,13 +1710,8 @@ class CollaborationServer:
     
     def show_connection_info(self):
         """Show connection information for clients."""
-        try:
-            # Get local IP address
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            
+        local_ip = get_local_ip()
+        if local_ip:
             print(f"\n{'='*60}")
             print(f"🌐 LAN COLLABORATION SERVER - CONNECTION INFO")
             print(f"{'='*60}")
@@ -1101,8 +1719,7 @@ class CollaborationServer:
             print(f"🏠 Local clients use: localhost:{self.tcp_port}")
             print(f"🌍 Remote clients use: {local_ip}:{self.tcp_port}")
             print(f"{'='*60}\n")
-            
-        except Exception:
+        else:
             print(f"\n[INFO] Clients can connect to: {self.host}:{self.tcp_port}\n")
 
 
@@ -1113,16 +1730,23 @@ def main():
     parser.add_argument('--tcp-port', type=int, default=DEFAULT_TCP_PORT, help='TCP control port')
     parser.add_argument('--video-port', type=int, default=DEFAULT_UDP_VIDEO_PORT, help='UDP video port')
     parser.add_argument('--audio-port', type=int, default=DEFAULT_UDP_AUDIO_PORT, help='UDP audio port')
+    parser.add_argument('--udp-workers', type=int, default=0,
+                        help='Extra processes sharing each UDP media port (Linux/macOS, SO_REUSEPORT)')
     parser.add_argument('--stats', action='store_true', help='Show periodic statistics')
+    parser.add_argument('--debug', action='store_true', help='Print per-event debug messages')
     
     args = parser.parse_args()
     
+    global DEBUG
+    DEBUG = args.debug
+    
     # Create and start server
     server = CollaborationServer(
         host=args.host,
         tcp_port=args.tcp_port,
         udp_video_port=args.video_port,
-        udp_audio_port=args.audio_port
+        udp_audio_port=args.audio_port,
+        udp_workers=args.udp_workers
     )
     
     async def run_server():
@@ -1145,7 +1769,15 @@ def main():
         finally:
             await server.stop()
     
-    # Run the server
+    # SIGTERM shuts down like Ctrl+C, so UDP shard processes are reaped
+    if args.udp_workers > 0:
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    # Run the server, on uvloop when available
+    if HAS_UVLOOP:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        print("[INFO] Using uvloop event loop")
+    
     try:
         asyncio.run(run_server())
     except KeyboardInterrupt:
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Network helpers shared by the client, the server and their launchers
+(standard library only, so importing it stays cheap)
+"""
+
+import socket
+import subprocess
+from typing import Optional
+
+_local_ip: Optional[str] = None  # set once a probe succeeds
+
+def get_local_ip() -> Optional[str]:
+    """This machine's LAN address (None if unknown).
+    
+    Only a successful probe is cached, so a failure before the interface
+    is up (e.g. while a connection dialog opens) is retried on the next call.
+    """
+    global _local_ip
+    if _local_ip is not None:
+        return _local_ip
+    try:
+        # A UDP connect sends nothing; it just selects the outgoing interface
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            _local_ip = s.getsockname()[0]
+    except Exception:
+        # Fallback method
+        try:
+            result = subprocess.run(['hostname', '-I'], capture_output=True, text=True)
+            if result.returncode == 0 and result.stdout.split():
+                _local_ip = result.stdout.split()[0]
+        except Exception:
+            pass
+    return _local_ip
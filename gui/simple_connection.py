@@ -5,13 +5,14 @@ Ultra-simple connection dialog that definitely works
 
 import sys
 import time
-import socket
 import subprocess
 from PyQt6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLineEdit, QLabel, QPushButton, QCheckBox, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
+
+from net_utils import get_local_ip
 
 DEFAULT_TCP_PORT = 9000
 
@@ -26,6 +27,10 @@ class SimpleConnectionDialog(QDialog):
         # ZERO styling - pure system default
         self.setup_ui()
         
+        # Probe the local IP in the background so "Use Local IP" is usually instant;
+        # a failed probe is not cached, so the button simply probes again
+        QThreadPool.globalInstance().start(get_local_ip)
+        
     def setup_ui(self):
         """Setup the simplest possible connection dialog."""
         layout = QVBoxLayout(self)
@@ -89,14 +94,11 @@ class SimpleConnectionDialog(QDialog):
         layout.addLayout(button_layout)
     
     def set_local_ip(self):
-        """Set the local IP address."""
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
+        """Set the local IP address (cached, or probed now if not yet found)."""
+        local_ip = get_local_ip()
+        if local_ip:
             self.server_ip_input.setText(local_ip)
-        except Exception:
+        else:
             QMessageBox.warning(self, "IP Detection", "Could not detect local IP address")
     
     def get_connection_info(self):
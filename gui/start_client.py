@@ -7,6 +7,7 @@ Handles dependencies and provides connection help
 import sys
 import os
 import subprocess
+import importlib.util
 
 def check_dependencies():
     """Check if required dependencies are available."""
@@ -14,50 +15,30 @@ def check_dependencies():
     
     missing = []
     
-    # Check PyQt6
-    try:
-        import PyQt6
-        print("✅ PyQt6: OK")
-    except ImportError:
-        print("❌ PyQt6: Missing")
-        missing.append("PyQt6")
+    # Only locate packages here; importing PyQt6/cv2 is deferred to main_client
+    required = [
+        ("PyQt6", "PyQt6", "PyQt6"),
+        ("numpy", "NumPy", "numpy"),
+        ("PIL", "Pillow", "Pillow"),
+    ]
+    optional = [
+        ("cv2", "OpenCV", "video features disabled"),
+        ("pyaudio", "PyAudio", "audio features disabled"),
+        ("mss", "MSS", "screen capture disabled"),
+    ]
     
-    # Check OpenCV
-    try:
-        import cv2
-        print("✅ OpenCV: OK")
-    except ImportError:
-        print("⚠️  OpenCV: Missing (video features disabled)")
+    for module, name, package in required:
+        if importlib.util.find_spec(module) is None:
+            print(f"❌ {name}: Missing")
+            missing.append(package)
+        else:
+            print(f"✅ {name}: OK")
     
-    # Check NumPy
-    try:
-        import numpy
-        print("✅ NumPy: OK")
-    except ImportError:
-        print("❌ NumPy: Missing")
-        missing.append("numpy")
-    
-    # Check Pillow
-    try:
-        import PIL
-        print("✅ Pillow: OK")
-    except ImportError:
-        print("❌ Pillow: Missing")
-        missing.append("Pillow")
-    
-    # Check PyAudio (optional)
-    try:
-        import pyaudio
-        print("✅ PyAudio: OK")
-    except ImportError:
-        print("⚠️  PyAudio: Missing (audio features disabled)")
-    
-    # Check MSS (optional)
-    try:
-        import mss
-        print("✅ MSS: OK")
-    except ImportError:
-        print("⚠️  MSS: Missing (screen capture disabled)")
+    for module, name, note in optional:
+        if importlib.util.find_spec(module) is None:
+            print(f"⚠️  {name}: Missing ({note})")
+        else:
+            print(f"✅ {name}: OK")
     
     if missing:
         print(f"\n❌ Missing required packages: {', '.join(missing)}")
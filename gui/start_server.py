@@ -8,18 +8,9 @@ import sys
 import os
 import socket
 import subprocess
+import importlib.util
 
-def get_local_ip():
-    """Get local machine IP address."""
-    try:
-        # Connect to external server to get local IP
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
-    except Exception:
-        return "127.0.0.1"
+from net_utils import get_local_ip
 
 def check_dependencies():
     """Check if required dependencies are available."""
@@ -35,17 +26,15 @@ def check_dependencies():
         print(f"❌ Core modules: {e}")
         missing.append("core-modules")
     
-    # Check optional media dependencies
-    try:
-        import cv2
+    # Check optional media dependencies without importing them
+    if importlib.util.find_spec("cv2") is not None:
         print("✅ OpenCV: OK")
-    except ImportError:
+    else:
         print("⚠️  OpenCV: Missing (video processing disabled)")
     
-    try:
-        import pyaudio
+    if importlib.util.find_spec("pyaudio") is not None:
         print("✅ PyAudio: OK")
-    except ImportError:
+    else:
         print("⚠️  PyAudio: Missing (audio processing disabled)")
     
     if missing:
@@ -113,7 +102,7 @@ def main():
     print("=" * 50)
     
     # Get local IP
-    local_ip = get_local_ip()
+    local_ip = get_local_ip() or "127.0.0.1"
     print(f"🌐 Detected IP: {local_ip}")
     
     # Check dependencies
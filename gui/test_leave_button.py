@@ -4,15 +4,20 @@ Test script to verify the leave button functionality
 """
 
 import sys
-import time
 from PyQt6.QtWidgets import QApplication, QPushButton, QVBoxLayout, QWidget, QLabel
 from PyQt6.QtCore import QTimer
 from main_client import ClientMainWindow
 
+STATE_TIMEOUT_MS = 5000  # give up waiting for a connection state change
+
 class LeaveButtonTester(QWidget):
     def __init__(self):
         super().__init__()
         self.client = None
+        self._expected_state = None  # connection state being waited for
+        self._state_timeout = QTimer(self)
+        self._state_timeout.setSingleShot(True)
+        self._state_timeout.timeout.connect(self._report_state)
         self.setup_ui()
         
     def setup_ui(self):
@@ -51,18 +56,38 @@ class LeaveButtonTester(QWidget):
                 'join_with_audio': False
             }
             
+            self.client.connection_state_changed.connect(self._on_state)
             self.client.connect_to_server(conn_info)
             self.client.show()
             
             self.status_label.setText("Client started and connecting...")
             self.leave_btn.setEnabled(True)
             
-            # Check connection status after a delay
-            QTimer.singleShot(3000, self.check_connection)
+            # Check connection status as soon as the client reports it
+            self.wait_for_state(True)
             
         except Exception as e:
             self.status_label.setText(f"Error starting client: {e}")
     
+    def wait_for_state(self, connected):
+        """Report once the client's connection state becomes `connected`."""
+        self._expected_state = connected
+        self._state_timeout.start(STATE_TIMEOUT_MS)
+    
+    def _on_state(self, connected):
+        """Handle the client's connection_state_changed signal."""
+        if connected == self._expected_state:
+            self._state_timeout.stop()
+            self._report_state()
+    
+    def _report_state(self):
+        """Run the check for the awaited state (on signal or timeout)."""
+        expected, self._expected_state = self._expected_state, None
+        if expected is True:
+            self.check_connection()
+        elif expected is False:
+            self.check_disconnection()
+    
     def check_connection(self):
         """Check if client is connected."""
         if self.client and self.client.connected:
@@ -75,11 +100,11 @@ class LeaveButtonTester(QWidget):
         if self.client and self.client.connected:
             self.status_label.setText("🚪 Testing leave button...")
             
+            # Check disconnection as soon as the client reports it
+            self.wait_for_state(False)
+            
             # Call the leave button handler
             self.client.handle_leave_button_click()
-            
-            # Check if disconnection worked after a delay
-            QTimer.singleShot(2000, self.check_disconnection)
         else:
             self.status_label.setText("❌ No connected client to test")
     
@@ -94,7 +119,7 @@ class LeaveButtonTester(QWidget):
             self.status_label.setText("❌ Client object not found")
 
 def main():
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
     tester = LeaveButtonTester()
     tester.show()
     return app.exec()
@@ -5,20 +5,31 @@ Test script to verify the leave button functionality by programmatically trigger
 
 import sys
 import time
-import asyncio
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
+from PyQt6.QtTest import QSignalSpy
 from main_client import ClientMainWindow
 
+STATE_TIMEOUT_MS = 5000  # longest wait for a connect or disconnect
+
+def wait_for_state(client, spy, connected):
+    """Spin the event loop until client.connected matches or the timeout passes."""
+    deadline = time.monotonic() + STATE_TIMEOUT_MS / 1000
+    while client.connected != connected:
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining <= 0 or not spy.wait(remaining):
+            break
+    return client.connected == connected
+
 def test_leave_button():
     """Test the leave button functionality."""
     print("🧪 Starting Leave Button Test")
     print("=" * 50)
     
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
     
     # Create client
     client = ClientMainWindow()
+    spy = QSignalSpy(client.connection_state_changed)
     
     # Auto-connect configuration
     conn_info = {
@@ -33,41 +44,23 @@ def test_leave_button():
     client.connect_to_server(conn_info)
     client.show()
     
-    def check_connection_and_test():
-        """Check connection and test leave button after delay."""
-        if client.connected:
-            print("✅ Connected successfully!")
-            print("🚪 Testing leave button in 2 seconds...")
-            
-            def trigger_leave():
-                print("🔄 Triggering leave button...")
-                client.handle_leave_button_click()
-                
-                def check_result():
-                    if not client.connected:
-                        print("✅ SUCCESS: Leave button worked! Client disconnected properly.")
-                        print("🎯 The meeting ended cleanly without needing to close GUI or terminal.")
-                    else:
-                        print("❌ FAILED: Client is still connected after leave button.")
-                    
-                    # Close the application after test
-                    QTimer.singleShot(1000, app.quit)
-                
-                # Check result after 2 seconds
-                QTimer.singleShot(2000, check_result)
-            
-            # Trigger leave button after 2 seconds
-            QTimer.singleShot(2000, trigger_leave)
-        else:
-            print("❌ Failed to connect to server")
-            print("💡 Make sure the server is running: py main_server.py")
-            QTimer.singleShot(1000, app.quit)
+    # Returns as soon as the client reports the connection
+    if not wait_for_state(client, spy, True):
+        print("❌ Failed to connect to server")
+        print("💡 Make sure the server is running: py main_server.py")
+        return 1
+    
+    print("✅ Connected successfully!")
+    print("🔄 Triggering leave button...")
+    client.handle_leave_button_click()
     
-    # Check connection after 3 seconds
-    QTimer.singleShot(3000, check_connection_and_test)
+    if wait_for_state(client, spy, False):
+        print("✅ SUCCESS: Leave button worked! Client disconnected properly.")
+        print("🎯 The meeting ended cleanly without needing to close GUI or terminal.")
+        return 0
     
-    # Run the application
-    return app.exec()
+    print("❌ FAILED: Client is still connected after leave button.")
+    return 1
 
 if __name__ == "__main__":
-    sys.exit(test_leave_button())
\ No newline at end of file
+    sys.exit(test_leave_button())
@@ -5,31 +5,29 @@ Tests if PyQt6 is properly installed and can create a basic window
 """
 
 import sys
+import importlib
+
+# PyQt6 submodules and the names imported from each
+PYQT6_MODULES = (
+    ("PyQt6.QtWidgets", ("QApplication", "QMainWindow", "QLabel", "QPushButton", "QVBoxLayout", "QWidget")),
+    ("PyQt6.QtCore", ("Qt", "QTimer")),
+    ("PyQt6.QtGui", ("QFont", "QPixmap")),
+)
 
 def test_pyqt6_import():
     """Test PyQt6 imports"""
     print("🔍 Testing PyQt6 imports...")
     
-    try:
-        from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QWidget
-        print("✅ PyQt6.QtWidgets: OK")
-    except ImportError as e:
-        print(f"❌ PyQt6.QtWidgets: FAILED - {e}")
-        return False
-    
-    try:
-        from PyQt6.QtCore import Qt, QTimer
-        print("✅ PyQt6.QtCore: OK")
-    except ImportError as e:
-        print(f"❌ PyQt6.QtCore: FAILED - {e}")
-        return False
-    
-    try:
-        from PyQt6.QtGui import QFont, QPixmap
-        print("✅ PyQt6.QtGui: OK")
-    except ImportError as e:
-        print(f"❌ PyQt6.QtGui: FAILED - {e}")
-        return False
+    for module_name, names in PYQT6_MODULES:
+        try:
+            module = importlib.import_module(module_name)
+            missing = [name for name in names if not hasattr(module, name)]
+            if missing:
+                raise ImportError(f"cannot import name '{missing[0]}' from '{module_name}'")
+            print(f"✅ {module_name}: OK")
+        except ImportError as e:
+            print(f"❌ {module_name}: FAILED - {e}")
+            return False
     
     return True
 
@@ -39,10 +37,10 @@ def test_pyqt6_window():
     
     try:
         from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget
-        from PyQt6.QtCore import QTimer
+        from PyQt6.QtTest import QTest
         
         # Create application
-        app = QApplication(sys.argv)
+        app = QApplication.instance() or QApplication(sys.argv)
         
         # Create main window
         window = QMainWindow()
@@ -58,7 +56,7 @@ def test_pyqt6_window():
         label.setStyleSheet("font-size: 16px; color: green; padding: 20px;")
         layout.addWidget(label)
         
-        info_label = QLabel("This window will close automatically in 3 seconds...")
+        info_label = QLabel("This window will close automatically once it is shown...")
         info_label.setStyleSheet("font-size: 12px; color: gray; padding: 10px;")
         layout.addWidget(info_label)
         
@@ -67,15 +65,16 @@ def test_pyqt6_window():
         
         # Show window
         window.show()
-        
-        # Auto-close after 3 seconds
-        QTimer.singleShot(3000, app.quit)
-        
         print("✅ PyQt6 window created successfully!")
-        print("   Window should appear for 3 seconds...")
         
-        # Run application
-        app.exec()
+        # Returns as soon as the window is actually exposed on screen
+        if not QTest.qWaitForWindowExposed(window, 3000):
+            window.close()
+            print("❌ PyQt6 window test FAILED - window was not shown within 3 seconds")
+            return False
+        
+        QTest.qWait(50)
+        window.close()
         
         print("✅ PyQt6 window test completed successfully!")
         return True
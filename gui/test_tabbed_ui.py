@@ -5,7 +5,6 @@ Run this to see the new interface without connecting to a server
 """
 
 import sys
-import os
 
 def main():
     """Main function to test the tabbed UI"""
@@ -15,7 +14,7 @@ def main():
         
         print("🚀 Testing new tabbed UI...")
         
-        app = QApplication(sys.argv)
+        app = QApplication.instance() or QApplication(sys.argv)
         
         # Create the main window
         window = ClientMainWindow()
@@ -3,54 +3,55 @@
 Test script to verify the upload error fix
 """
 
+import os
 import sys
+import logging
 from pathlib import Path
 
+log = logging.getLogger(__name__)
+
+# Accepted path types, matched exactly (type(Path()) is the concrete
+# PosixPath/WindowsPath class that Path() actually returns)
+_PATH_TYPES = frozenset((str, type(Path())))
+
+# (path, should be accepted), checked in a single pass
+CASES = (
+    ("test.txt", True),
+    (Path("test.txt"), True),
+    ("/path/to/file.txt", True),
+    (None, False),
+    (False, False),
+    (True, False),
+    (123, False),
+    ([], False),
+    ({}, False),
+)
+
 def test_file_path_validation():
     """Test file path validation logic"""
     
-    # Test cases that should work
-    valid_paths = [
-        "test.txt",
-        Path("test.txt"),
-        "/path/to/file.txt"
-    ]
-    
-    # Test cases that should fail
-    invalid_paths = [
-        None,
-        False,
-        True,
-        123,
-        [],
-        {}
-    ]
-    
-    print("Testing file path validation...")
-    
-    for path in valid_paths:
-        # Simulate the validation logic from the fixed code
-        if isinstance(path, (str, Path)):
-            path_str = str(path)
-            print(f"✅ Valid path: {path} -> {path_str}")
-        else:
-            print(f"❌ Invalid path: {path}")
+    log.info("Testing file path validation...")
     
-    for path in invalid_paths:
+    for path, expected in CASES:
         # Simulate the validation logic from the fixed code
-        if isinstance(path, (str, Path)):
-            path_str = str(path)
-            print(f"✅ Valid path: {path} -> {path_str}")
+        accepted = type(path) in _PATH_TYPES
+        if accepted != expected:
+            log.warning("⚠️  Unexpected result for %r: accepted=%s", path, accepted)
+        elif accepted:
+            log.info("✅ Valid path: %s", path)
         else:
-            print(f"❌ Invalid path (correctly rejected): {path}")
+            log.info("❌ Invalid path (correctly rejected): %s", path)
     
-    print("\n🎉 File path validation test completed!")
-    print("The upload error should now be fixed.")
-    print("\nThe fix includes:")
-    print("1. Type checking for file paths before processing")
-    print("2. Converting Path objects to strings safely")
-    print("3. Validation in multiple places (ChatWidget, FileUploadThread, etc.)")
-    print("4. Better error handling and user feedback")
+    log.info("\n🎉 File path validation test completed!")
+    log.info("The upload error should now be fixed.")
+    log.info("\nThe fix includes:")
+    log.info("1. Type checking for file paths before processing")
+    log.info("2. Converting Path objects to strings safely")
+    log.info("3. Validation in multiple places (ChatWidget, FileUploadThread, etc.)")
+    log.info("4. Better error handling and user feedback")
 
 if __name__ == "__main__":
+    # Only unexpected results are reported under CI
+    logging.basicConfig(stream=sys.stdout, format="%(message)s",
+                        level=logging.WARNING if "CI" in os.environ else logging.INFO)
     test_file_path_validation()
\ No newline at end of file
@@ -3,6 +3,33 @@
 Test the upload file path validation fix
 """
 
+import os
+import sys
+import logging
+
+log = logging.getLogger(__name__)
+
+def _open_dialog(file_path):
+    log.info("  → Would open file dialog (None/empty)")
+    return False
+
+def _validate_str(file_path):
+    # isspace() avoids allocating a stripped copy just to test emptiness
+    if not file_path or file_path.isspace():
+        return _open_dialog(file_path)
+    log.info("  → Valid string: '%s'", file_path.strip())
+    return True
+
+def _reject_type(file_path):
+    log.info("  → Invalid type: %s", type(file_path))
+    return False
+
+# Exact type -> validator, built once; anything else is rejected
+_VALIDATORS = {
+    type(None): _open_dialog,
+    str: _validate_str,
+}
+
 def test_upload_validation():
     """Test the upload file path validation logic"""
     
@@ -22,42 +49,27 @@ def test_upload_validation():
         ([], False),
     ]
     
-    print("Testing upload file path validation...")
+    log.info("Testing upload file path validation...")
     
     for file_path, should_be_valid in test_cases:
-        print(f"\nTesting: {repr(file_path)} (type: {type(file_path)})")
+        log.info("\nTesting: %r (type: %s)", file_path, type(file_path))
         
         # Simulate the validation logic from the fixed upload_file method
-        is_valid = True
-        
-        # Check if file_path is None or empty
-        if file_path is None or file_path == "" or (isinstance(file_path, str) and not file_path.strip()):
-            is_valid = False
-            print("  → Would open file dialog (None/empty)")
-        
-        # Check type validation
-        elif not isinstance(file_path, (str, type(None))):  # Path not available in test
-            is_valid = False
-            print(f"  → Invalid type: {type(file_path)}")
-        
-        # Check string validation
-        elif isinstance(file_path, str):
-            file_path_str = str(file_path).strip()
-            if not file_path_str:
-                is_valid = False
-                print("  → Empty after strip")
-            else:
-                print(f"  → Valid string: '{file_path_str}'")
+        validate = _VALIDATORS.get(type(file_path), _reject_type)
+        is_valid = validate(file_path)
         
         # Compare with expected result
         if should_be_valid and is_valid:
-            print("  ✅ PASS - Correctly identified as valid")
+            log.info("  ✅ PASS - Correctly identified as valid")
         elif not should_be_valid and not is_valid:
-            print("  ✅ PASS - Correctly identified as invalid")
+            log.info("  ✅ PASS - Correctly identified as invalid")
         else:
-            print(f"  ❌ FAIL - Expected {should_be_valid}, got {is_valid}")
+            log.warning("  ❌ FAIL - Expected %s, got %s", should_be_valid, is_valid)
 
 if __name__ == "__main__":
+    # Only failures are reported under CI
+    logging.basicConfig(stream=sys.stdout, format="%(message)s",
+                        level=logging.WARNING if "CI" in os.environ else logging.INFO)
     test_upload_validation()
-    print("\n🎉 Upload validation test completed!")
-    print("The 'Invalid file path provided' error should now be fixed.")
\ No newline at end of file
+    log.info("\n🎉 Upload validation test completed!")
+    log.info("The 'Invalid file path provided' error should now be fixed.")
\ No newline at end of file
@@ -3,34 +3,51 @@
 Verify that the file upload fix is working correctly
 """
 
+import os
+import sys
+import logging
+
+log = logging.getLogger(__name__)
+
+def _open_dialog(file_path):
+    log.info("📂 Would open QFileDialog.getOpenFileName()")
+    return "SUCCESS - File dialog would open"
+
+def _button_click(file_path):
+    # PyQt6 passes the checked state to slots connected without a lambda
+    log.info("✅ Detected boolean parameter (button click), would open file dialog")
+    return _open_dialog(None)
+
+def _upload_path(file_path):
+    # isspace() avoids allocating a stripped copy just to test emptiness
+    if not file_path or file_path.isspace():
+        return _open_dialog(file_path)
+    log.info("📁 Would proceed with file upload: %s", file_path)
+    return "SUCCESS - File upload would proceed"
+
+def _invalid_type(file_path):
+    log.info("❌ Would show error: Invalid file path type received: %s", type(file_path))
+    return "ERROR - Invalid type"
+
+# Exact type -> handler, built once instead of an isinstance cascade per call
+_UPLOAD_HANDLERS = {
+    bool: _button_click,
+    type(None): _open_dialog,
+    str: _upload_path,
+}
+
 def simulate_button_click_behavior():
     """Simulate how PyQt6 button clicks pass parameters"""
     
-    print("🔧 Simulating PyQt6 Button Click Behavior")
-    print("=" * 50)
+    log.info("🔧 Simulating PyQt6 Button Click Behavior")
+    log.info("=" * 50)
     
     # This is what happens when a button is clicked in PyQt6
     def mock_upload_file(file_path=None):
         """Mock version of the fixed upload_file method"""
-        print(f"📥 upload_file called with: {repr(file_path)} (type: {type(file_path)})")
-        
-        # Handle boolean parameter from button clicks (PyQt6 passes checked state)
-        if isinstance(file_path, bool):
-            print(f"✅ Detected boolean parameter (button click), would open file dialog")
-            file_path = None
-        
-        # If no file path provided or it's empty, open file dialog
-        if file_path is None or file_path == "" or (isinstance(file_path, str) and not file_path.strip()):
-            print(f"📂 Would open QFileDialog.getOpenFileName()")
-            return "SUCCESS - File dialog would open"
-        
-        # Ensure file_path is a valid string and not empty
-        if not isinstance(file_path, (str, type(None))):  # Simplified for test
-            print(f"❌ Would show error: Invalid file path type received: {type(file_path)}")
-            return "ERROR - Invalid type"
-        
-        print(f"📁 Would proceed with file upload: {file_path}")
-        return "SUCCESS - File upload would proceed"
+        log.info("📥 upload_file called with: %r (type: %s)", file_path, type(file_path))
+        handler = _UPLOAD_HANDLERS.get(type(file_path), _invalid_type)
+        return handler(file_path)
     
     # Test scenarios
     test_cases = [
@@ -42,18 +59,21 @@ def simulate_button_click_behavior():
         ("Invalid type", 123),
     ]
     
-    print("\n🧪 Testing Different Scenarios:")
-    print("-" * 30)
+    log.info("\n🧪 Testing Different Scenarios:")
+    log.info("-" * 30)
     
     for description, test_value in test_cases:
-        print(f"\n📋 {description}:")
+        log.info("\n📋 %s:", description)
         result = mock_upload_file(test_value)
-        print(f"   Result: {result}")
+        log.info("   Result: %s", result)
     
-    print("\n" + "=" * 50)
-    print("✅ Fix Verification Complete!")
-    print("The boolean parameter issue has been resolved.")
-    print("File upload buttons will now work correctly.")
+    log.info("\n" + "=" * 50)
+    log.info("✅ Fix Verification Complete!")
+    log.info("The boolean parameter issue has been resolved.")
+    log.info("File upload buttons will now work correctly.")
 
 if __name__ == "__main__":
+    # Keep CI runs quiet; the scenarios are for reading, not asserting
+    logging.basicConfig(stream=sys.stdout, format="%(message)s",
+                        level=logging.WARNING if "CI" in os.environ else logging.INFO)
     simulate_button_click_behavior()
\ No newline at end of file